@@ -3,12 +3,177 @@ Chess AI Bot System - Enhanced with Powerup Usage and ELO Ratings FINAL
 Different difficulty levels from Easy to Very Hard with ELO-based play strength
 """
 
-import random
+from rng import gameplay_rng
 import pygame
 import time
 import math
+import json
+import os
 import numpy as np
 from config import *
+from targeting import NEIGHBOURHOOD, gun_targets, board_grids, airstrike_value_map, paratrooper_square_scores
+from pawn_structure import PawnStructureEvaluator
+from board import (ZOBRIST_SHIELDS, ZOBRIST_BLACK_TO_MOVE, MAILBOX, SQUARE_ROW_COL, PIECE_CODES,
+                   EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE, BLACK, TYPE_MASK, COLOR_MASK)
+
+# AI decisions; a separate stream so effects never shift them
+_rng = gameplay_rng("ai")
+
+# Iterative deepening never goes past this depth, whatever the budget
+MAX_SEARCH_DEPTH = 8
+
+# A forced win scores MATE minus the ply of the mating move, so faster mates
+# score higher; search windows run to +/- INFINITY, beyond every mate score
+MATE = 1000000
+MATE_THRESHOLD = MATE - 1000  # Scores above this are forced wins
+INFINITY = 10000000
+
+# The clock is only read every BUDGET_CHECK_MASK + 1 nodes
+BUDGET_CHECK_MASK = 255
+
+# Background searches (yield_gil) release the GIL every YIELD_MASK + 1 nodes,
+# well inside the interpreter's 5 ms switch interval
+YIELD_MASK = 31
+
+# Nodes per second assumed until calibrate_search_speed() has run
+DEFAULT_NPS = 20000
+
+# Centipawn value of one powerup point, charged when search uses a powerup
+POWERUP_POINT_VALUE = 20
+
+# Targets per powerup considered as root moves
+POWERUP_CANDIDATES = 2
+
+# Transposition table is cleared once it grows past this many positions
+TT_MAX_ENTRIES = 200000
+
+# Transposition table bound types
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+# Tuned piece values and tables written by texel.py; without the file the
+# hand-typed ones in ChessAI.__init__ are used
+EVAL_TABLES_FILE = "eval_tables.json"
+EVAL_TABLE_NAMES = [
+    "pawn_table", "knight_table", "bishop_table", "rook_table",
+    "queen_table", "king_table", "king_endgame_table"
+]
+
+_host_nps = None
+_eval_tables = {}  # {path: tables}
+
+
+def calibrate_search_speed(duration_ms=200):
+    """Benchmark the search on this machine and remember its nodes per second.
+    
+    Called once at startup. The result only tunes the thinking delay so every
+    level answers after the same wall-clock time; search strength is fixed by
+    the node budgets and does not depend on it.
+    """
+    global _host_nps
+    from board import ChessBoard
+    
+    board = ChessBoard()
+    ai = ChessAI("very_hard")
+    moves = ai._order_moves(board, ai._get_all_legal_moves(board))
+    
+    # Black's replies from the start position are a representative workload
+    board.current_turn = "black"
+    ai._begin_search(0, duration_ms)
+    start = time.perf_counter()
+    depth = 1
+    while not ai.search_aborted and depth <= MAX_SEARCH_DEPTH:
+        ai._search_root(board, moves, depth)
+        depth += 1
+    elapsed = max(time.perf_counter() - start, 1e-3)
+    
+    _host_nps = max(1, int(ai.nodes / elapsed))
+    return _host_nps
+
+
+def get_host_nps():
+    """Return the calibrated nodes per second, or a conservative default."""
+    return _host_nps if _host_nps else DEFAULT_NPS
+
+
+def load_eval_tables(path=EVAL_TABLES_FILE):
+    """Read the tuned evaluation tables once per process ({} if there are none)."""
+    if path not in _eval_tables:
+        _eval_tables[path] = {}
+        try:
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    _eval_tables[path] = json.load(f)
+        except Exception as e:
+            print(f"Error loading {path}: {e}")
+    return _eval_tables[path]
+
+
+def _board_shield_key(board):
+    """Zobrist key of the shields on a board."""
+    return board.shields.key
+    
+    
+def _is_powerup_move(move):
+    """Powerup moves are tagged with their powerup key; board moves are not."""
+    return isinstance(move[0], str)
+
+
+def _powerup_action(move):
+    """Convert a powerup search move into the action dict the game executes."""
+    kind = move[0]
+    if kind == "gun":
+        return {"type": "gun", "shooter": move[1], "target": move[2]}
+    elif kind == "paratroopers":
+        return {"type": "paratroopers", "targets": list(move[1])}
+    elif kind == "chopper":
+        return {"type": "chopper", "confirm": True}
+    return {"type": kind, "target": move[1]}
+
+
+class MoveConstraints:
+    """Game-mode restrictions on the AI's moves for one turn.
+    
+    Compiled once when the turn starts (tutorial step, story battle rules)
+    and applied to the root move list only, so the search itself never
+    checks which mode the game is in.
+    """
+    def __init__(self, forbidden_pieces=(), allow_captures=True, aggression=1.0):
+        self.forbidden_pieces = frozenset(forbidden_pieces)
+        self.allow_captures = allow_captures
+        self.aggression = aggression
+        
+    def restricts_moves(self):
+        """True when some legal moves are not allowed."""
+        return bool(self.forbidden_pieces) or not self.allow_captures
+        
+    def filter_moves(self, board, moves):
+        """The moves of a root move list that are allowed this turn."""
+        if not self.restricts_moves():
+            return moves
+        allowed = []
+        for move in moves:
+            (from_row, from_col), (to_row, to_col) = move
+            if board.get_piece(from_row, from_col)[1] in self.forbidden_pieces:
+                continue
+            if not self.allow_captures and board.get_piece(to_row, to_col):
+                continue
+            allowed.append(move)
+        return allowed
+        
+    def capture_bonus(self, board, move, piece_values):
+        """Extra root score for captures when the battle makes the AI aggressive."""
+        if self.aggression == 1.0 or _is_powerup_move(move):
+            return 0
+        target = board.get_piece(*move[1])
+        if not target:
+            return 0
+        return (self.aggression - 1.0) * piece_values.get(target[1], 0)
+
+
+NO_CONSTRAINTS = MoveConstraints()
+
 
 class ChessAI:
     def __init__(self, difficulty="medium"):
@@ -42,11 +207,47 @@ class ChessAI:
             "very_hard": 0.35  # 35% chance per turn (strategic use)
         }
         
-        # Strategic weights for powerup selection based on ELO
-        self.powerup_weights = self._calculate_powerup_weights()
+        # Search budgets per difficulty. Strength comes from the node budget,
+        # which is identical on every machine; max_time_ms only caps the
+        # search on hosts too slow to spend the full budget in time.
+        # eval_noise is the +/- centipawn jitter applied to root scores.
+        self.search_budgets = {
+            "easy": {"nodes": 250, "max_time_ms": 300, "eval_noise": 150},
+            "medium": {"nodes": 1000, "max_time_ms": 600, "eval_noise": 60},
+            "hard": {"nodes": 3000, "max_time_ms": 1000, "eval_noise": 20},
+            "very_hard": {"nodes": 6000, "max_time_ms": 1400, "eval_noise": 5}
+        }
         
         self.start_thinking = None
         
+        # Tutorial/story restrictions for the current turn (set by start_turn)
+        self.constraints = NO_CONSTRAINTS
+        
+        # Action chosen by should_use_powerup, consumed by execute_powerup/get_move
+        self.planned_powerup = None
+        self.planned_move = None
+        
+        # Search bookkeeping (reset by _begin_search)
+        self.nodes = 0
+        self.node_limit = 0
+        self.deadline = None
+        self.search_aborted = False
+        self.yield_gil = False  # Set for background searches so the frame loop isn't kept waiting for the GIL
+        
+        # Searched positions, keyed by (piece hash, side to move, shield key).
+        # Shared with the hint service so player analysis and AI turns reuse each other's work
+        self.transposition_table = {}
+        self.tt_max_entries = TT_MAX_ENTRIES
+        self.shield_key = 0
+        
+        # Quiet moves that caused cutoffs, by remaining depth (reset by _begin_search)
+        self.killers = {}
+        
+        # Repetition detection: positions on the current search path, and the
+        # castling key needed to match the board's game history keys
+        self.castling_key = 0
+        self.search_path = set()
+        
         # Piece values for evaluation
         self.piece_values = {
             'P': 100,
@@ -57,6 +258,9 @@ class ChessAI:
             'K': 20000
         }
         
+        # Doubled/isolated/passed pawn terms, cached by pawn structure
+        self.pawn_evaluator = PawnStructureEvaluator()
+        
         # Position tables for better evaluation (from white's perspective)
         # Using NumPy arrays for faster access and operations
         self.pawn_table = np.array([
@@ -137,64 +341,93 @@ class ChessAI:
             [-50,-30,-30,-30,-30,-30,-30,-50]
         ], dtype=np.int16)
         
-    def _calculate_powerup_weights(self):
-        """Calculate strategic weights for powerup selection based on ELO."""
-        if self.elo < 1000:  # Easy
-            # Random powerup usage, no strategy
-            return {
-                "shield": 1.0,
-                "gun": 1.0,
-                "airstrike": 1.0,
-                "paratroopers": 1.0,
-                "chopper": 1.0
-            }
-        elif self.elo < 1400:  # Medium
-            # Prefer defensive and simple offensive powerups
-            return {
-                "shield": 2.0,
-                "gun": 1.5,
-                "airstrike": 1.0,
-                "paratroopers": 0.5,
-                "chopper": 0.3
-            }
-        elif self.elo < 1800:  # Hard
-            # Strategic use based on game state
-            return {
-                "shield": 1.5,
-                "gun": 2.0,
-                "airstrike": 1.5,
-                "paratroopers": 1.0,
-                "chopper": 0.5
-            }
-        else:  # Very Hard
-            # Highly strategic, saves powerful powerups
-            return {
-                "shield": 1.0,
-                "gun": 2.5,
-                "airstrike": 2.0,
-                "paratroopers": 1.5,
-                "chopper": 1.0  # Will use when advantageous
-            }
+        # Replace the hand-typed values with tuned ones if texel.py has produced them
+        tuned = load_eval_tables()
+        if "piece_values" in tuned:
+            self.piece_values.update(tuned["piece_values"])
+        for name in EVAL_TABLE_NAMES:
+            if name in tuned:
+                setattr(self, name, np.clip(np.array(tuned[name]), -32768, 32767).astype(np.int16))
+        self._build_square_values()
+        
+    def _build_square_values(self):
+        """Flatten piece values and tables into per-piece-code lists for _evaluate_board.
+        
+        square_values[code][row * 8 + col] is the piece's value plus its table
+        bonus on that square, already mirrored for black where the table is.
+        Kings get their table bonus separately since it depends on the phase.
+        """
+        positional = self.elo >= 1200
+        tables = {
+            PAWN: self.pawn_table,
+            KNIGHT: self.knight_table,
+            BISHOP: self.bishop_table,
+            ROOK: self.rook_table,
+            QUEEN: self.queen_table
+        }
+        
+        self.code_values = [0] * 16
+        self.square_values = [None] * 16
+        self.king_square_values = [None] * 16
+        self.king_endgame_square_values = [None] * 16
+        for name, code in PIECE_CODES.items():
+            piece_type = code & TYPE_MASK
+            self.code_values[code] = self.piece_values[name[1]]
+            
+            # Pawns and kings read their tables upside down for black
+            flip = 7 if code & COLOR_MASK and piece_type in (PAWN, KING) else 0
+            values = [self.code_values[code]] * 64
+            if positional and piece_type in tables:
+                table = tables[piece_type]
+                values = [values[i] + int(table[(i >> 3) ^ flip][i & 7]) for i in range(64)]
+            self.square_values[code] = values
             
-    def start_turn(self):
-        """Start the AI's thinking timer."""
+            if piece_type == KING:
+                if positional:
+                    self.king_square_values[code] = [int(self.king_table[(i >> 3) ^ flip][i & 7]) for i in range(64)]
+                    self.king_endgame_square_values[code] = [int(self.king_endgame_table[(i >> 3) ^ flip][i & 7])
+                                                             for i in range(64)]
+                else:
+                    self.king_square_values[code] = [0] * 64
+                    self.king_endgame_square_values[code] = [0] * 64
+                    
+    def start_turn(self, constraints=None):
+        """Start the AI's thinking timer with this turn's move constraints."""
         self.start_thinking = pygame.time.get_ticks()
+        self.constraints = constraints or NO_CONSTRAINTS
         
     def is_thinking(self):
         """Check if AI is still thinking."""
         if self.start_thinking is None:
             return False
         elapsed = pygame.time.get_ticks() - self.start_thinking
-        return elapsed < self.thinking_time[self.difficulty]
+        # The search itself runs after this delay, so leave room for it to
+        # keep the total latency the same on fast and slow machines
+        delay = self.thinking_time[self.difficulty] - self.expected_search_ms()
+        return elapsed < delay
+        
+    def expected_search_ms(self):
+        """Estimate how long a full-budget search takes on this machine."""
+        budget = self.search_budgets[self.difficulty]
+        nps = get_host_nps()
+        return min(budget["max_time_ms"], budget["nodes"] * 1000 / nps)
         
     def should_use_powerup(self, board, powerup_system):
-        """Decide if AI should use a powerup this turn."""
+        """Decide if AI should use a powerup this turn.
+        
+        Runs the turn's search with powerup actions included as root moves.
+        If a powerup wins, its action is kept for execute_powerup; otherwise
+        the chosen board move is kept so get_move doesn't search again.
+        """
+        self.planned_powerup = None
+        self.planned_move = None
+        
         # Check if it's AI's turn
         if board.current_turn != "black":
             return None
             
         # Random chance based on difficulty
-        if random.random() > self.powerup_usage_chance[self.difficulty]:
+        if _rng.random() > self.powerup_usage_chance[self.difficulty]:
             return None
             
         # Get available powerups
@@ -206,51 +439,19 @@ class ChessAI:
         if not available_powerups:
             return None
             
-        # Select powerup based on strategic weights and game state
-        selected_powerup = self._select_best_powerup(board, powerup_system, available_powerups)
+        best = self._choose_action(board, powerup_system, available_powerups)
+        if best is None:
+            return None
+        if _is_powerup_move(best):
+            self.planned_powerup = best
+            return best[0]
+            
+        self.planned_move = (self._position_signature(board), best)
+        return None
         
-        return selected_powerup
-        
-    def _select_best_powerup(self, board, powerup_system, available_powerups):
-        """Select the best powerup based on game state and AI strategy."""
-        # Evaluate game state
-        material_balance = self._evaluate_material_balance(board)
-        is_losing = material_balance < -200  # AI is down significant material
-        is_winning = material_balance > 200   # AI is up significant material
-        
-        # Adjust weights based on game state
-        adjusted_weights = {}
-        for powerup in available_powerups:
-            weight = self.powerup_weights.get(powerup, 1.0)
-            
-            # Strategic adjustments based on ELO
-            if self.elo >= 1600:  # Hard and Very Hard
-                if powerup == "shield" and is_losing:
-                    weight *= 2.0  # Protect valuable pieces when losing
-                elif powerup == "gun" and self._has_good_gun_target(board, powerup_system):
-                    weight *= 3.0  # High priority if can eliminate valuable piece
-                elif powerup == "airstrike" and self._has_good_airstrike_target(board):
-                    weight *= 2.5  # Good for clearing clustered pieces
-                elif powerup == "paratroopers" and is_winning:
-                    weight *= 2.0  # Press advantage with more pieces
-                elif powerup == "chopper" and is_losing and powerup_system.points["black"] >= 25:
-                    weight *= 5.0  # Desperation move when losing badly
-                    
-            adjusted_weights[powerup] = weight
-            
-        # Weighted random selection
-        total_weight = sum(adjusted_weights.values())
-        if total_weight == 0:
-            return random.choice(available_powerups)
-            
-        r = random.uniform(0, total_weight)
-        cumulative = 0
-        for powerup, weight in adjusted_weights.items():
-            cumulative += weight
-            if r <= cumulative:
-                return powerup
-                
-        return available_powerups[-1]  # Fallback
+    def _position_signature(self, board):
+        """Identify the current position for reusing a planned move."""
+        return (bytes(board.squares), board.current_turn)
         
     def _evaluate_material_balance(self, board):
         """Evaluate material balance from AI's perspective (positive = AI advantage)."""
@@ -269,69 +470,48 @@ class ChessAI:
                         
         return black_material - white_material
         
-    def _has_good_gun_target(self, board, powerup_system):
-        """Check if there's a valuable enemy piece that can be shot."""
-        # Find all black pieces that could shoot
+    def _gun_shots(self, board, powerup_system):
+        """All AI gun shots as (victim value, shooter, target), best first."""
+        shots = []
         for row in range(8):
             for col in range(8):
                 piece = board.get_piece(row, col)
                 if piece and piece[0] == 'b':
-                    # Check potential gun targets from this position
-                    targets = self._get_gun_targets_for_ai(row, col, board)
-                    for target_row, target_col in targets:
-                        target_piece = board.get_piece(target_row, target_col)
-                        if target_piece and target_piece[1] in ['Q', 'R']:
-                            return True  # Can shoot queen or rook
-        return False
-        
-    def _get_gun_targets_for_ai(self, row, col, board):
-        """Get valid gun targets for AI (same as player logic)."""
-        targets = []
-        
-        # Check all 8 directions for line of sight
-        directions = [
-            (-1, 0), (1, 0), (0, -1), (0, 1),  # Cardinal
-            (-1, -1), (-1, 1), (1, -1), (1, 1)  # Diagonal
-        ]
-        
-        for dr, dc in directions:
-            for distance in range(1, 8):
-                check_row = row + dr * distance
-                check_col = col + dc * distance
-                
-                if not (0 <= check_row < 8 and 0 <= check_col < 8):
-                    break
-                    
-                target = board.get_piece(check_row, check_col)
-                if target:
-                    if target[0] == 'w' and target[1] != 'K':
-                        targets.append((check_row, check_col))
-                    break  # Can't shoot through pieces
-                    
-        return targets
-        
-    def _has_good_airstrike_target(self, board):
+                    for target in gun_targets(board, row, col, 'w'):
+                        if powerup_system and powerup_system.is_piece_shielded(*target):
+                            continue  # The shot would be wasted
+                        victim = board.get_piece(*target)
+                        shots.append((self.piece_values[victim[1]], (row, col), target))
+        shots.sort(key=lambda shot: shot[0], reverse=True)
+        return shots
+        
+    def _airstrike_centres(self, board, powerup_system, grids=None):
+        """All airstrike centres as (net value, centre), best first.
+        
+        One 3x3 box-filter pass over the board value grid scores every
+        centre at once. Kings and shielded pieces survive the strike, so
+        they count for nothing; friendly pieces count at half value against it.
+        """
+        if grids is None:
+            grids = board_grids(board, self.piece_values, powerup_system)
+        value_map = airstrike_value_map(grids, attacker='b', friendly_fire=0.5).ravel()
+        
+        # Best value first, ties broken by square order
+        order = np.lexsort((np.arange(64), -value_map))
+        return [(float(value_map[i]), divmod(int(i), 8)) for i in order]
+        
+    def _has_good_airstrike_target(self, board, powerup_system=None, grids=None):
         """Check if there's a good 3x3 area to airstrike."""
-        best_value = 0
-        
-        for center_row in range(8):
-            for center_col in range(8):
-                value = 0
-                for dr in range(-1, 2):
-                    for dc in range(-1, 2):
-                        r, c = center_row + dr, center_col + dc
-                        if 0 <= r < 8 and 0 <= c < 8:
-                            piece = board.get_piece(r, c)
-                            if piece and piece[0] == 'w' and piece[1] != 'K':
-                                value += self.piece_values.get(piece[1], 0)
-                                
-                if value > best_value:
-                    best_value = value
-                    
+        best_value = self._airstrike_centres(board, powerup_system, grids)[0][0]
         return best_value >= 500  # Worth it if can destroy 500+ points of material
         
     def execute_powerup(self, board, powerup_system, powerup_key):
         """Execute the selected powerup for AI."""
+        if self.planned_powerup and self.planned_powerup[0] == powerup_key:
+            action = _powerup_action(self.planned_powerup)
+            self.planned_powerup = None
+            return action
+            
         if powerup_key == "shield":
             return self._execute_shield(board, powerup_system)
         elif powerup_key == "gun":
@@ -345,92 +525,52 @@ class ChessAI:
             
         return None
         
-    def _execute_shield(self, board, powerup_system):
-        """AI uses shield powerup."""
-        # Find most valuable unshielded piece
-        best_piece = None
-        best_value = 0
-        
+    def _shield_candidates(self, board, powerup_system):
+        """Unshielded AI pieces worth protecting as (value, square), best first."""
+        candidates = []
         for row in range(8):
             for col in range(8):
                 piece = board.get_piece(row, col)
-                if piece and piece[0] == 'b' and not powerup_system.is_piece_shielded(row, col):
+                # Kings can't be captured, so shielding them is wasted
+                if piece and piece[0] == 'b' and piece[1] != 'K' and not powerup_system.is_piece_shielded(row, col):
                     value = self.piece_values.get(piece[1], 0)
                     
                     # Prioritize pieces under attack if ELO >= 1400
-                    if self.elo >= 1400 and self._square_is_attacked(board, row, col, 'w'):
+                    if self.elo >= 1400 and board.is_square_attacked(row, col, 'b'):
                         value *= 2
                         
-                    if value > best_value:
-                        best_value = value
-                        best_piece = (row, col)
-                        
-        if best_piece:
+                    candidates.append((value, (row, col)))
+        candidates.sort(key=lambda item: item[0], reverse=True)
+        return candidates
+        
+    def _execute_shield(self, board, powerup_system):
+        """AI uses shield powerup."""
+        candidates = self._shield_candidates(board, powerup_system)
+        if candidates:
             return {
                 "type": "shield",
-                "target": best_piece
+                "target": candidates[0][1]
             }
             
         return None
         
     def _execute_gun(self, board, powerup_system):
         """AI uses gun powerup."""
-        best_shot = None
-        best_value = 0
-        
-        # Check all black pieces for shooting opportunities
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece and piece[0] == 'b':
-                    targets = self._get_gun_targets_for_ai(row, col, board)
-                    for target_row, target_col in targets:
-                        target_piece = board.get_piece(target_row, target_col)
-                        if target_piece:
-                            value = self.piece_values.get(target_piece[1], 0)
-                            if value > best_value:
-                                best_value = value
-                                best_shot = {
-                                    "shooter": (row, col),
-                                    "target": (target_row, target_col)
-                                }
-                                
-        if best_shot:
+        shots = self._gun_shots(board, powerup_system)
+        if shots:
+            _, shooter, target = shots[0]
             return {
                 "type": "gun",
-                "shooter": best_shot["shooter"],
-                "target": best_shot["target"]
+                "shooter": shooter,
+                "target": target
             }
             
         return None
         
     def _execute_airstrike(self, board, powerup_system):
         """AI uses airstrike powerup."""
-        best_target = None
-        best_value = 0
-        
-        for center_row in range(8):
-            for center_col in range(8):
-                value = 0
-                hits = []
-                
-                for dr in range(-1, 2):
-                    for dc in range(-1, 2):
-                        r, c = center_row + dr, center_col + dc
-                        if 0 <= r < 8 and 0 <= c < 8:
-                            piece = board.get_piece(r, c)
-                            if piece:
-                                if piece[0] == 'w' and piece[1] != 'K':
-                                    value += self.piece_values.get(piece[1], 0)
-                                    hits.append((r, c))
-                                elif piece[0] == 'b':
-                                    value -= self.piece_values.get(piece[1], 0) * 0.5  # Penalty for friendly fire
-                                    
-                if value > best_value:
-                    best_value = value
-                    best_target = (center_row, center_col)
-                    
-        if best_target and best_value > 0:
+        best_value, best_target = self._airstrike_centres(board, powerup_system)[0]
+        if best_value > 0:
             return {
                 "type": "airstrike",
                 "target": best_target
@@ -438,46 +578,20 @@ class ChessAI:
             
         return None
         
-    def _execute_paratroopers(self, board, powerup_system):
+    def _execute_paratroopers(self, board, powerup_system, grids=None):
         """AI uses paratroopers powerup."""
-        # Find 3 strategic empty squares
-        empty_squares = []
-        for row in range(8):
-            for col in range(8):
-                if board.get_piece(row, col) == "":
-                    empty_squares.append((row, col))
-                    
-        if len(empty_squares) < 3:
-            return None
-            
-        # Prioritize squares based on strategy
-        scored_squares = []
-        for row, col in empty_squares:
-            score = 0
+        if grids is None:
+            grids = board_grids(board, self.piece_values, powerup_system)
             
-            # Prefer advanced positions
-            if row <= 3:  # Closer to white's side
-                score += 10
-                
-            # Prefer central squares
-            if 2 <= col <= 5:
-                score += 5
-                
-            # Check if can immediately threaten pieces
-            # Pawn attacks diagonally
-            for dc in [-1, 1]:
-                attack_row = row + 1  # Black pawns move down
-                attack_col = col + dc
-                if 0 <= attack_row < 8 and 0 <= attack_col < 8:
-                    target = board.get_piece(attack_row, attack_col)
-                    if target and target[0] == 'w':
-                        score += self.piece_values.get(target[1], 0) / 100
-                        
-            scored_squares.append((score, row, col))
+        # Score every empty square at once: advanced, central and
+        # threatening drops are preferred
+        scores = paratrooper_square_scores(grids, self.piece_values['P']).ravel()
+        if np.count_nonzero(np.isfinite(scores)) < 3:
+            return None
             
-        # Sort by score and pick top 3
-        scored_squares.sort(reverse=True)
-        targets = [(row, col) for _, row, col in scored_squares[:3]]
+        # Pick the top 3, ties going to the later square
+        order = np.lexsort((-np.arange(64), -scores))
+        targets = [divmod(int(i), 8) for i in order[:3]]
         
         return {
             "type": "paratroopers",
@@ -507,67 +621,355 @@ class ChessAI:
         return None
         
     def get_move(self, board):
-        """Get the AI's move based on difficulty and ELO rating."""
-        # Use ELO to determine search depth and move quality
-        if self.elo < 1000:
-            return self._get_elo_based_move(board, random_error_rate=0.3)
-        elif self.elo < 1400:
-            return self._get_elo_based_move(board, random_error_rate=0.15)
-        elif self.elo < 1800:
-            return self._get_elo_based_move(board, random_error_rate=0.05)
-        else:
-            return self._get_elo_based_move(board, random_error_rate=0.01)
+        """Get the AI's move within this difficulty's search budget."""
+        planned = self.planned_move
+        self.planned_move = None
+        if planned and planned[0] == self._position_signature(board):
+            return planned[1]
+        return self._choose_action(board)
+        
+    def _choose_action(self, board, powerup_system=None, available_powerups=()):
+        """Search with this difficulty's budget, optionally including powerups."""
+        budget = self.search_budgets[self.difficulty]
+        return self._get_budgeted_move(board, budget["nodes"], budget["max_time_ms"],
+                                       budget["eval_noise"], powerup_system,
+                                       available_powerups)
             
-    def _get_elo_based_move(self, board, random_error_rate):
-        """Get move with ELO-based strength and random errors."""
-        moves = self._get_all_legal_moves(board)
+    def _get_budgeted_move(self, board, node_limit, max_time_ms, eval_noise,
+                           powerup_system=None, available_powerups=()):
+        """Iterative deepening until the node or time budget runs out."""
+        moves = self.constraints.filter_moves(board, self._get_all_legal_moves(board))
         if not moves:
             return None
             
-        # Random error (blunder) based on ELO
-        if random.random() < random_error_rate:
-            # Make a random move (blunder)
-            return random.choice(moves)
-            
-        # Calculate search depth based on ELO
-        if self.elo < 1000:
-            depth = 1
-        elif self.elo < 1400:
-            depth = 2
-        elif self.elo < 1800:
-            depth = 3
-        else:
-            depth = 3  # Limit to 3 for Very Hard to prevent lag
-            
         # Always check for immediate checkmate
         for move in moves:
             if self._move_gives_checkmate(board, move):
                 return move
                 
-        # Use minimax with ELO-based depth
-        best_move = None
-        best_score = -999999
-        
-        # Add some randomness to move ordering for lower ELO
-        if self.elo < 1400:
-            random.shuffle(moves)
-        else:
-            moves = self._order_moves(board, moves)
-        
-        for move in moves:
-            score = self._minimax(board, depth, -999999, 999999, False, move)
+        moves = self._order_moves(board, moves)
+        if available_powerups:
+            moves += self._generate_powerup_moves(board, powerup_system, available_powerups)
+        self._begin_search(node_limit, max_time_ms)
+        self._prepare_search_keys(board)
+        
+        scores = None
+        for depth in range(1, MAX_SEARCH_DEPTH + 1):
+            # Noise can promote any move, so each needs an exact score rather than a bound
+            iteration_scores = self._search_root(board, moves, depth, powerup_system,
+                                                 full_window=bool(eval_noise))
+            if self.search_aborted:
+                break  # Keep the last fully searched iteration
+            scores = iteration_scores
             
-            # Add small random factor for move variety
-            score += random.uniform(-10, 10) * (2000 - self.elo) / 1000
+            # Search the best move first on the next iteration
+            moves.sort(key=lambda m: scores[m], reverse=True)
+            if scores[moves[0]] >= MATE_THRESHOLD:
+                break
+                
+        if scores is None:
+            return moves[0]
             
+        # Evaluation noise replaces the old random blunders
+        best_move = None
+        best_score = -INFINITY
+        for move in moves:
+            score = (scores[move] + self.constraints.capture_bonus(board, move, self.piece_values) +
+                     _rng.uniform(-eval_noise, eval_noise))
             if score > best_score:
                 best_score = score
                 best_move = move
                 
         return best_move
         
+    def analyse_position(self, board, depth, color='w'):
+        """Score every legal move for color at a fixed depth, best first (multi-PV).
+        
+        Each root move is searched with a full window so every score is exact
+        rather than a bound. Scores are from the mover's point of view. Uses
+        the budget set by _begin_search and returns None if it ran out.
+        """
+        self._prepare_search_keys(board)
+        moves = self._order_moves_simple(board, self._get_all_moves_for_color(board, color))
+        
+        lines = []
+        for move in moves:
+            if color == 'b':
+                score = self._minimax(board, depth, -INFINITY, INFINITY, False, move)
+            else:
+                score = -self._minimax(board, depth, -INFINITY, INFINITY, True, move)
+            if self.search_aborted:
+                return None
+            lines.append((score, move))
+            
+        lines.sort(key=lambda line: line[0], reverse=True)
+        return lines
+        
+    def search_position(self, board, max_depth=MAX_SEARCH_DEPTH, eval_noise=0, on_iteration=None,
+                        search_moves=None):
+        """Iterative deepening for whichever side is to move (used by the UCI engine).
+        
+        Uses the budget set by _begin_search, so another thread can stop it by
+        setting search_aborted. on_iteration(depth, score, move) is called after
+        each completed depth. search_moves, if given, limits the root to those
+        of its moves that are legal. Returns (move, score, depth) with the score
+        from the mover's point of view, or (None, 0, 0) if there are no legal moves.
+        """
+        color = 'w' if board.current_turn == "white" else 'b'
+        self._prepare_search_keys(board)
+        moves = self._get_all_moves_for_color(board, color)
+        if search_moves:
+            moves = [move for move in moves if move in search_moves] or moves
+        moves = self._order_moves_simple(board, moves)
+        if not moves:
+            return None, 0, 0
+            
+        scores = None
+        completed_depth = 0
+        for depth in range(1, max_depth + 1):
+            iteration_scores = self._search_root(board, moves, depth, color=color,
+                                                 full_window=bool(eval_noise))
+            if self.search_aborted:
+                break
+            scores = iteration_scores
+            completed_depth = depth
+            moves.sort(key=lambda m: scores[m], reverse=True)
+            if on_iteration:
+                on_iteration(depth, scores[moves[0]], moves[0])
+            if scores[moves[0]] >= MATE_THRESHOLD:
+                break
+                
+        if scores is None:
+            return moves[0], 0, 0
+            
+        best_move = moves[0]
+        if eval_noise:
+            best_move = max(moves, key=lambda m: scores[m] + _rng.uniform(-eval_noise, eval_noise))
+        return best_move, scores[best_move], completed_depth
+        
+    def _search_root(self, board, moves, depth, powerup_system=None, color='b', full_window=False):
+        """Search every root move to the given depth and return their scores.
+        
+        Scores are from color's point of view; the search itself always
+        scores from black's, so white's root flips the sign and window.
+        Moves after the first are searched against the best score so far and
+        only prove they are worse, so their scores are upper bounds unless
+        full_window is set.
+        """
+        scores = {}
+        alpha = -INFINITY
+        for move in moves:
+            if _is_powerup_move(move):
+                score = self._search_powerup(board, powerup_system, move, depth, alpha)
+            elif color == 'w':
+                score = -self._minimax(board, depth, -INFINITY, -alpha, True, move)
+            else:
+                score = self._minimax(board, depth, alpha, INFINITY, False, move)
+            if self.search_aborted:
+                break
+            scores[move] = score
+            if not full_window:
+                alpha = max(alpha, score)
+        return scores
+        
+    def _generate_powerup_moves(self, board, powerup_system, available_powerups):
+        """Build powerup root moves from the best few targets of each powerup.
+        
+        Moves are tuples tagged with the powerup key, e.g. ("gun", shooter,
+        target). Only POWERUP_CANDIDATES targets per powerup are searched to
+        keep the branching factor close to that of a normal move.
+        """
+        moves = []
+        grids = board_grids(board, self.piece_values, powerup_system)
+        
+        if "gun" in available_powerups:
+            for _, shooter, target in self._gun_shots(board, powerup_system)[:POWERUP_CANDIDATES]:
+                moves.append(("gun", shooter, target))
+                
+        if "airstrike" in available_powerups and self._has_good_airstrike_target(board, powerup_system, grids):
+            for value, centre in self._airstrike_centres(board, powerup_system, grids)[:POWERUP_CANDIDATES]:
+                if value > 0:
+                    moves.append(("airstrike", centre))
+                    
+        if "shield" in available_powerups:
+            for _, square in self._shield_candidates(board, powerup_system)[:POWERUP_CANDIDATES]:
+                moves.append(("shield", square))
+                
+        if "paratroopers" in available_powerups:
+            action = self._execute_paratroopers(board, powerup_system, grids)
+            if action:
+                moves.append(("paratroopers", tuple(action["targets"])))
+                
+        if "chopper" in available_powerups and self._execute_chopper(board, powerup_system):
+            moves.append(("chopper",))
+            
+        return moves
+        
+    def _search_powerup(self, board, powerup_system, move, depth, alpha):
+        """Score a powerup root move by searching the AI's follow-up move.
+        
+        Powerups don't end the turn, so after applying one the AI still makes
+        a normal move. The points spent are charged against the result.
+        """
+        cost = powerup_system.powerups[move[0]]["cost"] * POWERUP_POINT_VALUE
+        undo = self._make_powerup(board, powerup_system, move)
+        
+        best_score = -INFINITY
+        follow_alpha = alpha + cost
+        follow_moves = self._order_moves_simple(board, self._get_all_legal_moves(board))
+        for follow_move in follow_moves:
+            score = self._minimax(board, depth, follow_alpha, INFINITY, False, follow_move)
+            if self.search_aborted:
+                break
+            best_score = max(best_score, score)
+            follow_alpha = max(follow_alpha, score)
+            
+        self._unmake_powerup(board, powerup_system, undo)
+        return best_score - cost
+        
+    def _make_powerup(self, board, powerup_system, move):
+        """Apply a powerup move in search and return the record to undo it.
+        
+        Follows the same rules as the real powerups: kings and shielded
+        pieces can't be destroyed, and the airstrike hits both colours.
+        """
+        kind = move[0]
+        destroyed = []
+        dropped = []
+        previous_shield = None
+        
+        if kind == "shield":
+            square = move[1]
+            previous_shield = powerup_system.shielded_pieces.get(square)
+            powerup_system.shielded_pieces[square] = 3
+            if previous_shield is None:
+                self.shield_key ^= ZOBRIST_SHIELDS[square[0] * 8 + square[1]]
+        elif kind == "paratroopers":
+            for row, col in move[1]:
+                if board.get_piece(row, col) == "":
+                    board.set_piece(row, col, "bP")
+                    dropped.append((row, col))
+        else:
+            if kind == "gun":
+                squares = (move[2],)
+            elif kind == "airstrike":
+                squares = NEIGHBOURHOOD[move[1]]
+            else:  # chopper
+                squares = [(row, col) for row in range(8) for col in range(8)
+                           if board.get_piece(row, col)[:1] == 'w']
+            for row, col in squares:
+                piece = board.get_piece(row, col)
+                if piece and piece[1] != 'K' and not powerup_system.is_piece_shielded(row, col):
+                    board.set_piece(row, col, "")
+                    destroyed.append((row, col, piece))
+                    
+        powerup_system.points["black"] -= powerup_system.powerups[kind]["cost"]
+        return (move, destroyed, dropped, previous_shield)
+        
+    def _unmake_powerup(self, board, powerup_system, undo):
+        """Revert a powerup move applied by _make_powerup."""
+        move, destroyed, dropped, previous_shield = undo
+        kind = move[0]
+        
+        powerup_system.points["black"] += powerup_system.powerups[kind]["cost"]
+        for row, col, piece in destroyed:
+            board.set_piece(row, col, piece)
+        for row, col in dropped:
+            board.set_piece(row, col, "")
+        if kind == "shield":
+            if previous_shield is None:
+                del powerup_system.shielded_pieces[move[1]]
+                self.shield_key ^= ZOBRIST_SHIELDS[move[1][0] * 8 + move[1][1]]
+            else:
+                powerup_system.shielded_pieces[move[1]] = previous_shield
+        
+    def _begin_search(self, node_limit, max_time_ms):
+        """Reset the node counter and deadline for a new search."""
+        self.nodes = 0
+        self.node_limit = node_limit
+        self.deadline = time.perf_counter() + max_time_ms / 1000.0 if max_time_ms else None
+        self.search_aborted = False
+        self.killers = {}
+        if len(self.transposition_table) > self.tt_max_entries:
+            self.transposition_table.clear()
+        
+    def _out_of_budget(self):
+        """Count a node and report whether the search must stop."""
+        if self.search_aborted:
+            return True
+        self.nodes += 1
+        if self.node_limit and self.nodes > self.node_limit:
+            self.search_aborted = True
+        elif self.nodes & YIELD_MASK == 0:
+            if self.yield_gil:
+                time.sleep(0)  # Lets a waiting thread take the GIL now instead of after the switch interval
+            if (self.deadline is not None and self.nodes & BUDGET_CHECK_MASK == 0
+                    and time.perf_counter() > self.deadline):
+                self.search_aborted = True
+        return self.search_aborted
+        
+    def _prepare_search_keys(self, board):
+        """Capture the parts of the position key that stay fixed during a search."""
+        self.shield_key = _board_shield_key(board)
+        self.castling_key = board.castling_hash()
+        self.search_path = set()
+        
+    def _is_repetition(self, board, repetition_key):
+        """True if the position already occurred in the game or on the search path."""
+        return repetition_key in self.search_path or repetition_key in board.position_counts
+        
+    def _tt_probe(self, key, depth, ply, alpha, beta):
+        """Return a stored score usable at this depth and window, else None."""
+        entry = self.transposition_table.get(key)
+        if entry is None or entry[0] < depth:
+            return None
+        score, flag = entry[1], entry[2]
+        # Mates are stored counted from the node; count them from this search's root again
+        if score >= MATE_THRESHOLD:
+            score -= ply
+        elif score <= -MATE_THRESHOLD:
+            score += ply
+        if flag == TT_EXACT:
+            return score
+        if flag == TT_LOWER and score >= beta:
+            return score
+        if flag == TT_UPPER and score <= alpha:
+            return score
+        return None
+        
+    def _tt_move(self, key):
+        """Best move stored for a position by an earlier search, at any depth."""
+        entry = self.transposition_table.get(key)
+        return entry[3] if entry else None
+        
+    def _tt_store(self, key, depth, ply, score, alpha, beta, best_move=None):
+        """Remember a finished node's score, whether it is exact or a bound, and its best move.
+        
+        ply is the node's distance from the root. Mate scores are stored
+        counted from the node instead, so searches from other roots (the
+        table is shared with the hint service) read the right distance.
+        """
+        if self.search_aborted:
+            return  # Scores from an unfinished search are meaningless
+        if score <= alpha:
+            flag = TT_UPPER
+        elif score >= beta:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        if score >= MATE_THRESHOLD:
+            score += ply
+        elif score <= -MATE_THRESHOLD:
+            score -= ply
+        self.transposition_table[key] = (depth, score, flag, best_move)
+        
     def _minimax(self, board, depth, alpha, beta, is_maximizing, initial_move):
         """Minimax with alpha-beta pruning."""
+        # Stop searching once the budget is spent; the caller discards
+        # results from the unfinished iteration
+        if self._out_of_budget():
+            return 0
+            
         # Terminal node
         if depth == 0:
             return self._evaluate_board(board)
@@ -575,248 +977,237 @@ class ChessAI:
         # Make the initial move
         from_row, from_col = initial_move[0]
         to_row, to_col = initial_move[1]
+        from_square = MAILBOX[from_row * 8 + from_col]
+        to_square = MAILBOX[to_row * 8 + to_col]
         
-        moving_piece = board.get_piece(from_row, from_col)
-        captured_piece = board.get_piece(to_row, to_col)
+        moving_piece = board.squares[from_square]
+        captured_piece = board.squares[to_square]
         
         # Make move
-        board.set_piece(to_row, to_col, moving_piece)
-        board.set_piece(from_row, from_col, "")
+        board.set_square(to_square, moving_piece)
+        board.set_square(from_square, EMPTY)
         
         # Check for immediate win (king capture)
-        if captured_piece and captured_piece[1] == 'K':
+        if captured_piece & TYPE_MASK == KING:
             # Undo move
-            board.set_piece(from_row, from_col, moving_piece)
-            board.set_piece(to_row, to_col, captured_piece)
-            return 999999 - (5 - depth) * 1000  # Prefer faster checkmates
+            board.set_square(from_square, moving_piece)
+            board.set_square(to_square, captured_piece)
+            return -(MATE - 1) if is_maximizing else MATE - 1
             
-        # Recursive minimax
+        # A repeated position is a draw, which also cuts off cycles
+        repetition_key = board.piece_hash ^ self.castling_key ^ self.shield_key
         if is_maximizing:
-            max_eval = -999999
-            moves = self._get_all_moves_for_color(board, 'b')
-            
-            # Order moves for better pruning
-            if depth > 2:
-                moves = self._order_moves_simple(board, moves)
-                
-            for move in moves:
-                eval_score = self._minimax_recursive(board, depth - 1, alpha, beta, False, move)
-                max_eval = max(max_eval, eval_score)
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
-                    
-            score = max_eval
-        else:
-            min_eval = 999999
-            moves = self._get_all_moves_for_color(board, 'w')
-            
-            # Order moves for better pruning
-            if depth > 2:
-                moves = self._order_moves_simple(board, moves)
-                
-            for move in moves:
-                eval_score = self._minimax_recursive(board, depth - 1, alpha, beta, True, move)
-                min_eval = min(min_eval, eval_score)
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
-                    
-            score = min_eval
+            repetition_key ^= ZOBRIST_BLACK_TO_MOVE
+        if self._is_repetition(board, repetition_key):
+            board.set_square(from_square, moving_piece)
+            board.set_square(to_square, captured_piece)
+            return 0
             
+        # Reuse an earlier search of this position if it is deep enough
+        tt_key = (board.piece_hash, is_maximizing, self.shield_key)
+        cached = self._tt_probe(tt_key, depth, 1, alpha, beta)
+        if cached is not None:
+            board.set_square(from_square, moving_piece)
+            board.set_square(to_square, captured_piece)
+            return cached
+        alpha_orig, beta_orig = alpha, beta
+        self.search_path.add(repetition_key)
+        
+        # Continue minimax, producing moves lazily in stages
+        score, best_move = self._search_children(board, depth, 1, alpha, beta, is_maximizing, tt_key)
+        
+        self.search_path.discard(repetition_key)
+        self._tt_store(tt_key, depth, 1, score, alpha_orig, beta_orig, best_move)
+        
         # Undo move
-        board.set_piece(from_row, from_col, moving_piece)
-        board.set_piece(to_row, to_col, captured_piece)
+        board.set_square(from_square, moving_piece)
+        board.set_square(to_square, captured_piece)
         
         return score
         
-    def _minimax_recursive(self, board, depth, alpha, beta, is_maximizing, move):
-        """Recursive part of minimax."""
+    def _minimax_recursive(self, board, depth, alpha, beta, is_maximizing, move, ply):
+        """Recursive part of minimax; move is a (from, to) pair of mailbox squares played at ply."""
+        if self._out_of_budget():
+            return 0
+            
         if depth == 0:
             return self._evaluate_board(board)
             
-        from_row, from_col = move[0]
-        to_row, to_col = move[1]
+        from_square, to_square = move
         
-        moving_piece = board.get_piece(from_row, from_col)
-        captured_piece = board.get_piece(to_row, to_col)
+        moving_piece = board.squares[from_square]
+        captured_piece = board.squares[to_square]
         
         # Make move
-        board.set_piece(to_row, to_col, moving_piece)
-        board.set_piece(from_row, from_col, "")
+        board.set_square(to_square, moving_piece)
+        board.set_square(from_square, EMPTY)
         
         # Check for king capture
-        if captured_piece and captured_piece[1] == 'K':
+        if captured_piece & TYPE_MASK == KING:
             # Undo move
-            board.set_piece(from_row, from_col, moving_piece)
-            board.set_piece(to_row, to_col, captured_piece)
-            if is_maximizing:
-                return -999999 + (5 - depth) * 1000
-            else:
-                return 999999 - (5 - depth) * 1000
+            board.set_square(from_square, moving_piece)
+            board.set_square(to_square, captured_piece)
+            return -(MATE - ply) if is_maximizing else MATE - ply
                 
-        # Continue minimax
+        # A repeated position is a draw, which also cuts off cycles
+        repetition_key = board.piece_hash ^ self.castling_key ^ self.shield_key
         if is_maximizing:
-            max_eval = -999999
-            moves = self._get_all_moves_for_color(board, 'b')
-            for next_move in moves:
-                eval_score = self._minimax_recursive(board, depth - 1, alpha, beta, False, next_move)
-                max_eval = max(max_eval, eval_score)
+            repetition_key ^= ZOBRIST_BLACK_TO_MOVE
+        if self._is_repetition(board, repetition_key):
+            board.set_square(from_square, moving_piece)
+            board.set_square(to_square, captured_piece)
+            return 0
+            
+        tt_key = (board.piece_hash, is_maximizing, self.shield_key)
+        cached = self._tt_probe(tt_key, depth, ply, alpha, beta)
+        if cached is not None:
+            board.set_square(from_square, moving_piece)
+            board.set_square(to_square, captured_piece)
+            return cached
+        alpha_orig, beta_orig = alpha, beta
+        self.search_path.add(repetition_key)
+        
+        # Continue minimax, producing moves lazily in stages
+        score, best_move = self._search_children(board, depth, ply, alpha, beta, is_maximizing, tt_key)
+        
+        self.search_path.discard(repetition_key)
+        self._tt_store(tt_key, depth, ply, score, alpha_orig, beta_orig, best_move)
+        
+        # Undo move
+        board.set_square(from_square, moving_piece)
+        board.set_square(to_square, captured_piece)
+        
+        return score
+        
+    def _search_children(self, board, depth, ply, alpha, beta, is_maximizing, tt_key):
+        """Search the replies at a node ply moves from the root; returns (score, best move)."""
+        best_move = None
+        if is_maximizing:
+            best_score = -INFINITY
+            for move in self._staged_moves(board, BLACK, depth, self._tt_move(tt_key)):
+                eval_score = self._minimax_recursive(board, depth - 1, alpha, beta, False, move, ply + 1)
+                if eval_score > best_score:
+                    best_score = eval_score
+                    best_move = move
                 alpha = max(alpha, eval_score)
                 if beta <= alpha:
+                    self._store_killer(board, depth, move)
                     break
-            score = max_eval
         else:
-            min_eval = 999999
-            moves = self._get_all_moves_for_color(board, 'w')
-            for next_move in moves:
-                eval_score = self._minimax_recursive(board, depth - 1, alpha, beta, True, next_move)
-                min_eval = min(min_eval, eval_score)
+            best_score = INFINITY
+            for move in self._staged_moves(board, WHITE, depth, self._tt_move(tt_key)):
+                eval_score = self._minimax_recursive(board, depth - 1, alpha, beta, True, move, ply + 1)
+                if eval_score < best_score:
+                    best_score = eval_score
+                    best_move = move
                 beta = min(beta, eval_score)
                 if beta <= alpha:
+                    self._store_killer(board, depth, move)
                     break
-            score = min_eval
-            
-        # Undo move
-        board.set_piece(from_row, from_col, moving_piece)
-        board.set_piece(to_row, to_col, captured_piece)
+        if best_move is None:
+            # No legal reply: mated by the move at this ply, or stalemated
+            own = BLACK if is_maximizing else WHITE
+            king_square = board.squares.find(own | KING)
+            if king_square >= 0 and not board._is_attacked(king_square, own ^ COLOR_MASK):
+                best_score = 0
+            else:
+                best_score = -(MATE - ply) if is_maximizing else MATE - ply
+        return best_score, best_move
         
-        return score
+    def _staged_moves(self, board, own, depth, hash_move):
+        """Yield legal moves one at a time: hash move, captures by MVV/LVA, killers, then quiets.
         
+        Moves are (from, to) pairs of mailbox squares. Legality, the costly
+        part, is only tested when a move is about to be searched, so after a
+        beta cutoff the remaining moves are never tested at all.
+        """
+        captures, quiets = board.pseudo_moves(own)
+        
+        if hash_move and (hash_move in captures or hash_move in quiets) and board.is_legal_move(*hash_move):
+            yield hash_move
+            
+        # Most valuable victim first, least valuable attacker breaking ties
+        squares = board.squares
+        values = self.code_values
+        captures.sort(key=lambda move: values[squares[move[1]]] * 10 - values[squares[move[0]]], reverse=True)
+        for move in captures:
+            if move != hash_move and board.is_legal_move(*move):
+                yield move
+                
+        # Quiet moves that caused a cutoff at this depth before
+        killers = self.killers.get(depth, ())
+        for move in killers:
+            if move != hash_move and move in quiets and board.is_legal_move(*move):
+                yield move
+                
+        for move in quiets:
+            if move != hash_move and move not in killers and board.is_legal_move(*move):
+                yield move
+                
+    def _store_killer(self, board, depth, move):
+        """Remember a quiet move that caused a beta cutoff (two per depth)."""
+        if board.squares[move[1]]:
+            return  # Captures are already searched early
+        killers = self.killers.setdefault(depth, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+            
     def _evaluate_board(self, board):
         """Evaluate board position with ELO-based accuracy."""
         white_score = 0
         black_score = 0
         white_pieces = 0
         black_pieces = 0
-        
-        # Count material and positions
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if not piece:
-                    continue
-                    
-                piece_type = piece[1]
-                piece_color = piece[0]
-                
-                # Base piece value
-                value = self.piece_values[piece_type]
+        squares = board.squares
+        square_values = self.square_values
+        
+        # Count material and positions (tables are only included for higher ELO)
+        for index, square in enumerate(MAILBOX):
+            code = squares[square]
+            if not code:
+                continue
                 
-                # Count pieces for endgame detection
-                if piece_type != 'K' and piece_type != 'P':
-                    if piece_color == 'w':
-                        white_pieces += 1
-                    else:
-                        black_pieces += 1
-                        
-                # Position bonus based on piece type (only for higher ELO)
-                if self.elo >= 1200:
-                    if piece_type == 'P':
-                        if piece_color == 'w':
-                            value += self.pawn_table[row][col]
-                        else:
-                            value += self.pawn_table[7-row][col]
-                    elif piece_type == 'N':
-                        value += self.knight_table[row][col]
-                    elif piece_type == 'B':
-                        value += self.bishop_table[row][col]
-                    elif piece_type == 'R':
-                        value += self.rook_table[row][col]
-                    elif piece_type == 'Q':
-                        value += self.queen_table[row][col]
-                    elif piece_type == 'K':
-                        # Use endgame table if few pieces left
-                        total_pieces = white_pieces + black_pieces
-                        if total_pieces <= 6:  # Endgame
-                            if piece_color == 'w':
-                                value += self.king_endgame_table[row][col]
-                            else:
-                                value += self.king_endgame_table[7-row][col]
-                        else:  # Middle/Opening
-                            if piece_color == 'w':
-                                value += self.king_table[row][col]
-                            else:
-                                value += self.king_table[7-row][col]
-                                
-                # Add to appropriate score
-                if piece_color == 'w':
-                    white_score += value
+            piece_type = code & TYPE_MASK
+            value = square_values[code][index]
+            
+            # Count pieces for endgame detection
+            if piece_type == KING:
+                # Use endgame table if few pieces left
+                if white_pieces + black_pieces <= 6:  # Endgame
+                    value += self.king_endgame_square_values[code][index]
+                else:  # Middle/Opening
+                    value += self.king_square_values[code][index]
+            elif piece_type != PAWN:
+                if code & COLOR_MASK:
+                    black_pieces += 1
                 else:
-                    black_score += value
+                    white_pieces += 1
                     
+            # Add to appropriate score
+            if code & COLOR_MASK:
+                black_score += value
+            else:
+                white_score += value
+                
         # Return from black's perspective (AI plays black)
-        return black_score - white_score
+        score = black_score - white_score
+        
+        # Pawn structure is a positional term, so it shares the ELO gate
+        if self.elo >= 1200:
+            score += self.pawn_evaluator.evaluate(board)
+            
+        return score
         
     def _get_all_legal_moves(self, board):
         """Get all legal moves for black (AI)."""
-        moves = []
-        
-        # TUTORIAL FIX: Check if we're in tutorial mode
-        in_tutorial = False
-        tutorial_move_index = 0
-        if hasattr(board, 'powerup_system') and hasattr(board.powerup_system, 'game'):
-            game = board.powerup_system.game
-            if (hasattr(game, 'in_tutorial_battle') and game.in_tutorial_battle and
-                hasattr(game, 'tutorial') and game.tutorial):
-                in_tutorial = True
-                tutorial_move_index = game.tutorial.ai_move_index
-        
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece and piece[0] == 'b':
-                    # TUTORIAL FIX: Prevent queen, bishop, and knight from moving in first 3 moves of tutorial
-                    if in_tutorial and tutorial_move_index < 3 and piece[1] in ['Q', 'B', 'N']:
-                        # Skip queen, bishop, and knight moves in first 3 AI moves of tutorial
-                        continue
-                    
-                    piece_moves = board.get_legal_moves(row, col)  # Use legal moves to prevent illegal moves
-                    for to_row, to_col in piece_moves:
-                        # TUTORIAL FIX: Prevent ANY captures during first 5 moves of tutorial
-                        if in_tutorial and tutorial_move_index < 5:
-                            target = board.get_piece(to_row, to_col)
-                            if target and target[0] == 'w':
-                                # Skip any move that would capture a white piece
-                                continue
-                        
-                        moves.append(((row, col), (to_row, to_col)))
-        return moves
+        return self._get_all_moves_for_color(board, 'b')
         
     def _get_all_moves_for_color(self, board, color):
         """Get all legal moves for a specific color."""
-        moves = []
-        
-        # TUTORIAL FIX: Check if we're in tutorial mode
-        in_tutorial = False
-        tutorial_move_index = 0
-        if color == 'b' and hasattr(board, 'powerup_system') and hasattr(board.powerup_system, 'game'):
-            game = board.powerup_system.game
-            if (hasattr(game, 'in_tutorial_battle') and game.in_tutorial_battle and
-                hasattr(game, 'tutorial') and game.tutorial):
-                in_tutorial = True
-                tutorial_move_index = game.tutorial.ai_move_index
-        
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                if piece and piece[0] == color:
-                    # TUTORIAL FIX: Prevent queen, bishop, and knight from moving in first 3 moves of tutorial
-                    if in_tutorial and tutorial_move_index < 3 and piece[1] in ['Q', 'B', 'N']:
-                        # Skip queen, bishop, and knight moves in first 3 AI moves of tutorial
-                        continue
-                    
-                    piece_moves = board.get_legal_moves(row, col)  # Use legal moves to prevent illegal moves
-                    for to_row, to_col in piece_moves:
-                        # TUTORIAL FIX: Prevent ANY captures during first 5 moves of tutorial
-                        if in_tutorial and tutorial_move_index < 5:
-                            target = board.get_piece(to_row, to_col)
-                            if target and target[0] == 'w':
-                                # Skip any move that would capture a white piece
-                                continue
-                        
-                        moves.append(((row, col), (to_row, to_col)))
-        return moves
+        own = BLACK if color == 'b' else WHITE
+        return [(SQUARE_ROW_COL[from_square], SQUARE_ROW_COL[to_square])
+                for from_square, to_square in board.iter_legal_moves(own)]
         
     def _order_moves(self, board, moves):
         """Order moves for better alpha-beta pruning."""
@@ -827,13 +1218,13 @@ class ChessAI:
             from_row, from_col = move[0]
             to_row, to_col = move[1]
             
-            moving_piece = board.get_piece(from_row, from_col)
-            target_piece = board.get_piece(to_row, to_col)
+            moving_piece = board.squares[MAILBOX[from_row * 8 + from_col]]
+            target_piece = board.squares[MAILBOX[to_row * 8 + to_col]]
             
             # Captures - MVV/LVA (Most Valuable Victim / Least Valuable Attacker)
             if target_piece:
-                victim_value = self.piece_values[target_piece[1]]
-                attacker_value = self.piece_values[moving_piece[1]]
+                victim_value = self.code_values[target_piece]
+                attacker_value = self.code_values[moving_piece]
                 score += victim_value * 10 - attacker_value
                 
             # Check moves
@@ -845,7 +1236,7 @@ class ChessAI:
                 score += 10
                 
             # Pawn promotion
-            if moving_piece[1] == 'P' and to_row == 7:
+            if moving_piece & TYPE_MASK == PAWN and to_row == 7:
                 score += 800
                 
             scored_moves.append((move, score))
@@ -859,9 +1250,10 @@ class ChessAI:
         capture_moves = []
         other_moves = []
         
+        squares = board.squares
         for move in moves:
             to_row, to_col = move[1]
-            if board.get_piece(to_row, to_col):
+            if squares[MAILBOX[to_row * 8 + to_col]]:
                 capture_moves.append(move)
             else:
                 other_moves.append(move)
@@ -922,42 +1314,9 @@ class ChessAI:
         board.set_piece(to_row, to_col, piece)
         board.set_piece(from_row, from_col, "")
         
-        # Check if white has any legal moves that escape check
-        can_escape = False
+        # Any legal white move escapes; generation stops at the first one found
+        can_escape = board.has_legal_moves("white")
         
-        for row in range(8):
-            for col in range(8):
-                p = board.get_piece(row, col)
-                if p and p[0] == 'w':
-                    piece_moves = board.get_legal_moves(row, col)  # Use legal moves to prevent illegal moves
-                    for move_row, move_col in piece_moves:
-                        # Test this move
-                        test_piece = board.get_piece(row, col)
-                        test_target = board.get_piece(move_row, move_col)
-                        
-                        board.set_piece(move_row, move_col, test_piece)
-                        board.set_piece(row, col, "")
-                        
-                        # Check if king is still in check
-                        king_pos = board.find_king("white")
-                        if king_pos:
-                            still_in_check = self._square_is_attacked(board, king_pos[0], king_pos[1], 'b')
-                            if not still_in_check:
-                                can_escape = True
-                                
-                        # Undo test move
-                        board.set_piece(row, col, test_piece)
-                        board.set_piece(move_row, move_col, test_target)
-                        
-                        if can_escape:
-                            break
-                            
-                    if can_escape:
-                        break
-                        
-            if can_escape:
-                break
-                
         # Undo original move
         board.set_piece(from_row, from_col, piece)
         board.set_piece(to_row, to_col, original_target)
@@ -278,13 +278,11 @@ class AnimatedDialogueBox:
             # Calculate how many characters of this line to show
             chars_remaining = self.typewriter_progress - chars_drawn
             visible_chars = min(len(line), chars_remaining)
-            visible_text = line[:visible_chars]
             
-            if visible_text:
-                # Render the visible portion
-                text_surface = self.renderer.pixel_fonts['medium'].render(visible_text, True, self.text_color)
-                text_rect = text_surface.get_rect(center=(config.WIDTH // 2, text_y))
-                screen.blit(text_surface, text_rect)
+            if visible_chars > 0:
+                # Draw the visible portion of the cached line
+                self.renderer.draw_text(line, 'medium', self.text_color, (config.WIDTH // 2, text_y), "center",
+                                        chars=visible_chars, surface=screen)
             
             chars_drawn += len(line)
             text_y += 25
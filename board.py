@@ -4,15 +4,195 @@ Enhanced with Powerup System Integration
 """
 
 import pygame
+import random
+from collections.abc import MutableMapping
+from gamerecord import square_name
+
+# Zobrist keys for position hashing; fixed seed so hashes are stable between runs
+_zobrist_rng = random.Random(0x5EED)
+ZOBRIST_PIECES = {
+    color + piece_type: [_zobrist_rng.getrandbits(64) for _ in range(64)]
+    for color in "wb" for piece_type in "PNBRQK"
+}
+ZOBRIST_BLACK_TO_MOVE = _zobrist_rng.getrandbits(64)
+ZOBRIST_CASTLING = {
+    (color, side): _zobrist_rng.getrandbits(64)
+    for color in ("white", "black") for side in ("kingside", "queenside")
+}
+ZOBRIST_EN_PASSANT = [_zobrist_rng.getrandbits(64) for _ in range(8)]
+ZOBRIST_SHIELDS = [_zobrist_rng.getrandbits(64) for _ in range(64)]
+
+# Integer piece encoding: piece type in the low three bits, colour in bit 3.
+# Pieces are strings ("wN") only at the API boundary (get_piece/set_piece,
+# the renderer and config.PIECE_IMAGES)
+EMPTY = 0
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = 1, 2, 3, 4, 5, 6
+WHITE = 0
+BLACK = 8
+TYPE_MASK = 7
+COLOR_MASK = 8
+OFFBOARD = 0xFF  # Border squares of the mailbox
+
+PIECE_CODES = {
+    color + piece_type: (WHITE if color == 'w' else BLACK) | (index + 1)
+    for color in "wb" for index, piece_type in enumerate("PNBRQK")
+}
+PIECE_NAMES = [
+    next((name for name, code in PIECE_CODES.items() if code == value), "")
+    for value in range(16)
+]
+ZOBRIST_CODES = [ZOBRIST_PIECES.get(name) for name in PIECE_NAMES]  # Indexed by piece code
+
+# 10x12 mailbox: the 8x8 board sits inside a border of OFFBOARD sentinels,
+# so steps off the edge land on a sentinel instead of needing a bounds check.
+# MAILBOX maps row * 8 + col to a mailbox square, SQUARE_INDEX maps back.
+MAILBOX = [21 + row * 10 + col for row in range(8) for col in range(8)]
+SQUARE_INDEX = [-1] * 120
+for _index, _square in enumerate(MAILBOX):
+    SQUARE_INDEX[_square] = _index
+SQUARE_ROW_COL = [divmod(index, 8) if index >= 0 else None for index in SQUARE_INDEX]
+EMPTY_MAILBOX = bytes(EMPTY if index >= 0 else OFFBOARD for index in SQUARE_INDEX)
+SQUARE_BITS = [1 << index if index >= 0 else 0 for index in SQUARE_INDEX]  # Shield mask bit per mailbox square
+
+# Mailbox steps, in the same order the original (row, col) deltas were tried
+KNIGHT_STEPS = (21, 19, -19, -21, 12, 8, -8, -12)
+ROOK_STEPS = (1, -1, 10, -10)
+BISHOP_STEPS = (11, 9, -9, -11)
+KING_STEPS = ROOK_STEPS + BISHOP_STEPS
+
+# Positions kept for repetition detection; more than the 100 plies the
+# fifty-move rule allows between irreversible moves
+POSITION_HISTORY_SIZE = 128
+
+
+class ShieldSet:
+    """Shielded squares as a 64-bit mask, with the turn each shield runs out.
+    
+    Bit row * 8 + col of mask is set while that square is shielded, so move
+    generation tests a capture with a single AND. Shields expire by turn
+    number instead of counting down, so adding, moving, removing and ticking
+    are all O(1). key is the Zobrist key of the shielded squares.
+    """
+    def __init__(self):
+        self.clear()
+        
+    def clear(self):
+        """Remove every shield."""
+        self.mask = 0
+        self.key = 0
+        self.turn = 0
+        self.expires = [0] * 64  # Turn on which each square's shield runs out
+        self.expiring = {}  # {turn: mask of the shields running out on it}
+        
+    def copy(self):
+        copy = ShieldSet()
+        copy.mask = self.mask
+        copy.key = self.key
+        copy.turn = self.turn
+        copy.expires = list(self.expires)
+        copy.expiring = dict(self.expiring)
+        return copy
+        
+    def add(self, index, turns):
+        """Shield a square for a number of turns, replacing any shield already on it."""
+        self.remove(index)
+        bit = 1 << index
+        expires = self.turn + max(1, turns)
+        self.mask |= bit
+        self.key ^= ZOBRIST_SHIELDS[index]
+        self.expires[index] = expires
+        self.expiring[expires] = self.expiring.get(expires, 0) | bit
+        
+    def remove(self, index):
+        bit = 1 << index
+        if self.mask & bit:
+            self.mask ^= bit
+            self.key ^= ZOBRIST_SHIELDS[index]
+            self.expiring[self.expires[index]] &= ~bit
+            
+    def move(self, from_index, to_index):
+        """Carry a shield, with the turns it has left, to another square."""
+        if self.mask & (1 << from_index):
+            turns = self.expires[from_index] - self.turn
+            self.remove(from_index)
+            self.add(to_index, turns)
+            
+    def tick(self):
+        """Advance one turn, dropping the shields that run out on it."""
+        self.turn += 1
+        expired = self.expiring.pop(self.turn, 0) & self.mask
+        self.mask ^= expired
+        while expired:
+            bit = expired & -expired
+            self.key ^= ZOBRIST_SHIELDS[bit.bit_length() - 1]
+            expired ^= bit
+            
+    def is_shielded(self, row, col):
+        return 0 <= row < 8 and 0 <= col < 8 and bool(self.mask >> (row * 8 + col) & 1)
+        
+    def turns_remaining(self, index):
+        return self.expires[index] - self.turn
+
+
+class ShieldMap(MutableMapping):
+    """A ShieldSet seen as the {(row, col): turns_remaining} dict the powerup code uses."""
+    def __init__(self, shields):
+        self.shields = shields
+        
+    def __getitem__(self, pos):
+        if not self.shields.is_shielded(*pos):
+            raise KeyError(pos)
+        return self.shields.turns_remaining(pos[0] * 8 + pos[1])
+        
+    def __setitem__(self, pos, turns):
+        self.shields.add(pos[0] * 8 + pos[1], turns)
+        
+    def __delitem__(self, pos):
+        if not self.shields.is_shielded(*pos):
+            raise KeyError(pos)
+        self.shields.remove(pos[0] * 8 + pos[1])
+        
+    def __contains__(self, pos):
+        return self.shields.is_shielded(*pos)
+        
+    def __iter__(self):
+        mask = self.shields.mask
+        while mask:
+            bit = mask & -mask
+            yield divmod(bit.bit_length() - 1, 8)
+            mask ^= bit
+            
+    def __len__(self):
+        return bin(self.shields.mask).count("1")
+        
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ShieldSnapshot:
+    """Stand-in powerup system holding only shields, for boards searched off the main thread."""
+    def __init__(self, shields):
+        self.shields = shields
+        self.shielded_pieces = ShieldMap(shields)
+        
+    def is_piece_shielded(self, row, col):
+        """Check if a piece is protected by shield."""
+        return self.shields.is_shielded(row, col)
+
 
 class ChessBoard:
     def __init__(self):
+        # Shields live on the board so move generation can read them directly;
+        # the powerup system shares this set (see set_powerup_system)
+        self.shields = ShieldSet()
+        self.record = None  # GameRecord logging the moves, set by the game
         self.reset()
         
     def reset(self):
         """Reset board to starting position."""
         from config import INITIAL_BOARD, STARTING_PLAYER
-        self.board = [row[:] for row in INITIAL_BOARD]
+        self.board = INITIAL_BOARD
+        self.recompute_hash()
         self.current_turn = STARTING_PLAYER
         self.selected_piece = None
         self.valid_moves = []
@@ -20,6 +200,9 @@ class ChessBoard:
         self.winner = None
         self.captured_pieces = {"white": [], "black": []}
         
+        # Completed moves with the position before each, for post-game analysis
+        self.move_history = []
+        
         # Animation state
         self.animating = False
         self.animation_start = 0
@@ -39,6 +222,7 @@ class ChessBoard:
         
         # Powerup system reference (will be set by game)
         self.powerup_system = None
+        self.shields.clear()
         
         # Castling rights
         self.castling_rights = {
@@ -53,22 +237,310 @@ class ChessBoard:
         self.is_check = False
         self.is_checkmate = False
         self.is_stalemate = False
+        self.is_draw = False
+        self.draw_reason = None
+        
+        # Repetition and fifty-move tracking
+        self.position_history = [0] * POSITION_HISTORY_SIZE  # Ring of repetition keys
+        self.restart_position_history()
+        
+        if self.record is not None:
+            self.record.new_game(self.to_fen())
+        
+    @property
+    def board(self):
+        """The position as 8 rows of piece strings (a fresh copy on every access)."""
+        squares = self.squares
+        return [[PIECE_NAMES[squares[21 + row * 10 + col]] for col in range(8)] for row in range(8)]
+        
+    @board.setter
+    def board(self, rows):
+        """Replace the position from 8 rows of piece strings; call recompute_hash() after."""
+        squares = bytearray(EMPTY_MAILBOX)
+        for row in range(8):
+            for col in range(8):
+                squares[21 + row * 10 + col] = PIECE_CODES.get(rows[row][col], EMPTY)
+        self.squares = squares
+        
+    def recompute_hash(self):
+        """Rebuild the piece-placement hash after the position is replaced wholesale."""
+        self.piece_hash = 0
+        self.pawn_hash = 0
+        for index, square in enumerate(MAILBOX):
+            code = self.squares[square]
+            if code:
+                key = ZOBRIST_CODES[code][index]
+                self.piece_hash ^= key
+                if code & TYPE_MASK == PAWN:
+                    self.pawn_hash ^= key
+                    
+    def castling_hash(self):
+        """Zobrist key for the current castling rights."""
+        key = 0
+        for color, rights in self.castling_rights.items():
+            for side, allowed in rights.items():
+                if allowed:
+                    key ^= ZOBRIST_CASTLING[(color, side)]
+        return key
+        
+    def repetition_key(self):
+        """Key identifying the position for repetition (the position hash, shields included)."""
+        return self.position_hash()
+        
+    def restart_position_history(self):
+        """Forget earlier positions and record the current one.
+        
+        Called after irreversible changes (captures, pawn moves, powerups
+        adding or removing pieces), since no earlier position can recur.
+        """
+        self.halfmove_clock = 0
+        self.position_counts = {}
+        self.history_length = 0
+        self.history_index = 0
+        self._push_position()
+        
+    def _push_position(self):
+        """Add the current position to the history ring and its count."""
+        key = self.repetition_key()
+        if self.history_length == POSITION_HISTORY_SIZE:
+            # Ring is full: the oldest position drops out of the counts
+            oldest = self.position_history[self.history_index]
+            self.position_counts[oldest] -= 1
+            if not self.position_counts[oldest]:
+                del self.position_counts[oldest]
+        else:
+            self.history_length += 1
+        self.position_history[self.history_index] = key
+        self.history_index = (self.history_index + 1) % POSITION_HISTORY_SIZE
+        self.position_counts[key] = self.position_counts.get(key, 0) + 1
+        
+    def _record_position(self, irreversible):
+        """Update the halfmove clock and history after a completed move."""
+        if irreversible:
+            self.restart_position_history()
+        else:
+            self.halfmove_clock += 1
+            self._push_position()
+            
+    def position_hash(self):
+        """Zobrist hash of the position: pieces, shields, side to move, castling and en passant."""
+        key = self.piece_hash ^ self.shields.key ^ self.castling_hash()
+        if self.current_turn == "black":
+            key ^= ZOBRIST_BLACK_TO_MOVE
+        if self.en_passant_target:
+            key ^= ZOBRIST_EN_PASSANT[self.en_passant_target[1]]
+        return key
+        
+    def clone(self):
+        """Copy the position (not the UI state) so it can be searched in the background."""
+        copy = ChessBoard()
+        copy.squares = bytearray(self.squares)
+        copy.piece_hash = self.piece_hash
+        copy.pawn_hash = self.pawn_hash
+        copy.current_turn = self.current_turn
+        copy.castling_rights = {
+            color: dict(rights) for color, rights in self.castling_rights.items()
+        }
+        copy.en_passant_target = self.en_passant_target
+        copy.shields = self.shields.copy()
+        if self.powerup_system:
+            copy.powerup_system = ShieldSnapshot(copy.shields)
+        copy.halfmove_clock = self.halfmove_clock
+        copy.position_counts = dict(self.position_counts)
+        return copy
+        
+    def snapshot(self):
+        """Plain-data copy of the position that can be saved or sent to another process."""
+        return {
+            "board": self.board,
+            "current_turn": self.current_turn,
+            "castling_rights": {color: dict(rights) for color, rights in self.castling_rights.items()},
+            "en_passant_target": self.en_passant_target,
+            "shields": sorted(ShieldMap(self.shields)),
+            "key": format(self.position_hash(), "016x")
+        }
+        
+    @staticmethod
+    def from_snapshot(snapshot):
+        """Rebuild a searchable board from snapshot()."""
+        board = ChessBoard()
+        board.board = snapshot["board"]
+        board.recompute_hash()
+        board.current_turn = snapshot["current_turn"]
+        board.castling_rights = {color: dict(rights) for color, rights in snapshot["castling_rights"].items()}
+        if snapshot["en_passant_target"]:
+            board.en_passant_target = tuple(snapshot["en_passant_target"])
+        if snapshot["shields"]:
+            for row, col in snapshot["shields"]:
+                board.shields.add(row * 8 + col, 1)
+            board.powerup_system = ShieldSnapshot(board.shields)
+        board.restart_position_history()
+        return board
+        
+    def to_fen(self):
+        """Describe the position in Forsyth-Edwards Notation."""
+        ranks = []
+        rows = self.board
+        for row in range(8):
+            rank = ""
+            empty = 0
+            for col in range(8):
+                piece = rows[row][col]
+                if not piece:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += piece[1] if piece[0] == 'w' else piece[1].lower()
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+            
+        castling = ""
+        for color, letters in (("white", "KQ"), ("black", "kq")):
+            if self.castling_rights[color]["kingside"]:
+                castling += letters[0]
+            if self.castling_rights[color]["queenside"]:
+                castling += letters[1]
+                
+        en_passant = "-"
+        if self.en_passant_target:
+            ep_row, ep_col = self.en_passant_target
+            en_passant = "abcdefgh"[ep_col] + str(8 - ep_row)
+            
+        fullmove = len(self.move_history) // 2 + 1
+        return f"{'/'.join(ranks)} {self.current_turn[0]} {castling or '-'} {en_passant} {self.halfmove_clock} {fullmove}"
+        
+    def set_fen(self, fen):
+        """Set up the position from Forsyth-Edwards Notation."""
+        fields = fen.split()
+        self.squares = bytearray(EMPTY_MAILBOX)
+        for row, rank in enumerate(fields[0].split("/")):
+            col = 0
+            for char in rank:
+                if char.isdigit():
+                    col += int(char)
+                else:
+                    self.squares[21 + row * 10 + col] = PIECE_CODES[('w' if char.isupper() else 'b') + char.upper()]
+                    col += 1
+        self.recompute_hash()
+        
+        self.current_turn = "white" if len(fields) < 2 or fields[1] == "w" else "black"
+        castling = fields[2] if len(fields) > 2 else "-"
+        self.castling_rights = {
+            "white": {"kingside": "K" in castling, "queenside": "Q" in castling},
+            "black": {"kingside": "k" in castling, "queenside": "q" in castling}
+        }
+        self.en_passant_target = None
+        if len(fields) > 3 and fields[3] != "-":
+            self.en_passant_target = (8 - int(fields[3][1]), "abcdefgh".index(fields[3][0]))
+        self.move_history = []
+        self.game_over = False
+        self.winner = None
+        self.is_check = False
+        self.is_checkmate = False
+        self.is_stalemate = False
+        self.is_draw = False
+        self.draw_reason = None
+        self.shields.clear()
+        
+        self.restart_position_history()
+        if len(fields) > 4:
+            self.halfmove_clock = int(fields[4])
+        if self.record is not None:
+            self.record.new_game(fen)
+        
+    def move_san(self, from_row, from_col, to_row, to_col):
+        """Standard Algebraic Notation for a move about to be played, without promotion or check marks."""
+        piece = self.get_piece(from_row, from_col)
+        target = square_name(to_row, to_col)
+        if piece[1] == 'K' and abs(to_col - from_col) == 2:
+            return "O-O" if to_col > from_col else "O-O-O"
+        capture = bool(self.get_piece(to_row, to_col)) or (piece[1] == 'P' and self.en_passant_target == (to_row, to_col))
+        if piece[1] == 'P':
+            return ("abcdefgh"[from_col] + "x" if capture else "") + target
+            
+        # Name the file, rank or both when another piece of the same kind can reach the square
+        rivals = [(row, col) for row in range(8) for col in range(8)
+                  if (row, col) != (from_row, from_col) and self.get_piece(row, col) == piece
+                  and (to_row, to_col) in self.get_legal_moves(row, col)]
+        origin = ""
+        if rivals:
+            if all(col != from_col for _, col in rivals):
+                origin = "abcdefgh"[from_col]
+            elif all(row != from_row for row, _ in rivals):
+                origin = str(8 - from_row)
+            else:
+                origin = square_name(from_row, from_col)
+        return piece[1] + origin + ("x" if capture else "") + target
+        
+    def _record_move(self, promotion=""):
+        """Log the move just completed (and the result if it ended the game) in the game record."""
+        if self.record is None:
+            return
+        last = self.move_history[-1]
+        san = self.pending_san + ("=" + promotion if promotion else "")
+        if self.is_checkmate:
+            san += "#"
+        elif self.is_check:
+            san += "+"
+        self.record.add_move("white" if last["piece"][0] == 'w' else "black", *last["move"], promotion, san)
+        if self.game_over:
+            self.record.finish(self.winner)
+            
+    def record_powerup(self, player, powerup_key, squares=(), shooter=None):
+        """Log a powerup in the game record, if one is attached."""
+        if self.record is not None:
+            self.record.add_powerup(player, powerup_key, squares, shooter)
+            
+    def apply_move(self, from_row, from_col, to_row, to_col, promotion="Q"):
+        """Play a legal move immediately, without animation (for headless use)."""
+        if (to_row, to_col) not in self.get_legal_moves(from_row, from_col):
+            return False
+            
+        self.animating = True
+        self.animation_from = (from_row, from_col)
+        self.animation_to = (to_row, to_col)
+        self.animation_piece = self.get_piece(from_row, from_col)
+        self.complete_move()
+        if self.promoting:
+            self.promote_pawn(promotion)
+        return True
         
     def set_powerup_system(self, powerup_system):
-        """Set reference to powerup system."""
+        """Set reference to powerup system and have it keep its shields on this board."""
         self.powerup_system = powerup_system
+        powerup_system.share_shields(self.shields)
         
     def get_piece(self, row, col):
         """Get piece at position."""
         if 0 <= row < 8 and 0 <= col < 8:
-            return self.board[row][col]
+            return PIECE_NAMES[self.squares[21 + row * 10 + col]]
         return ""
         
     def set_piece(self, row, col, piece):
         """Set piece at position."""
         if 0 <= row < 8 and 0 <= col < 8:
-            self.board[row][col] = piece
+            self.set_square(21 + row * 10 + col, PIECE_CODES.get(piece, EMPTY))
             
+    def set_square(self, square, code):
+        """Put a piece code on a mailbox square."""
+        # Keep the position and pawn-only hashes in step with every board mutation
+        old_code = self.squares[square]
+        index = SQUARE_INDEX[square]
+        if old_code:
+            key = ZOBRIST_CODES[old_code][index]
+            self.piece_hash ^= key
+            if old_code & TYPE_MASK == PAWN:
+                self.pawn_hash ^= key
+        if code:
+            key = ZOBRIST_CODES[code][index]
+            self.piece_hash ^= key
+            if code & TYPE_MASK == PAWN:
+                self.pawn_hash ^= key
+        self.squares[square] = code
+        
     def get_square_pos(self, row, col):
         """Convert row/col to pixel position."""
         import config
@@ -103,12 +575,8 @@ class ChessBoard:
         
     def find_king(self, color):
         """Find the king's position for given color."""
-        king = "wK" if color == "white" else "bK"
-        for row in range(8):
-            for col in range(8):
-                if self.get_piece(row, col) == king:
-                    return (row, col)
-        return None
+        square = self.squares.find(KING | (WHITE if color == "white" else BLACK))
+        return SQUARE_ROW_COL[square] if square >= 0 else None
         
     def is_in_check(self):
         """Check if current player's king is in check."""
@@ -116,249 +584,240 @@ class ChessBoard:
         if not king_pos:
             return False
         
-        opponent_color = "b" if self.current_turn == "white" else "w"
-        
-        # Check all opponent pieces
-        for row in range(8):
-            for col in range(8):
-                piece = self.get_piece(row, col)
-                if piece and piece[0] == opponent_color:
-                    # For check detection, ignore shields (you can put a king in check even if it's shielded)
-                    moves = self.get_valid_moves(row, col, ignore_shields=True)
-                    if king_pos in moves:
-                        return True
-        return False
+        # For check detection, ignore shields (you can put a king in check even if it's shielded)
+        opponent = BLACK if self.current_turn == "white" else WHITE
+        return self._is_attacked(MAILBOX[king_pos[0] * 8 + king_pos[1]], opponent)
         
     def get_valid_moves(self, row, col, ignore_shields=False):
         """Get all valid moves for piece at row/col."""
-        piece = self.get_piece(row, col)
+        return [SQUARE_ROW_COL[target] for target in self._valid_targets(21 + row * 10 + col, ignore_shields)]
+        
+    def _valid_targets(self, square, ignore_shields=False):
+        """Mailbox squares the piece on square can move to, ignoring checks."""
+        squares = self.squares
+        piece = squares[square]
         if not piece:
             return []
             
-        piece_type = piece[1]
-        piece_color = piece[0]
-        moves = []
+        piece_type = piece & TYPE_MASK
+        piece_color = piece & COLOR_MASK
+        targets = []
+        
+        # Shielded pieces can't be captured unless shields are ignored
+        shield_mask = 0 if ignore_shields else self.shields.mask
         
-        if piece_type == 'P':  # Pawn
-            direction = -1 if piece_color == 'w' else 1
-            start_row = 6 if piece_color == 'w' else 1
+        if piece_type == PAWN:
+            forward = -10 if piece_color == WHITE else 10
+            start_row = 6 if piece_color == WHITE else 1
             
-            # Forward one
-            new_row = row + direction
-            if 0 <= new_row < 8 and self.get_piece(new_row, col) == "":
-                moves.append((new_row, col))
-                
-                # Forward two from start
-                if row == start_row:
-                    new_row2 = row + direction * 2
-                    if self.get_piece(new_row2, col) == "":
-                        moves.append((new_row2, col))
-                        
+            # Forward one, and two from the start
+            ahead = square + forward
+            if squares[ahead] == EMPTY:
+                targets.append(ahead)
+                if SQUARE_ROW_COL[square][0] == start_row and squares[ahead + forward] == EMPTY:
+                    targets.append(ahead + forward)
+                    
             # Capture diagonally
-            for dc in [-1, 1]:
-                new_col = col + dc
-                if 0 <= new_row < 8 and 0 <= new_col < 8:
-                    target = self.get_piece(new_row, new_col)
-                    if target and target[0] != piece_color:
-                        # Check if target is shielded
-                        if self.powerup_system and self.powerup_system.is_piece_shielded(new_row, new_col) and not ignore_shields:
-                            pass  # Skip shielded pieces
-                        else:
-                            moves.append((new_row, new_col))
-                        
-        elif piece_type == 'R':  # Rook
-            for dr, dc in [(0,1), (0,-1), (1,0), (-1,0)]:
-                for i in range(1, 8):
-                    nr, nc = row + dr*i, col + dc*i
-                    if not (0 <= nr < 8 and 0 <= nc < 8):
-                        break
-                    target = self.get_piece(nr, nc)
-                    if target == "":
-                        moves.append((nr, nc))
-                    else:
-                        if target[0] != piece_color:
-                            # Check if target is shielded
-                            if self.powerup_system and self.powerup_system.is_piece_shielded(nr, nc) and not ignore_shields:
-                                pass  # Skip shielded pieces
-                            else:
-                                moves.append((nr, nc))
-                        break
+            for target in (ahead - 1, ahead + 1):
+                victim = squares[target]
+                if victim and victim != OFFBOARD and victim & COLOR_MASK != piece_color:
+                    if not shield_mask & SQUARE_BITS[target]:
+                        targets.append(target)
                         
-        elif piece_type == 'N':  # Knight
-            for dr, dc in [(2,1), (2,-1), (-2,1), (-2,-1), (1,2), (1,-2), (-1,2), (-1,-2)]:
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < 8 and 0 <= nc < 8:
-                    target = self.get_piece(nr, nc)
-                    if target == "":
-                        moves.append((nr, nc))
-                    elif target[0] != piece_color:
-                        if ignore_shields or (self.powerup_system and not self.powerup_system.is_piece_shielded(nr, nc)) or not self.powerup_system:
-                            moves.append((nr, nc))
+        elif piece_type == KNIGHT or piece_type == KING:
+            for step in (KNIGHT_STEPS if piece_type == KNIGHT else KING_STEPS):
+                target = square + step
+                victim = squares[target]
+                if victim == EMPTY:
+                    targets.append(target)
+                elif victim != OFFBOARD and victim & COLOR_MASK != piece_color:
+                    if not shield_mask & SQUARE_BITS[target]:
+                        targets.append(target)
                         
-        elif piece_type == 'B':  # Bishop
-            for dr, dc in [(1,1), (1,-1), (-1,1), (-1,-1)]:
-                for i in range(1, 8):
-                    nr, nc = row + dr*i, col + dc*i
-                    if not (0 <= nr < 8 and 0 <= nc < 8):
-                        break
-                    target = self.get_piece(nr, nc)
-                    if target == "":
-                        moves.append((nr, nc))
-                    else:
-                        if target[0] != piece_color:
-                            # Check if target is shielded
-                            if self.powerup_system and self.powerup_system.is_piece_shielded(nr, nc) and not ignore_shields:
-                                pass  # Skip shielded pieces
-                            else:
-                                moves.append((nr, nc))
-                        break
-                        
-        elif piece_type == 'Q':  # Queen
-            for dr, dc in [(0,1), (0,-1), (1,0), (-1,0), (1,1), (1,-1), (-1,1), (-1,-1)]:
-                for i in range(1, 8):
-                    nr, nc = row + dr*i, col + dc*i
-                    if not (0 <= nr < 8 and 0 <= nc < 8):
-                        break
-                    target = self.get_piece(nr, nc)
-                    if target == "":
-                        moves.append((nr, nc))
-                    else:
-                        if target[0] != piece_color:
-                            # Check if target is shielded
-                            if self.powerup_system and self.powerup_system.is_piece_shielded(nr, nc) and not ignore_shields:
-                                pass  # Skip shielded pieces
-                            else:
-                                moves.append((nr, nc))
-                        break
+        else:  # Sliding pieces
+            if piece_type == ROOK:
+                steps = ROOK_STEPS
+            elif piece_type == BISHOP:
+                steps = BISHOP_STEPS
+            else:
+                steps = KING_STEPS
+            for step in steps:
+                target = square + step
+                while squares[target] == EMPTY:
+                    targets.append(target)
+                    target += step
+                victim = squares[target]
+                if victim != OFFBOARD and victim & COLOR_MASK != piece_color:
+                    if not shield_mask & SQUARE_BITS[target]:
+                        targets.append(target)
                         
-        elif piece_type == 'K':  # King
-            for dr, dc in [(0,1), (0,-1), (1,0), (-1,0), (1,1), (1,-1), (-1,1), (-1,-1)]:
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < 8 and 0 <= nc < 8:
-                    target = self.get_piece(nr, nc)
-                    if target == "":
-                        moves.append((nr, nc))
-                    elif target[0] != piece_color:
-                        if ignore_shields or (self.powerup_system and not self.powerup_system.is_piece_shielded(nr, nc)) or not self.powerup_system:
-                            moves.append((nr, nc))
+        row, col = SQUARE_ROW_COL[square]
         
         # Add castling moves for king (only check when not called from is_square_attacked)
-        if piece_type == 'K' and not ignore_shields:
+        if piece_type == KING and not ignore_shields:
             # Check castling rights
-            color_name = "white" if piece_color == 'w' else "black"
+            color_name = "white" if piece_color == WHITE else "black"
+            color_letter = color_name[0]
+            rook = piece_color | ROOK
+            rank = 21 + row * 10  # Mailbox square of the a-file on this row
             
             # Kingside castling
             if self.castling_rights[color_name]["kingside"]:
                 # Check if squares between king and rook are empty
-                if (self.get_piece(row, 5) == "" and 
-                    self.get_piece(row, 6) == "" and
-                    not self.is_square_attacked(row, 5, piece_color) and
-                    not self.is_square_attacked(row, 6, piece_color)):
+                if (squares[rank + 5] == EMPTY and
+                    squares[rank + 6] == EMPTY and
+                    not self.is_square_attacked(row, 5, color_letter) and
+                    not self.is_square_attacked(row, 6, color_letter)):
                     # Check if rook is in place
-                    rook = self.get_piece(row, 7)
-                    if rook == piece_color + 'R':
-                        moves.append((row, 6))  # King moves to g-file
+                    if squares[rank + 7] == rook:
+                        targets.append(rank + 6)  # King moves to g-file
             
-            # Queenside castling  
+            # Queenside castling
             if self.castling_rights[color_name]["queenside"]:
                 # Check if squares between king and rook are empty
-                if (self.get_piece(row, 1) == "" and 
-                    self.get_piece(row, 2) == "" and
-                    self.get_piece(row, 3) == "" and
-                    not self.is_square_attacked(row, 2, piece_color) and
-                    not self.is_square_attacked(row, 3, piece_color)):
+                if (squares[rank + 1] == EMPTY and
+                    squares[rank + 2] == EMPTY and
+                    squares[rank + 3] == EMPTY and
+                    not self.is_square_attacked(row, 2, color_letter) and
+                    not self.is_square_attacked(row, 3, color_letter)):
                     # Check if rook is in place
-                    rook = self.get_piece(row, 0)
-                    if rook == piece_color + 'R':
-                        moves.append((row, 2))  # King moves to c-file
+                    if squares[rank] == rook:
+                        targets.append(rank + 2)  # King moves to c-file
         
         # Add en passant for pawns
-        if piece_type == 'P' and self.en_passant_target:
+        if piece_type == PAWN and self.en_passant_target:
             ep_row, ep_col = self.en_passant_target
             # Check if pawn is in position to capture en passant
-            if row == (3 if piece_color == 'w' else 4):  # Correct rank for en passant
-                if abs(col - ep_col) == 1 and ep_row == row + (-1 if piece_color == 'w' else 1):
-                    moves.append((ep_row, ep_col))
+            if row == (3 if piece_color == WHITE else 4):  # Correct rank for en passant
+                if abs(col - ep_col) == 1 and ep_row == row + (-1 if piece_color == WHITE else 1):
+                    targets.append(MAILBOX[ep_row * 8 + ep_col])
                         
-        return moves
+        return targets
     
     def is_square_attacked(self, row, col, by_color):
-        """Check if a square is attacked by the given color."""
-        opponent_color = 'b' if by_color == 'w' else 'w'
-        
-        # Check all opponent pieces
-        for r in range(8):
-            for c in range(8):
-                piece = self.get_piece(r, c)
-                if piece and piece[0] == opponent_color:
-                    # Get moves for this piece (ignoring shields for attack detection)
-                    moves = self.get_valid_moves(r, c, ignore_shields=True)
-                    if (row, col) in moves:
-                        return True
+        """Check if a square is attacked by the opponents of by_color."""
+        attacker = BLACK if by_color == 'w' else WHITE
+        return self._is_attacked(21 + row * 10 + col, attacker)
+        
+    def _is_attacked(self, square, attacker):
+        """Check if any piece of the attacker colour hits a mailbox square (shields ignored).
+        
+        Looks outward from the square for each kind of attacker instead of
+        generating every enemy move.
+        """
+        squares = self.squares
+        occupant = squares[square]
+        if occupant and occupant & COLOR_MASK == attacker:
+            return False  # A piece isn't attacked by its own side
+            
+        # Pawns attack diagonally forward, so look diagonally back from the square
+        pawn = attacker | PAWN
+        behind = square + (10 if attacker == WHITE else -10)
+        if squares[behind - 1] == pawn or squares[behind + 1] == pawn:
+            return True
+            
+        knight = attacker | KNIGHT
+        for step in KNIGHT_STEPS:
+            if squares[square + step] == knight:
+                return True
+                
+        king = attacker | KING
+        for step in KING_STEPS:
+            if squares[square + step] == king:
+                return True
+                
+        queen = attacker | QUEEN
+        for steps, slider in ((ROOK_STEPS, attacker | ROOK), (BISHOP_STEPS, attacker | BISHOP)):
+            for step in steps:
+                target = square + step
+                while squares[target] == EMPTY:
+                    target += step
+                if squares[target] == slider or squares[target] == queen:
+                    return True
         return False
     
     def would_be_in_check(self, from_row, from_col, to_row, to_col, color):
         """Check if a move would leave the king in check."""
-        # Make the move temporarily
-        piece = self.get_piece(from_row, from_col)
-        captured = self.get_piece(to_row, to_col)
-        
-        self.set_piece(to_row, to_col, piece)
-        self.set_piece(from_row, from_col, "")
+        return self._leaves_king_attacked(21 + from_row * 10 + from_col, 21 + to_row * 10 + to_col,
+                                          WHITE if color == "white" else BLACK)
         
-        # Handle en passant capture
-        if piece and piece[1] == 'P' and self.en_passant_target == (to_row, to_col):
-            # Remove the captured pawn
-            capture_row = to_row + (1 if piece[0] == 'w' else -1)
-            en_passant_captured = self.get_piece(capture_row, to_col)
-            self.set_piece(capture_row, to_col, "")
-        else:
-            en_passant_captured = None
+    def _leaves_king_attacked(self, from_square, to_square, own):
+        """Make a move temporarily and check whether own king is then attacked."""
+        squares = self.squares
+        piece = squares[from_square]
+        captured = squares[to_square]
         
-        # Find king position
-        king_pos = self.find_king(color)
-        in_check = False
+        # Hashes are restored by the undo, so the raw squares can be written directly
+        squares[to_square] = piece
+        squares[from_square] = EMPTY
         
-        if king_pos:
-            in_check = self.is_square_attacked(king_pos[0], king_pos[1], color[0])
+        # Handle en passant capture: a diagonal pawn move onto the empty target square
+        # that takes an enemy pawn (a push onto a stale target must not touch the pawn behind it)
+        en_passant_square = None
+        if (piece & TYPE_MASK == PAWN and not captured and (to_square - from_square) % 10
+                and self.en_passant_target == SQUARE_ROW_COL[to_square]):
+            square = to_square + (10 if own == WHITE else -10)
+            if squares[square] == (own ^ COLOR_MASK) | PAWN:
+                # Remove the captured pawn
+                en_passant_square = square
+                squares[en_passant_square] = EMPTY
+            
+        king_square = squares.find(own | KING)
+        in_check = king_square >= 0 and self._is_attacked(king_square, own ^ COLOR_MASK)
         
         # Undo the move
-        self.set_piece(from_row, from_col, piece)
-        self.set_piece(to_row, to_col, captured)
-        
-        # Restore en passant captured pawn if needed
-        if en_passant_captured:
-            capture_row = to_row + (1 if piece[0] == 'w' else -1)
-            self.set_piece(capture_row, to_col, en_passant_captured)
+        squares[from_square] = piece
+        squares[to_square] = captured
+        if en_passant_square is not None:
+            squares[en_passant_square] = (own ^ COLOR_MASK) | PAWN
         
         return in_check
     
     def get_legal_moves(self, row, col):
         """Get all legal moves for a piece (moves that don't leave king in check)."""
-        piece = self.get_piece(row, col)
+        square = 21 + row * 10 + col
+        piece = self.squares[square]
         if not piece:
             return []
         
-        color = "white" if piece[0] == 'w' else "black"
-        all_moves = self.get_valid_moves(row, col)
-        legal_moves = []
+        own = piece & COLOR_MASK
+        return [SQUARE_ROW_COL[target] for target in self._valid_targets(square)
+                if not self._leaves_king_attacked(square, target, own)]
+    
+    def pseudo_moves(self, own):
+        """Captures and quiet moves for one colour as (from, to) mailbox pairs, not yet checked for legality."""
+        captures = []
+        quiets = []
+        squares = self.squares
+        for square in MAILBOX:
+            piece = squares[square]
+            if piece and piece & COLOR_MASK == own:
+                for target in self._valid_targets(square):
+                    if squares[target]:
+                        captures.append((square, target))
+                    else:
+                        quiets.append((square, target))
+        return captures, quiets
         
-        for move_row, move_col in all_moves:
-            if not self.would_be_in_check(row, col, move_row, move_col, color):
-                legal_moves.append((move_row, move_col))
+    def is_legal_move(self, from_square, to_square):
+        """Check that a pseudo-legal move doesn't leave the mover's king attacked."""
+        return not self._leaves_king_attacked(from_square, to_square, self.squares[from_square] & COLOR_MASK)
         
-        return legal_moves
+    def iter_legal_moves(self, own):
+        """Yield one colour's legal moves as (from, to) mailbox pairs, testing each only when reached."""
+        squares = self.squares
+        for square in MAILBOX:
+            piece = squares[square]
+            if piece and piece & COLOR_MASK == own:
+                for target in self._valid_targets(square):
+                    if not self._leaves_king_attacked(square, target, own):
+                        yield square, target
     
     def has_legal_moves(self, color):
         """Check if a color has any legal moves."""
-        piece_color = 'w' if color == "white" else 'b'
-        
-        for row in range(8):
-            for col in range(8):
-                piece = self.get_piece(row, col)
-                if piece and piece[0] == piece_color:
-                    if len(self.get_legal_moves(row, col)) > 0:
-                        return True
+        # Stops at the first legal move; nothing after it is generated or tested
+        for _ in self.iter_legal_moves(WHITE if color == "white" else BLACK):
+            return True
         return False
     
     def check_game_state(self):
@@ -385,6 +844,16 @@ class ChessBoard:
         else:
             self.is_checkmate = False
             self.is_stalemate = False
+            
+            # Draw by threefold repetition or the fifty-move rule
+            if self.position_counts.get(self.repetition_key(), 0) >= 3:
+                self.draw_reason = "threefold repetition"
+            elif self.halfmove_clock >= 100:
+                self.draw_reason = "fifty-move rule"
+            if self.draw_reason:
+                self.is_draw = True
+                self.game_over = True
+                self.winner = None
         
     def start_move(self, from_row, from_col, to_row, to_col):
         """Start animated move."""
@@ -430,6 +899,9 @@ class ChessBoard:
             return None
         
         piece_color = "white" if piece[0] == 'w' else "black"
+        position_before = self.snapshot()
+        if self.record is not None:
+            self.pending_san = self.move_san(from_row, from_col, to_row, to_col)
         
         # Check for castling
         if piece[1] == 'K' and abs(to_col - from_col) == 2:
@@ -496,6 +968,13 @@ class ChessBoard:
         self.set_piece(to_row, to_col, piece)
         self.set_piece(from_row, from_col, "")
         
+        self.move_history.append({
+            "move": ((from_row, from_col), (to_row, to_col)),
+            "piece": piece,
+            "captured": captured,
+            "before": position_before
+        })
+        
         # Update castling rights
         if piece[1] == 'K':
             # King moved, lose all castling rights
@@ -525,6 +1004,7 @@ class ChessBoard:
         # Switch turns and check game state
         if not self.game_over:
             self.current_turn = "black" if self.current_turn == "white" else "white"
+            self._record_position(irreversible=bool(captured) or piece[1] == 'P')
             
             # Check for checkmate/stalemate
             self.check_game_state()
@@ -532,7 +1012,8 @@ class ChessBoard:
             # Update shield counters on turn change
             if self.powerup_system:
                 self.powerup_system.update_shields()
-        
+                
+        self._record_move()
         self.animating = False
         return captured
         
@@ -543,6 +1024,7 @@ class ChessBoard:
             self.set_piece(row, col, self.promotion_color + piece_type)
             self.promoting = False
             self.current_turn = "black" if self.current_turn == "white" else "white"
+            self._record_position(irreversible=True)
             
             # Check for checkmate/stalemate after promotion
             self.check_game_state()
@@ -550,3 +1032,5 @@ class ChessBoard:
             # Update shield counters on turn change
             if self.powerup_system:
                 self.powerup_system.update_shields()
+                
+            self._record_move(piece_type)
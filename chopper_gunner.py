@@ -5,8 +5,12 @@ First-person helicopter minigun gameplay
 
 import pygame
 import math
-import random
+from rng import cosmetic_rng
 from config import *
+from transform_cache import transform_cache, FINE_ROTATION_STEPS
+
+# Visual-only randomness (weather, tracers, particles)
+_rng = cosmetic_rng("chopper_gunner")
 
 class ChopperGunnerMode:
     def __init__(self, screen, assets, board, game=None):
@@ -70,13 +74,13 @@ class ChopperGunnerMode:
         # Weather effects
         self.rain_particles = []
         self.lightning_flash = 0
-        self.next_lightning = pygame.time.get_ticks() + random.randint(5000, 15000)
+        self.next_lightning = pygame.time.get_ticks() + _rng.randint(5000, 15000)
         self.thunder_delay = 0
         self.clouds = []
         
         # Fighter jets
         self.fighter_jets = []
-        self.next_jet_spawn = pygame.time.get_ticks() + random.randint(5000, 10000)  # First jet in 5-10 seconds
+        self.next_jet_spawn = pygame.time.get_ticks() + _rng.randint(5000, 10000)  # First jet in 5-10 seconds
         self.jet_image = None
         
         # Try multiple ways to load the jet image
@@ -109,11 +113,11 @@ class ChopperGunnerMode:
         # Initialize rain particles
         for _ in range(150):  # Reduced from 500 to 150
             particle = {
-                "x": random.randint(-50, WIDTH + 50),
-                "y": random.randint(-200, HEIGHT),  # Start distributed across screen
-                "speed": random.randint(20, 30),  # Moderate speed
-                "length": random.randint(20, 35),  # Shorter streaks
-                "wind": random.uniform(-2, -4)  # Less wind
+                "x": _rng.randint(-50, WIDTH + 50),
+                "y": _rng.randint(-200, HEIGHT),  # Start distributed across screen
+                "speed": _rng.randint(20, 30),  # Moderate speed
+                "length": _rng.randint(20, 35),  # Shorter streaks
+                "wind": _rng.uniform(-2, -4)  # Less wind
             }
             self.rain_particles.append(particle)
         pass
@@ -123,12 +127,12 @@ class ChopperGunnerMode:
         # Initialize clouds
         for _ in range(5):
             self.clouds.append({
-                "x": random.randint(-200, WIDTH + 200),
-                "y": random.randint(50, 200),
-                "width": random.randint(300, 600),
-                "height": random.randint(100, 200),
-                "speed": random.uniform(0.5, 1.5),
-                "darkness": random.uniform(0.3, 0.6)
+                "x": _rng.randint(-200, WIDTH + 200),
+                "y": _rng.randint(50, 200),
+                "width": _rng.randint(300, 600),
+                "height": _rng.randint(100, 200),
+                "speed": _rng.uniform(0.5, 1.5),
+                "darkness": _rng.uniform(0.3, 0.6)
             })
         
         # Cockpit overlay
@@ -390,10 +394,10 @@ class ChopperGunnerMode:
         vibration_y += math.cos(self.vibration_time * 48) * 1
         
         # Random turbulence system - moderate
-        if random.random() < 0.015:  # 1.5% chance (slightly less frequent)
+        if _rng.random() < 0.015:  # 1.5% chance (slightly less frequent)
             # Set new target with moderate variation
-            self.target_turbulence_x = random.uniform(-5, 5)  # Reduced from -8,8
-            self.target_turbulence_y = random.uniform(-5, 5)
+            self.target_turbulence_x = _rng.uniform(-5, 5)  # Reduced from -8,8
+            self.target_turbulence_y = _rng.uniform(-5, 5)
         else:
             # Gradually move target back to zero
             self.target_turbulence_x *= 0.98
@@ -409,9 +413,9 @@ class ChopperGunnerMode:
         self.turbulence_y += vibration_y
         
         # Add occasional "bumps" from air pockets (less frequent)
-        if random.random() < 0.007:  # 0.7% chance per frame
-            bump_x = random.uniform(-3, 3)
-            bump_y = random.uniform(-3, 3)
+        if _rng.random() < 0.007:  # 0.7% chance per frame
+            bump_x = _rng.uniform(-3, 3)
+            bump_y = _rng.uniform(-3, 3)
             self.turbulence_x += bump_x
             self.turbulence_y += bump_y
                 
@@ -430,8 +434,8 @@ class ChopperGunnerMode:
         self.camera_shake["intensity"] = 6  # Reduced from 8
         
         # Add moderate recoil movement
-        self.target_turbulence_x += random.uniform(-2, 2)
-        self.target_turbulence_y += random.uniform(-1.5, 0.5)  # Moderate upward kick
+        self.target_turbulence_x += _rng.uniform(-2, 2)
+        self.target_turbulence_y += _rng.uniform(-1.5, 0.5)  # Moderate upward kick
         
         # Keep targets reasonable
         self.target_turbulence_x = max(-7, min(7, self.target_turbulence_x))
@@ -448,7 +452,7 @@ class ChopperGunnerMode:
             "end_x": self.crosshair_x,
             "end_y": self.crosshair_y,
             "timer": 10,
-            "ricochet": random.random() < 0.15  # 15% chance of ricochet
+            "ricochet": _rng.random() < 0.15  # 15% chance of ricochet
         })
         
         # Create bullet impact effects at crosshair location
@@ -465,11 +469,11 @@ class ChopperGunnerMode:
     def create_bullet_impact(self, x, y):
         """Create small impact effects where bullets land."""
         # Create 3-5 small sparks/fragments
-        num_sparks = random.randint(3, 5)
+        num_sparks = _rng.randint(3, 5)
         
         for _ in range(num_sparks):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
+            angle = _rng.uniform(0, 2 * math.pi)
+            speed = _rng.uniform(2, 5)
             
             self.explosions.append({
                 "x": x,
@@ -481,8 +485,8 @@ class ChopperGunnerMode:
                     "vx": math.cos(angle) * speed,
                     "vy": math.sin(angle) * speed - 1,  # Slight upward bias
                     "life": 15,
-                    "size": random.randint(1, 3),
-                    "color": random.choice([
+                    "size": _rng.randint(1, 3),
+                    "color": _rng.choice([
                         (200, 200, 200),  # Light grey
                         (255, 255, 200),  # Yellowish (spark)
                         (150, 150, 150),  # Medium grey
@@ -550,15 +554,15 @@ class ChopperGunnerMode:
         particles = []
         # More particles for bigger explosion
         for _ in range(40):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(3, 12)
+            angle = _rng.uniform(0, 2 * math.pi)
+            speed = _rng.uniform(3, 12)
             particles.append({
                 "x": x,
                 "y": y,
                 "vx": math.cos(angle) * speed,
                 "vy": math.sin(angle) * speed,
                 "life": 40,
-                "color": random.choice([
+                "color": _rng.choice([
                     (255, 200, 0),
                     (255, 150, 0),
                     (255, 100, 0),
@@ -569,16 +573,16 @@ class ChopperGunnerMode:
             })
         # Add some debris particles
         for _ in range(10):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(5, 15)
+            angle = _rng.uniform(0, 2 * math.pi)
+            speed = _rng.uniform(5, 15)
             particles.append({
                 "x": x,
                 "y": y,
                 "vx": math.cos(angle) * speed,
                 "vy": math.sin(angle) * speed - 3,  # Upward bias
                 "life": 50,
-                "size": random.randint(3, 8),
-                "color": random.choice([
+                "size": _rng.randint(3, 8),
+                "color": _rng.choice([
                     (80, 80, 80),   # Grey metal
                     (60, 60, 60),   # Dark metal
                     (100, 100, 100) # Light metal
@@ -614,12 +618,12 @@ class ChopperGunnerMode:
     def create_impact_fragments(self, x, y):
         """Create small grey fragments at impact location."""
         # Create 5-8 small fragments
-        num_fragments = random.randint(5, 8)
+        num_fragments = _rng.randint(5, 8)
         
         for _ in range(num_fragments):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 4)
-            size = random.randint(2, 4)
+            angle = _rng.uniform(0, 2 * math.pi)
+            speed = _rng.uniform(1, 4)
+            size = _rng.randint(2, 4)
             
             self.explosions.append({
                 "x": x,
@@ -632,7 +636,7 @@ class ChopperGunnerMode:
                     "vy": math.sin(angle) * speed - 2,  # Initial upward velocity
                     "life": 20,
                     "size": size,
-                    "color": random.choice([
+                    "color": _rng.choice([
                         (128, 128, 128),  # Grey
                         (105, 105, 105),  # Dim grey
                         (160, 160, 160),  # Light grey
@@ -657,6 +661,7 @@ class ChopperGunnerMode:
         
         # Remove piece from board
         self.board.set_piece(row, col, "")
+        self.board.restart_position_history()  # Earlier positions can't recur
         
         # Play capture sound
         if hasattr(self.assets, 'sounds') and 'capture' in self.assets.sounds:
@@ -741,8 +746,8 @@ class ChopperGunnerMode:
         # Apply piece shake if this piece is being hit
         if (row, col) in self.piece_shake:
             shake = self.piece_shake[(row, col)]
-            shake_x = random.randint(-shake["intensity"], shake["intensity"])
-            shake_y = random.randint(-shake["intensity"], shake["intensity"])
+            shake_x = _rng.randint(-shake["intensity"], shake["intensity"])
+            shake_y = _rng.randint(-shake["intensity"], shake["intensity"])
             screen_x += shake_x
             screen_y += shake_y
         
@@ -769,15 +774,15 @@ class ChopperGunnerMode:
         """Create explosion particle effects."""
         particles = []
         for _ in range(20):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 8)
+            angle = _rng.uniform(0, 2 * math.pi)
+            speed = _rng.uniform(2, 8)
             particles.append({
                 "x": x,
                 "y": y,
                 "vx": math.cos(angle) * speed,
                 "vy": math.sin(angle) * speed,
                 "life": 30,
-                "color": random.choice([
+                "color": _rng.choice([
                     (255, 200, 0),
                     (255, 150, 0),
                     (255, 100, 0),
@@ -833,8 +838,8 @@ class ChopperGunnerMode:
             
             # Reset rain that goes off screen
             if particle["y"] > HEIGHT:
-                particle["y"] = random.randint(-100, -50)
-                particle["x"] = random.randint(-50, WIDTH + 50)
+                particle["y"] = _rng.randint(-100, -50)
+                particle["x"] = _rng.randint(-50, WIDTH + 50)
             if particle["x"] < -50:
                 particle["x"] = WIDTH + 50
             elif particle["x"] > WIDTH + 50:
@@ -843,12 +848,12 @@ class ChopperGunnerMode:
         # Handle lightning
         if current_time >= self.next_lightning:
             self.lightning_flash = 15  # Flash duration in frames
-            self.thunder_delay = random.randint(500, 2000)  # Delay before thunder
-            self.next_lightning = current_time + random.randint(8000, 20000)
+            self.thunder_delay = _rng.randint(500, 2000)  # Delay before thunder
+            self.next_lightning = current_time + _rng.randint(8000, 20000)
             
             # Add moderate turbulence during lightning
-            self.target_turbulence_x += random.uniform(-10, 10)
-            self.target_turbulence_y += random.uniform(-10, 10)
+            self.target_turbulence_x += _rng.uniform(-10, 10)
+            self.target_turbulence_y += _rng.uniform(-10, 10)
             
         # Decay lightning flash
         if self.lightning_flash > 0:
@@ -859,7 +864,7 @@ class ChopperGunnerMode:
         # Spawn new jets
         if current_time >= self.next_jet_spawn and self.phase == "active":
             # Decide on jet path
-            if random.random() < 0.5:
+            if _rng.random() < 0.5:
                 # Left to right
                 start_x = -200
                 end_x = WIDTH + 200
@@ -871,10 +876,10 @@ class ChopperGunnerMode:
                 direction = -1
             
             # Random altitude (appears below helicopter)
-            altitude = random.randint(50, 150)  # How far below helicopter
+            altitude = _rng.randint(50, 150)  # How far below helicopter
             
             # Random path across screen
-            start_y = random.randint(HEIGHT // 3, HEIGHT - 200)
+            start_y = _rng.randint(HEIGHT // 3, HEIGHT - 200)
             
             # Create jet
             jet = {
@@ -883,17 +888,17 @@ class ChopperGunnerMode:
                 "start_x": start_x,
                 "end_x": end_x,
                 "direction": direction,
-                "speed": random.uniform(8, 12),  # Fast!
+                "speed": _rng.uniform(8, 12),  # Fast!
                 "altitude": altitude,
                 "angle": 0 if direction > 0 else 180,  # Face direction of travel
                 "trail": [],  # Vapor trail positions
-                "wobble": random.uniform(0, math.pi * 2)  # Starting phase for sine wobble
+                "wobble": _rng.uniform(0, math.pi * 2)  # Starting phase for sine wobble
             }
             
             self.fighter_jets.append(jet)
             
             # Schedule next jet
-            self.next_jet_spawn = current_time + random.randint(8000, 15000)
+            self.next_jet_spawn = current_time + _rng.randint(8000, 15000)
             
             # Play jet sound if available
             if hasattr(self.assets, 'sounds') and 'jet_flyby' in self.assets.sounds:
@@ -949,6 +954,7 @@ class ChopperGunnerMode:
             # Jets at higher altitude (smaller number) appear larger
             size_factor = 1.0 - (jet["altitude"] / 300.0)
             size_factor = max(0.3, min(1.0, size_factor))
+            size_factor = round(size_factor * 20) / 20  # 5% steps, so each size keeps its rotated frames
             
             # Draw jet
             if self.jet_image:
@@ -956,26 +962,17 @@ class ChopperGunnerMode:
                 jet_width = int(150 * size_factor)  # Increased from 80 to 150
                 jet_height = int(150 * size_factor)  # Increased from 80 to 150
                 
-                scaled_jet = pygame.transform.scale(self.jet_image, (jet_width, jet_height))
-                
-                # The jet image is oriented vertically (facing up), so rotate it to face horizontally
-                if jet["direction"] > 0:
-                    # Moving right - rotate 90 degrees clockwise
-                    scaled_jet = pygame.transform.rotate(scaled_jet, -90)
-                else:
-                    # Moving left - rotate 90 degrees counter-clockwise
-                    scaled_jet = pygame.transform.rotate(scaled_jet, 90)
+                # The jet image is oriented vertically (facing up), so turn it 90 degrees clockwise to
+                # face right or counter-clockwise to face left
+                heading = -90 if jet["direction"] > 0 else 90
                 
                 # Add slight tilt based on movement
                 tilt_angle = math.sin(jet["wobble"]) * 5  # Slight banking
-                if abs(tilt_angle) > 0.1:
-                    scaled_jet = pygame.transform.rotate(scaled_jet, tilt_angle)
                 
                 # Draw with slight transparency for distance
-                scaled_jet.set_alpha(int(255 * (0.7 + 0.3 * size_factor)))
-                
-                jet_rect = scaled_jet.get_rect(center=(int(jet["x"]), int(jet["y"])))
-                self.screen.blit(scaled_jet, jet_rect)
+                jet_stack = transform_cache.stack(self.jet_image, (jet_width, jet_height), steps=FINE_ROTATION_STEPS)
+                jet_stack.blit(self.screen, (int(jet["x"]), int(jet["y"])), heading + tilt_angle,
+                               int(255 * (0.7 + 0.3 * size_factor)))
             else:
                 # Fallback: draw as triangle if no image - ALSO INCREASED
                 jet_size = int(40 * size_factor)  # Increased from 20 to 40
@@ -1005,8 +1002,8 @@ class ChopperGunnerMode:
             # Convert intensity to int for randint
             intensity = int(self.camera_shake["intensity"])
             if intensity > 0:
-                self.camera_shake["x"] = random.randint(-intensity, intensity)
-                self.camera_shake["y"] = random.randint(-intensity, intensity)
+                self.camera_shake["x"] = _rng.randint(-intensity, intensity)
+                self.camera_shake["y"] = _rng.randint(-intensity, intensity)
             else:
                 self.camera_shake["x"] = 0
                 self.camera_shake["y"] = 0
@@ -1059,8 +1056,8 @@ class ChopperGunnerMode:
             
             # Increase shake when firing
             if self.firing:  # Unlimited ammo
-                shake_x += random.randint(-3, 3)
-                shake_y += random.randint(-3, 3)
+                shake_x += _rng.randint(-3, 3)
+                shake_y += _rng.randint(-3, 3)
             
             # Create a copy of the cockpit overlay to apply lighting effects
             lit_cockpit = self.cockpit_overlay.copy()
@@ -1125,9 +1122,9 @@ class ChopperGunnerMode:
                 
                 # Draw cloud shape with circles
                 for _ in range(10):
-                    circle_x = random.randint(0, cloud["width"])
-                    circle_y = random.randint(0, cloud["height"])
-                    circle_r = random.randint(cloud["height"] // 4, cloud["height"] // 2)
+                    circle_x = _rng.randint(0, cloud["width"])
+                    circle_y = _rng.randint(0, cloud["height"])
+                    circle_r = _rng.randint(cloud["height"] // 4, cloud["height"] // 2)
                     pygame.draw.circle(cloud_surface, (gray, gray, gray + 5, alpha), 
                                      (circle_x, circle_y), circle_r)
                 
@@ -1138,7 +1135,7 @@ class ChopperGunnerMode:
             cloud["x"] += cloud["speed"]
             if cloud["x"] > WIDTH + 200:
                 cloud["x"] = -cloud["width"]
-                cloud["y"] = random.randint(50, 200)
+                cloud["y"] = _rng.randint(50, 200)
                 
     def draw_aerial_board(self):
         """Draw the chess board from aerial perspective with rotation."""
@@ -1352,7 +1349,7 @@ class ChopperGunnerMode:
         if hasattr(self.assets, 'pieces') and piece in self.assets.pieces:
             piece_image = self.assets.pieces[piece]
             # Scale the piece image based on perspective
-            scaled_piece = pygame.transform.scale(piece_image, (size, size))
+            scaled_piece = transform_cache.scale(piece_image, (size, size))
             
             # Create a darker version by adjusting the piece itself
             darkened_piece = scaled_piece.copy()
@@ -1431,7 +1428,7 @@ class ChopperGunnerMode:
                     start_y = tracer["end_y"]
                     
                     # Ricochet upward and to the side
-                    ricochet_angle = tracer.get("ricochet_angle", random.uniform(-45, 45))
+                    ricochet_angle = tracer.get("ricochet_angle", _rng.uniform(-45, 45))
                     tracer["ricochet_angle"] = ricochet_angle  # Store angle for consistency
                     
                     ricochet_distance = progress * 150
@@ -1520,7 +1517,7 @@ class ChopperGunnerMode:
                 pygame.draw.line(self.screen, rain_color, 
                                  (start_x, start_y), (end_x, end_y), 2)
                 # Add slight glow to rain
-                if random.random() < 0.1:  # 10% of rain drops have a slight shimmer
+                if _rng.random() < 0.1:  # 10% of rain drops have a slight shimmer
                     pygame.draw.line(self.screen, (150, 150, 180), 
                                      (start_x, start_y), (end_x, end_y), 1)
                                
@@ -4,9 +4,14 @@ Combines intro credits and post-intro cutscene functionality
 """
 
 import pygame
-import random
+from rng import cosmetic_rng
 import math
 import config
+from transform_cache import transform_cache
+from text_cache import text_cache
+
+# Visual-only randomness (explosions, debris, text effects)
+_rng = cosmetic_rng("cinematics")
 
 
 class Cinematics:
@@ -163,24 +168,15 @@ class IntroScreen(Cinematics):
             fade_out_progress = (elapsed - self.fade_duration - self.display_duration) / self.fade_duration
             alpha = int(255 * (1 - fade_out_progress))
             
-        # Create text surfaces
-        credit_text = self.credit_font.render(credit["text"], True, config.WHITE)
-        name_text = self.name_font.render(credit["name"], True, config.WHITE)
-        
         # Calculate positions (centered)
         screen_center_x = self.screen.get_width() // 2
         screen_center_y = self.screen.get_height() // 2
         
-        credit_rect = credit_text.get_rect(center=(screen_center_x, screen_center_y - 30))
-        name_rect = name_text.get_rect(center=(screen_center_x, screen_center_y + 20))
-        
-        # Apply alpha
-        credit_text.set_alpha(alpha)
-        name_text.set_alpha(alpha)
-        
-        # Draw text
-        self.screen.blit(credit_text, credit_rect)
-        self.screen.blit(name_text, name_rect)
+        # Draw the cached text with this frame's alpha
+        text_cache.draw(self.screen, self.credit_font, credit["text"], config.WHITE,
+                        (screen_center_x, screen_center_y - 30), "center", alpha)
+        text_cache.draw(self.screen, self.name_font, credit["name"], config.WHITE,
+                        (screen_center_x, screen_center_y + 20), "center", alpha)
         
     def skip(self):
         """Skip the intro."""
@@ -248,7 +244,7 @@ class PostIntroCutscene(Cinematics):
         self.lightning_timer = 0
         self.lightning_active = False
         self.lightning_duration = 100
-        self.next_lightning = random.randint(2000, 4000)
+        self.next_lightning = _rng.randint(2000, 4000)
         
         # Text blink timer
         self.text_blink_timer = 0
@@ -266,7 +262,7 @@ class PostIntroCutscene(Cinematics):
         # Lightning in cleared area
         self.cleared_lightning_timer = 0
         self.cleared_lightning_active = False
-        self.next_cleared_lightning = random.randint(1000, 3000)
+        self.next_cleared_lightning = _rng.randint(1000, 3000)
         
         # Logo fade-in appearance
         self.logo_text1 = "CHECKMATE"
@@ -292,38 +288,38 @@ class PostIntroCutscene(Cinematics):
         """Create initial rain drops."""
         for _ in range(200):
             self.rain_drops.append({
-                'x': random.randint(0, config.WIDTH),
-                'y': random.randint(-config.HEIGHT, config.HEIGHT),
-                'speed': random.randint(8, 15),
-                'length': random.randint(10, 20),
-                'opacity': random.randint(100, 200)
+                'x': _rng.randint(0, config.WIDTH),
+                'y': _rng.randint(-config.HEIGHT, config.HEIGHT),
+                'speed': _rng.randint(8, 15),
+                'length': _rng.randint(10, 20),
+                'opacity': _rng.randint(100, 200)
             })
             
     def initialize_falling_pieces(self):
         """Initialize falling chess pieces."""
         for _ in range(300):
             self.falling_pieces.append({
-                'type': random.choice(self.piece_types),
-                'x': random.randint(0, config.WIDTH),
-                'y': random.randint(-config.HEIGHT * 3, config.HEIGHT),
-                'speed': random.uniform(0.2, 1.5),
-                'rotation': random.randint(0, 360),
-                'rotation_speed': random.uniform(-3, 3),
-                'scale': random.uniform(0.1, 0.5),
-                'opacity': random.randint(15, 100)
+                'type': _rng.choice(self.piece_types),
+                'x': _rng.randint(0, config.WIDTH),
+                'y': _rng.randint(-config.HEIGHT * 3, config.HEIGHT),
+                'speed': _rng.uniform(0.2, 1.5),
+                'rotation': _rng.randint(0, 360),
+                'rotation_speed': _rng.uniform(-3, 3),
+                'scale': _rng.uniform(0.1, 0.5),
+                'opacity': _rng.randint(15, 100)
             })
             
     def initialize_background_jets(self):
         """Initialize background jets flying in formation."""
         for i in range(5):
             self.background_jets.append({
-                'x': random.randint(-500, -200),
-                'y': random.randint(50, config.HEIGHT - 150),
-                'speed': random.uniform(2.0, 4.0),
-                'scale': random.uniform(0.3, 0.6),
-                'opacity': random.randint(30, 80),
-                'frame': random.randint(0, len(self.jet_frames) - 1) if self.jet_frames else 0,
-                'animation_timer': random.randint(0, 100)
+                'x': _rng.randint(-500, -200),
+                'y': _rng.randint(50, config.HEIGHT - 150),
+                'speed': _rng.uniform(2.0, 4.0),
+                'scale': _rng.uniform(0.3, 0.6),
+                'opacity': _rng.randint(30, 80),
+                'frame': _rng.randint(0, len(self.jet_frames) - 1) if self.jet_frames else 0,
+                'animation_timer': _rng.randint(0, 100)
             })
             
     def initialize_military_data(self):
@@ -343,43 +339,43 @@ class PostIntroCutscene(Cinematics):
         
         for i in range(20):
             self.military_data.append({
-                'text': random.choice(data_types).format(
-                    random.uniform(0, 90),
-                    random.uniform(0, 180),
-                    random.randint(1000, 10000),
-                    random.randint(200, 600),
-                    random.randint(0, 359),
-                    random.randint(10, 99)
+                'text': _rng.choice(data_types).format(
+                    _rng.uniform(0, 90),
+                    _rng.uniform(0, 180),
+                    _rng.randint(1000, 10000),
+                    _rng.randint(200, 600),
+                    _rng.randint(0, 359),
+                    _rng.randint(10, 99)
                 ),
-                'x': random.randint(0, config.WIDTH),
-                'y': random.randint(0, config.HEIGHT),
-                'speed': random.uniform(0.2, 0.5),
-                'opacity': random.randint(20, 50),
-                'font_size': random.choice(['tiny', 'tiny', 'small'])
+                'x': _rng.randint(0, config.WIDTH),
+                'y': _rng.randint(0, config.HEIGHT),
+                'speed': _rng.uniform(0.2, 0.5),
+                'opacity': _rng.randint(20, 50),
+                'font_size': _rng.choice(['tiny', 'tiny', 'small'])
             })
             
     def initialize_binary_streams(self):
         """Initialize binary code streams."""
         for i in range(30):
             # Generate random binary string
-            binary_string = ''.join(random.choice('01') for _ in range(random.randint(8, 16)))
+            binary_string = ''.join(_rng.choice('01') for _ in range(_rng.randint(8, 16)))
             self.binary_streams.append({
                 'text': binary_string,
-                'x': random.randint(0, config.WIDTH),
-                'y': random.randint(-config.HEIGHT, config.HEIGHT * 2),
-                'speed': random.uniform(0.3, 0.8),
-                'opacity': random.randint(15, 35),
-                'direction': random.choice([-1, 1])
+                'x': _rng.randint(0, config.WIDTH),
+                'y': _rng.randint(-config.HEIGHT, config.HEIGHT * 2),
+                'speed': _rng.uniform(0.3, 0.8),
+                'opacity': _rng.randint(15, 35),
+                'direction': _rng.choice([-1, 1])
             })
             
     def generate_film_grain(self):
         """Generate film grain overlay."""
         self.grain_surface.fill((0, 0, 0, 0))
         for _ in range(2000):
-            x = random.randint(0, config.WIDTH - 1)
-            y = random.randint(0, config.HEIGHT - 1)
-            brightness = random.randint(0, 50)
-            alpha = random.randint(10, 30)
+            x = _rng.randint(0, config.WIDTH - 1)
+            y = _rng.randint(0, config.HEIGHT - 1)
+            brightness = _rng.randint(0, 50)
+            alpha = _rng.randint(10, 30)
             pygame.draw.circle(self.grain_surface, (brightness, brightness, brightness, alpha), (x, y), 1)
             
     def start(self):
@@ -418,15 +414,15 @@ class PostIntroCutscene(Cinematics):
             
             # Reset drops that go off screen
             if drop['y'] > config.HEIGHT:
-                drop['y'] = random.randint(-50, -10)
-                drop['x'] = random.randint(0, config.WIDTH + 100)
+                drop['y'] = _rng.randint(-50, -10)
+                drop['x'] = _rng.randint(0, config.WIDTH + 100)
                 
         # Update lightning
         self.lightning_timer += 16
         if self.lightning_timer >= self.next_lightning and not self.lightning_active:
             self.lightning_active = True
             self.lightning_start = current_time
-            self.next_lightning = random.randint(2000, 4000)
+            self.next_lightning = _rng.randint(2000, 4000)
             self.lightning_timer = 0
             
         if self.lightning_active:
@@ -446,10 +442,10 @@ class PostIntroCutscene(Cinematics):
             
             # Reset pieces that fall off screen
             if piece['y'] > config.HEIGHT:
-                piece['y'] = random.randint(-200, -50)
-                piece['x'] = random.randint(0, config.WIDTH)
-                piece['speed'] = random.uniform(0.2, 1.5)
-                piece['type'] = random.choice(self.piece_types)
+                piece['y'] = _rng.randint(-200, -50)
+                piece['x'] = _rng.randint(0, config.WIDTH)
+                piece['speed'] = _rng.uniform(0.2, 1.5)
+                piece['type'] = _rng.choice(self.piece_types)
                     
         # Update background jets
         for jet in self.background_jets:
@@ -461,16 +457,16 @@ class PostIntroCutscene(Cinematics):
             
             # Reset jets that go off screen
             if jet['x'] > config.WIDTH + 200:
-                jet['x'] = random.randint(-500, -300)
-                jet['y'] = random.randint(50, config.HEIGHT - 150)
-                jet['speed'] = random.uniform(2.0, 4.0)
+                jet['x'] = _rng.randint(-500, -300)
+                jet['y'] = _rng.randint(50, config.HEIGHT - 150)
+                jet['speed'] = _rng.uniform(2.0, 4.0)
                 
         # Update cleared area lightning
         self.cleared_lightning_timer += 16
         if self.cleared_lightning_timer >= self.next_cleared_lightning and not self.cleared_lightning_active:
             self.cleared_lightning_active = True
             self.cleared_lightning_start = current_time
-            self.next_cleared_lightning = random.randint(2000, 4000)
+            self.next_cleared_lightning = _rng.randint(2000, 4000)
             self.cleared_lightning_timer = 0
             
         if self.cleared_lightning_active:
@@ -494,16 +490,16 @@ class PostIntroCutscene(Cinematics):
             data['y'] -= data['speed']
             if data['y'] < -20:
                 data['y'] = config.HEIGHT + 20
-                data['x'] = random.randint(0, config.WIDTH)
+                data['x'] = _rng.randint(0, config.WIDTH)
             # Regenerate text occasionally
-            if random.randint(0, 100) == 0:
+            if _rng.randint(0, 100) == 0:
                 data_types = [
                     "LAT: {:.4f}°N", "LON: {:.4f}°W", "ALT: {}m", "SPD: {}kts", "HDG: {}°",
                     "TACTICAL: ENGAGED", "MISSION: CHECKMATE", "STATUS: ACTIVE", "TARGET: ACQUIRED", "ETA: {}s"
                 ]
-                data['text'] = random.choice(data_types).format(
-                    random.uniform(0, 90), random.uniform(0, 180), random.randint(1000, 10000),
-                    random.randint(200, 600), random.randint(0, 359), random.randint(10, 99)
+                data['text'] = _rng.choice(data_types).format(
+                    _rng.uniform(0, 90), _rng.uniform(0, 180), _rng.randint(1000, 10000),
+                    _rng.randint(200, 600), _rng.randint(0, 359), _rng.randint(10, 99)
                 )
                 
         # Update binary streams
@@ -512,15 +508,15 @@ class PostIntroCutscene(Cinematics):
             # Wrap around
             if stream['direction'] == 1 and stream['y'] > config.HEIGHT + 20:
                 stream['y'] = -20
-                stream['x'] = random.randint(0, config.WIDTH)
-                stream['text'] = ''.join(random.choice('01') for _ in range(random.randint(8, 16)))
+                stream['x'] = _rng.randint(0, config.WIDTH)
+                stream['text'] = ''.join(_rng.choice('01') for _ in range(_rng.randint(8, 16)))
             elif stream['direction'] == -1 and stream['y'] < -20:
                 stream['y'] = config.HEIGHT + 20
-                stream['x'] = random.randint(0, config.WIDTH)
-                stream['text'] = ''.join(random.choice('01') for _ in range(random.randint(8, 16)))
+                stream['x'] = _rng.randint(0, config.WIDTH)
+                stream['text'] = ''.join(_rng.choice('01') for _ in range(_rng.randint(8, 16)))
                 
         # Regenerate film grain occasionally
-        if random.randint(0, 3) == 0:
+        if _rng.randint(0, 3) == 0:
             self.generate_film_grain()
             
     def draw(self):
@@ -570,23 +566,13 @@ class PostIntroCutscene(Cinematics):
         for piece in self.falling_pieces:
             if piece['x'] < clear_rect.width:
                 if hasattr(self.assets, 'pieces') and piece['type'] in self.assets.pieces:
-                    piece_img = self.assets.pieces[piece['type']].copy()
-                    
-                    # Scale the piece
-                    piece_size = int(80 * piece['scale'])
-                    piece_img = pygame.transform.scale(piece_img, (piece_size, piece_size))
-                    
-                    # Rotate the piece
-                    rotated_piece = pygame.transform.rotate(piece_img, piece['rotation'])
-                    
-                    # Set opacity
-                    rotated_piece.set_alpha(piece['opacity'])
-                    
-                    # Get rect for positioning
-                    piece_rect = rotated_piece.get_rect(center=(int(piece['x']), int(piece['y'])))
+                    # Sizes snap to 4 px so the pieces share a few pre-rotated stacks
+                    piece_size = max(4, int(80 * piece['scale']) // 4 * 4)
+                    piece_stack = transform_cache.stack(self.assets.pieces[piece['type']], (piece_size, piece_size))
                     
-                    # Draw the piece
-                    self.screen.blit(rotated_piece, piece_rect)
+                    # Draw the piece, rotated and faded to its opacity
+                    piece_stack.blit(self.screen, (int(piece['x']), int(piece['y'])), piece['rotation'],
+                                     piece['opacity'])
         
         # Restore clip
         self.screen.set_clip(clip_rect)
@@ -598,39 +584,33 @@ class PostIntroCutscene(Cinematics):
                     jet_frame = self.jet_frames[jet['frame']]
                     jet_width = int(150 * jet['scale'])
                     jet_height = int(jet_width * jet_frame.get_height() / jet_frame.get_width())
-                    scaled_jet = pygame.transform.scale(jet_frame, (jet_width, jet_height))
-                    scaled_jet.set_alpha(jet['opacity'])
+                    scaled_jet = transform_cache.get(jet_frame, (jet_width, jet_height), alpha=jet['opacity'])
                     
                     self.screen.blit(scaled_jet, (int(jet['x']), int(jet['y'])))
         
         # Draw binary streams
         for stream in self.binary_streams:
             if stream['x'] < clear_rect.width:
-                font = self.renderer.pixel_fonts.get('tiny')
-                text = font.render(stream['text'], True, (0, 255, 0))
-                text.set_alpha(stream['opacity'])
-                self.screen.blit(text, (int(stream['x']), int(stream['y'])))
+                self.renderer.draw_text(stream['text'], 'tiny', (0, 255, 0), (int(stream['x']), int(stream['y'])),
+                                        alpha=stream['opacity'], surface=self.screen)
         
         # Draw military data
         for data in self.military_data:
             if data['x'] < clear_rect.width:
                 font = self.renderer.pixel_fonts.get(data['font_size'], self.renderer.pixel_fonts['tiny'])
-                text = font.render(data['text'], True, (0, 255, 0))
-                text.set_alpha(data['opacity'])
-                self.screen.blit(text, (int(data['x']), int(data['y'])))
+                text_cache.draw(self.screen, font, data['text'], (0, 255, 0), (int(data['x']), int(data['y'])),
+                                alpha=data['opacity'])
         
         # Draw the logo with fade-in effect
         if self.logo_font and self.logo_fade_alpha > 0:
             full_title = "CHECKMATE PROTOCOL"
-            logo_surface = self.logo_font.render(full_title, True, config.WHITE)
-            logo_surface.set_alpha(self.logo_fade_alpha)
-            logo_rect = logo_surface.get_rect(center=(config.WIDTH // 2, config.HEIGHT // 2))
-            self.screen.blit(logo_surface, logo_rect)
+            text_cache.draw(self.screen, self.logo_font, full_title, config.WHITE, (config.WIDTH // 2, config.HEIGHT // 2),
+                            "center", self.logo_fade_alpha)
             
         # Draw "PRESS ANYWHERE TO CONTINUE" text
         if self.text_visible and self.fade_alpha < 200:
             if hasattr(self.renderer, 'pixel_fonts'):
-                text = self.renderer.pixel_fonts['medium'].render("PRESS ANYWHERE TO CONTINUE", True, config.WHITE)
+                text = self.renderer._get_cached_text("PRESS ANYWHERE TO CONTINUE", 'medium', config.WHITE)
             else:
                 font = pygame.font.Font(None, 36)
                 text = font.render("PRESS ANYWHERE TO CONTINUE", True, config.WHITE)
@@ -71,6 +71,12 @@ FADE_DURATION = 1000
 # Game settings
 STARTING_PLAYER = "white"
 FPS = 60
+VSYNC = False  # Sync presents to the monitor refresh (falls back if unsupported)
+FRAME_PACING = "sleep"  # "sleep" (Clock.tick) or "busy" (Clock.tick_busy_loop, steadier but uses a core)
+ADAPTIVE_FRAME_RATE = True  # Drop to a low frame rate on screens waiting for input
+FULLSCREEN = False  # Start fullscreen (F toggles it); frames are drawn at BASE_WIDTH x BASE_HEIGHT and scaled
+SMOOTH_SCALING = False  # Smoothscale frames to fractional window scales instead of nearest-neighbour
+TRANSFORM_CACHE_MB = 48  # Memory for scaled and rotated sprites shared by all renderers
 
 # Screen states
 SCREEN_START = "start"
@@ -0,0 +1 @@
+"""Pytest configuration: makes the game modules importable from the tests directory."""
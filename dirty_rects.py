@@ -0,0 +1,148 @@
+"""
+Dirty-Rectangle Rendering
+Redraws and presents only the parts of the chess game screen that changed since the last frame
+
+The parallax background (frozen to a snapshot while on the game screen),
+the board texture and the dimmed side panels are kept in one static layer,
+and the board with its resting pieces in a second one that is rebuilt only
+when the mailbox changes, so the board costs one blit a frame; moving and
+dragged pieces are drawn on top as sprites.
+Each frame the game reports a signature of the state that shapes the
+screen; while it is unchanged, only the live regions (pulsing move dots and
+shields, the moving or dragged piece, animated icons, hovered widgets) are
+restored from the static layer, redrawn under a clip and presented with
+pygame.display.update(rects). Input, a changed signature or any effect too
+large to track falls back to a full redraw.
+"""
+
+import pygame
+import config
+
+HOVER_MARGIN = 6  # Room for hover glows drawn just outside a widget
+MAX_REGIONS = 4  # Separate redraw passes per frame before everything is merged into one
+
+
+def merge_rects(rects, limit=MAX_REGIONS):
+    """Join overlapping rects, then everything if more than limit regions are left."""
+    regions = []
+    for rect in rects:
+        rect = rect.clip(0, 0, config.WIDTH, config.HEIGHT)
+        if not rect.width or not rect.height:
+            continue
+        # Absorb every region this one overlaps or borders, repeating as it grows
+        index = rect.inflate(2, 2).collidelist(regions)
+        while index != -1:
+            rect.union_ip(regions.pop(index))
+            index = rect.inflate(2, 2).collidelist(regions)
+        regions.append(rect)
+    if len(regions) > limit:
+        return [regions[0].unionall(regions[1:])]
+    return regions
+
+
+class DirtyRectRenderer:
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.static_layer = None
+        self.board_rect = pygame.Rect(config.BOARD_OFFSET_X, config.BOARD_OFFSET_Y, config.BOARD_SIZE, config.BOARD_SIZE)
+        self.board_layer = None
+        self.board_key = None
+        self.full_redraw = True
+        self.signature = None
+        self.mouse_pos = None
+        self.last_live = []  # Live regions of the previous frame, cleared once they stop
+        
+    def invalidate(self):
+        """Redraw the whole screen next frame."""
+        self.full_redraw = True
+        
+    def invalidate_static(self):
+        """Take a new background snapshot the next time the game screen is drawn."""
+        self.static_layer = None
+        self.full_redraw = True
+        
+    def draw_static(self, screen, board):
+        """Blit the background, side panels, board and resting pieces (only the clipped part costs anything)."""
+        if self.static_layer is None:
+            self._build_static()
+        clip = screen.get_clip()
+        screen.blit(self.static_layer, clip.topleft, clip)
+        if clip.colliderect(self.board_rect):
+            self._update_board_layer(board)
+            screen.blit(self.board_layer, self.board_rect)
+    
+    def _update_board_layer(self, board):
+        """Re-render the board's resting pieces if the position or the moving pieces changed."""
+        hidden = self.renderer.moving_squares(board)
+        key = (bytes(board.squares), hidden)
+        if self.board_layer is not None and key == self.board_key:
+            return
+        self.board_layer = self.static_layer.subsurface(self.board_rect).copy()
+        self.renderer.draw_resting_pieces(self.board_layer, board, hidden, self.board_rect.topleft)
+        self.board_key = key
+        
+    def _build_static(self):
+        layer = pygame.Surface((config.WIDTH, config.HEIGHT))
+        self.renderer.draw_parallax_background(1.0, surface=layer)
+        
+        # The board draws to the renderer's screen, so point it at the layer
+        screen = self.renderer.screen
+        self.renderer.screen = layer
+        self.renderer.draw_board()
+        self.renderer.screen = screen
+        self.renderer.draw_ui_panels(surface=layer)
+        
+        self.board_layer = None
+        self.static_layer = layer
+        self.full_redraw = True
+        
+    def plan(self, signature, busy, board, shields, mouse_pos, hover_rects, animated_rects=()):
+        """Rects to redraw this frame: None for the whole screen, [] for nothing.
+        
+        signature is any comparable value describing what the screen shows;
+        busy forces a full redraw (effects, overlays, menus); animated_rects
+        are widgets off the board that animate by themselves.
+        """
+        moved = mouse_pos != self.mouse_pos
+        previous_mouse = self.mouse_pos
+        self.mouse_pos = mouse_pos
+        
+        if busy or self.full_redraw or self.static_layer is None or signature != self.signature:
+            self.signature = signature
+            self.full_redraw = False
+            self.last_live = self._live_rects(board, shields, mouse_pos, animated_rects)
+            return None
+            
+        live = self._live_rects(board, shields, mouse_pos, animated_rects)
+        rects = live + self.last_live
+        self.last_live = live
+        if moved:
+            rects += [rect.inflate(HOVER_MARGIN * 2, HOVER_MARGIN * 2) for rect in hover_rects
+                      if rect.collidepoint(mouse_pos) or rect.collidepoint(previous_mouse)]
+        return merge_rects(rects)
+        
+    def _live_rects(self, board, shields, mouse_pos, animated_rects=()):
+        """Regions that animate by themselves."""
+        rects = list(animated_rects)
+        if board.selected_piece:
+            # Pulsing move dots
+            rects += [self._square_rect(board, row, col) for row, col in board.valid_moves]
+        mask = shields.mask
+        while mask:
+            # Pulsing shield bubbles, one per set bit
+            bit = mask & -mask
+            rects.append(self._square_rect(board, *divmod(bit.bit_length() - 1, 8)))
+            mask ^= bit
+        if board.animating and board.animation_from and board.animation_to:
+            # The moving piece stays inside the box spanned by its two squares
+            rects.append(self._square_rect(board, *board.animation_from).union(
+                self._square_rect(board, *board.animation_to)))
+        if board.dragging and board.drag_piece:
+            rect = pygame.Rect(0, 0, config.SQUARE_SIZE, config.SQUARE_SIZE)
+            rect.center = mouse_pos
+            rects.append(rect)
+        return rects
+        
+    def _square_rect(self, board, row, col):
+        x, y = board.get_square_pos(row, col)
+        return pygame.Rect(x, y, config.SQUARE_SIZE, config.SQUARE_SIZE)
@@ -0,0 +1,187 @@
+"""
+Frame Pacing
+Creates the display, presents each frame exactly once and waits out the rest of the frame
+
+Every screen draws at the base resolution (config.BASE_WIDTH x BASE_HEIGHT).
+When the window is that size the game draws straight into it; otherwise
+(fullscreen) it draws into an offscreen surface of that size, which
+present() scales once into the letterboxed window, with a pixel-exact path
+for whole-number scales and optional smoothscale for the rest.
+
+Two waiting modes: "sleep" (Clock.tick, cheap on the CPU) and "busy"
+(Clock.tick_busy_loop, steadier frame times at the cost of a spinning core).
+With adaptive pacing, a screen the game reports as static drops to
+IDLE_FPS once nothing has moved for IDLE_DELAY_MS, and sleeps in
+pygame.event.wait so the first input wakes it immediately.
+"""
+
+import pygame
+import config
+
+IDLE_FPS = 15
+IDLE_DELAY_MS = 1000  # Quiet time before a static screen drops to IDLE_FPS
+MAX_FRAME_SCALE = 6.0  # Longest frame, in full-rate frames, that animations catch up on
+
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+                pygame.MOUSEMOTION, pygame.MOUSEWHEEL, pygame.TEXTINPUT, pygame.WINDOWFOCUSGAINED)
+
+
+class FramePacer:
+    def __init__(self, fps=config.FPS, mode=config.FRAME_PACING, adaptive=config.ADAPTIVE_FRAME_RATE,
+                 vsync=config.VSYNC, fullscreen=config.FULLSCREEN):
+        self.fps = fps
+        self.mode = mode
+        self.adaptive = adaptive
+        self.vsync = vsync
+        self.fullscreen = fullscreen
+        self.base_size = (config.BASE_WIDTH, config.BASE_HEIGHT)
+        self.flags = 0
+        self.window = None
+        self.target = None  # What the game draws to: the window itself, or an offscreen base-size surface
+        self.viewport = None  # Where the scaled frame lands in the window
+        self.view = None
+        self.integer_scale = 1
+        self.clock = pygame.time.Clock()
+        self.idle = False
+        self.last_activity = pygame.time.get_ticks()
+        self.frame_started = self.last_activity
+        # Length of the last frame in full-rate frames, for animations that step per frame
+        self.frame_scale = 1.0
+        
+    def configure(self, mode=None, adaptive=None, vsync=None, fullscreen=None):
+        """Change settings before the display is created (e.g. from the command line)."""
+        if mode is not None:
+            self.mode = mode
+        if adaptive is not None:
+            self.adaptive = adaptive
+        if vsync is not None:
+            self.vsync = vsync
+        if fullscreen is not None:
+            self.fullscreen = fullscreen
+    
+    def create_display(self, size=None, flags=0):
+        """Open the window and return the base-resolution surface every screen draws to."""
+        if size:
+            self.base_size = tuple(size)
+        self.flags = flags
+        self._open_window()
+        return self.target
+        
+    def toggle_fullscreen(self):
+        """Switch between a base-size window and fullscreen; returns the new draw target."""
+        self.fullscreen = not self.fullscreen
+        self._open_window()
+        return self.target
+        
+    def _set_mode(self, size, flags):
+        """Open the window, synced to the monitor's refresh if vsync is on and the driver allows it."""
+        if self.vsync:
+            try:
+                return pygame.display.set_mode(size, flags, vsync=1)
+            except pygame.error as e:
+                print(f"Vsync unavailable ({e}); using the frame cap only")
+                self.vsync = False
+        return pygame.display.set_mode(size, flags)
+        
+    def _open_window(self):
+        if self.fullscreen:
+            self.window = self._set_mode((0, 0), self.flags | pygame.FULLSCREEN)
+        else:
+            self.window = self._set_mode(self.base_size, self.flags)
+            
+        window_width, window_height = self.window.get_size()
+        base_width, base_height = self.base_size
+        if (window_width, window_height) == self.base_size:
+            # Nothing to scale: draw straight into the window
+            self.target = self.window
+            self.viewport = self.window.get_rect()
+            self.view = None
+            self.integer_scale = 1
+            return
+            
+        # Fit the base frame into the window, keeping its aspect ratio
+        fit = min(window_width / base_width, window_height / base_height)
+        self.integer_scale = int(fit) if fit >= 1 and fit == int(fit) else 0
+        self.viewport = pygame.Rect(0, 0, int(base_width * fit), int(base_height * fit))
+        self.viewport.center = (window_width // 2, window_height // 2)
+        if self.target is None or self.target is self.window:
+            self.target = pygame.Surface(self.base_size).convert()
+        self.window.fill((0, 0, 0))
+        self.view = self.window.subsurface(self.viewport)
+        pygame.display.flip()
+        
+    def to_base(self, pos):
+        """Map a window position (e.g. a mouse event's) to base-resolution coordinates."""
+        if self.view is None:
+            return pos
+        x = (pos[0] - self.viewport.x) * self.base_size[0] // self.viewport.width
+        y = (pos[1] - self.viewport.y) * self.base_size[1] // self.viewport.height
+        return (min(max(x, 0), self.base_size[0] - 1), min(max(y, 0), self.base_size[1] - 1))
+        
+    def get_mouse_pos(self):
+        """pygame.mouse.get_pos() in base-resolution coordinates."""
+        return self.to_base(pygame.mouse.get_pos())
+        
+    def present(self, rects=None):
+        """Show the finished frame: all of it, or only rects (an empty list leaves the window as it is)."""
+        if rects is not None and not rects:
+            return
+        if self.view is None:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+            
+        scale = self.integer_scale
+        if rects is not None and scale:
+            # Whole-number scales are pixel exact, so changed regions can be scaled on their own
+            updated = []
+            for rect in rects:
+                area = pygame.Rect(rect.x * scale, rect.y * scale, rect.width * scale, rect.height * scale)
+                pygame.transform.scale(self.target.subsurface(rect), area.size, self.view.subsurface(area))
+                updated.append(area.move(self.viewport.topleft))
+            pygame.display.update(updated)
+        elif config.SMOOTH_SCALING and not scale:
+            pygame.transform.smoothscale(self.target, self.viewport.size, self.view)
+            pygame.display.flip()
+        else:
+            pygame.transform.scale(self.target, self.viewport.size, self.view)
+            pygame.display.flip()
+        
+    def wake(self):
+        """Note input or animation so adaptive pacing returns to the full rate."""
+        self.last_activity = pygame.time.get_ticks()
+        self.idle = False
+        
+    def tick(self, static=False):
+        """Wait out the rest of the frame; static says nothing on screen is changing."""
+        now = pygame.time.get_ticks()
+        if not static:
+            self.last_activity = now
+        self.idle = self.adaptive and static and now - self.last_activity >= IDLE_DELAY_MS
+        
+        if self.idle:
+            # Sleep until the next idle frame is due, or until input arrives
+            remaining = 1000 // IDLE_FPS - (now - self.frame_started)
+            if remaining > 0 and not pygame.event.peek():
+                event = pygame.event.wait(remaining)
+                if event.type != pygame.NOEVENT:
+                    pygame.event.post(event)  # Handled next frame, as usual
+                    if event.type in INPUT_EVENTS:
+                        self.wake()
+            elapsed = self.clock.tick()
+        elif self.mode == "busy":
+            elapsed = self.clock.tick_busy_loop(self.fps)
+        else:
+            elapsed = self.clock.tick(self.fps)
+            
+        self.frame_started = pygame.time.get_ticks()
+        self.frame_scale = min(MAX_FRAME_SCALE, elapsed * self.fps / 1000.0)
+        
+    def get_fps(self):
+        return self.clock.get_fps()
+
+
+# The game's pacer; animations read frame_scale from it
+pacer = FramePacer()
@@ -8,23 +8,30 @@ import config
 from assets import AssetManager
 from board import ChessBoard
 from graphics import Renderer
-from ai import ChessAI
+from ai import ChessAI, MoveConstraints, calibrate_search_speed
 from powerups import PowerupSystem
 from powerup_renderer import PowerupRenderer
+from dirty_rects import DirtyRectRenderer
 from chopper_gunner import ChopperGunnerMode
 from cinematics import IntroScreen, PostIntroCutscene
 from story_mode import StoryMode
 from tutorial_system import TutorialSystem
+from hints import HintService
+from postgame import PostGameAnalysis
+from gamerecord import GameRecord
+from profiler import profiler
+from framepacing import pacer, INPUT_EVENTS
+from uci import UCIOpponent
 
 class ChessGame:
-    def __init__(self):
+    def __init__(self, opponent_command=None):
         # Get screen info before creating display
         self.screen_info = pygame.display.Info()
         
-        # Create screen (windowed mode only)
-        self.screen = pygame.display.set_mode((config.WIDTH, config.HEIGHT), pygame.DOUBLEBUF)
+        # Create screen; everything draws at the base resolution and the pacer scales it to the window
+        self.screen = pacer.create_display((config.BASE_WIDTH, config.BASE_HEIGHT), pygame.DOUBLEBUF)
         pygame.display.set_caption("Checkmate Protocol - BETA")
-        self.clock = pygame.time.Clock()
+        self.cheat_flash_until = 0  # Ticks until which the cheat-code flash is drawn
         
         # Load assets
         self.assets = AssetManager()
@@ -32,8 +39,20 @@ class ChessGame:
         
         # Create components
         self.board = ChessBoard()
+        self.board.record = GameRecord()  # Moves and powerups of the game in progress, streamed to disk
         self.renderer = Renderer(self.screen, self.assets)
         self.ai = None  # Will be created when difficulty is selected
+        self.opponent_command = opponent_command  # External UCI engine to play against, if any
+        
+        # Measure search speed once so AI latency is consistent across machines
+        calibrate_search_speed()
+        
+        # Background move hints for the player (toggled with H)
+        self.hint_service = HintService()
+        self.show_hints = False
+        
+        # Analysis of the last finished game, shown on the result screen
+        self.postgame_analysis = None
         
         # Intro screen
         self.intro_screen = IntroScreen(self.screen, self.renderer)
@@ -55,6 +74,10 @@ class ChessGame:
         self.powerup_system = PowerupSystem()
         self.powerup_renderer = PowerupRenderer(self.screen, self.renderer, self.powerup_system)
         
+        # Game screen frames redraw and present only what changed
+        self.dirty_renderer = DirtyRectRenderer(self.renderer)
+        self.present_rects = None  # Set by draw(); None presents the whole screen
+        
         # Pass assets reference to powerup system
         self.powerup_system.assets = self.assets
         # Pass game reference for tutorial checks
@@ -415,10 +438,40 @@ class ChessGame:
             50
         )
             
+    def _create_ai(self, difficulty):
+        """Create the opponent: the built-in AI, or an external UCI engine if configured."""
+        if self.opponent_command:
+            if isinstance(self.ai, UCIOpponent):
+                self.ai.close()
+            self.board.record.set_tag("Black", self.opponent_command)
+            return UCIOpponent(self.opponent_command, self.board, difficulty)
+        self.board.record.set_tag("Black", f"Computer ({difficulty})")
+        return ChessAI(difficulty)
+        
+    def _ai_move_constraints(self):
+        """Compile the tutorial and story battle restrictions for this AI turn."""
+        forbidden_pieces = ()
+        allow_captures = True
+        aggression = 1.0
+        
+        if self.in_tutorial_battle:
+            # Keep the opening gentle: no queen, bishop or knight moves for
+            # the first 3 AI moves, and no captures for the first 5
+            if self.tutorial.ai_move_index < 3:
+                forbidden_pieces = ('Q', 'B', 'N')
+            if self.tutorial.ai_move_index < 5:
+                allow_captures = False
+                
+        if self.current_mode == "story" and self.current_story_battle:
+            rules = self.current_story_battle.get("special_rules", {})
+            aggression = rules.get("ai_aggression", 1.0)
+            
+        return MoveConstraints(forbidden_pieces, allow_captures, aggression)
+        
     def store_game_state(self):
         """Store the current game state before entering shop."""
         self.stored_game_state = {
-            "board": [row[:] for row in self.board.board],  # Deep copy of board
+            "board": bytes(self.board.squares),  # Copy of the mailbox
             "current_turn": self.board.current_turn,
             "captured_pieces": {
                 "white": self.board.captured_pieces["white"][:],
@@ -449,7 +502,8 @@ class ChessGame:
         """Restore the game state after returning from shop."""
         if self.stored_game_state:
             # Restore board state
-            self.board.board = [row[:] for row in self.stored_game_state["board"]]
+            self.board.squares = bytearray(self.stored_game_state["board"])
+            self.board.recompute_hash()
             self.board.current_turn = self.stored_game_state["current_turn"]
             self.board.captured_pieces = {
                 "white": self.stored_game_state["captured_pieces"]["white"][:],
@@ -461,6 +515,7 @@ class ChessGame:
             # Restore powerup state
             self.powerup_system.points = dict(self.stored_game_state["powerup_points"])
             self.powerup_system.shielded_pieces = dict(self.stored_game_state["shielded_pieces"])
+            self.board.restart_position_history()
             
             # Don't give points here - wait for arms dealer visit
             if self.in_tutorial_battle and self.tutorial.active:
@@ -506,6 +561,10 @@ class ChessGame:
         # Deduct points
         self.powerup_system.points["black"] -= self.powerup_system.powerups[powerup_key]["cost"]
         
+        if action["type"] != "chopper" or action.get("confirm"):
+            targets = action.get("targets") or ([action["target"]] if "target" in action else [])
+            self.board.record_powerup("black", action["type"], targets, action.get("shooter"))
+        
         if action["type"] == "shield":
             # AI shields a piece
             row, col = action["target"]
@@ -524,6 +583,7 @@ class ChessGame:
             target = self.board.get_piece(*target_pos)
             if target and target[1] != 'K' and target_pos not in self.powerup_system.shielded_pieces:
                 self.board.set_piece(target_pos[0], target_pos[1], "")
+                self.board.restart_position_history()  # Earlier positions can't recur
                 
         elif action["type"] == "airstrike":
             # AI airstrikes an area
@@ -568,6 +628,7 @@ class ChessGame:
                     if piece and piece[0] == 'w' and piece[1] != 'K':
                         if not self.powerup_system.is_piece_shielded(row, col):
                             self.board.set_piece(row, col, "")
+            self.board.restart_position_history()  # Earlier positions can't recur
                             
             # Add explosion effects
             current_time = pygame.time.get_ticks()
@@ -590,6 +651,18 @@ class ChessGame:
             if event.type == pygame.QUIT:
                 self.running = False
                 
+            # Any input brings adaptive frame pacing back to full rate
+            if event.type in INPUT_EVENTS:
+                pacer.wake()
+                
+            # Anything but mouse motion may change what the game screen shows
+            if event.type != pygame.MOUSEMOTION:
+                self.dirty_renderer.invalidate()
+                
+            # Mouse positions arrive in window pixels; the game works in base-resolution ones
+            if hasattr(event, "pos"):
+                event.pos = pacer.to_base(event.pos)
+                
             # Handle tutorial timer events
             if event.type == pygame.USEREVENT + 1:
                 if self.in_tutorial_battle and self.tutorial.active:
@@ -670,6 +743,17 @@ class ChessGame:
             if event.type == pygame.KEYDOWN:
                 self.handle_key(event.key)
                 
+    def _set_screen(self, screen):
+        """Point the game and everything that draws for it at a new screen surface."""
+        self.screen = screen
+        self.renderer.screen = screen
+        self.powerup_renderer.screen = screen
+        self.intro_screen.screen = screen
+        self.post_intro_cutscene.screen = screen
+        if self.chopper_mode:
+            self.chopper_mode.screen = screen
+        self.dirty_renderer.invalidate()
+        
     def update_music_volume_from_mouse(self, mouse_pos):
         """Update music volume based on mouse position."""
         # Calculate volume from mouse x position relative to slider
@@ -829,7 +913,7 @@ class ChessGame:
                     elif mode_key == "freeplay":
                         # Start free roam mode with unlimited powerups
                         self.selected_difficulty = "medium"  # Default difficulty for AI
-                        self.ai = ChessAI("medium")
+                        self.ai = self._create_ai("medium")
                         self.current_mode = "freeplay"
                         self.board.reset()
                         self.powerup_system = PowerupSystem()
@@ -895,7 +979,7 @@ class ChessGame:
                                     self.tutorial.completed = True
                                 config.set_tutorial_mode(False)
                             
-                            self.ai = ChessAI(self.selected_difficulty)
+                            self.ai = self._create_ai(self.selected_difficulty)
                             self.start_fade("story_chapter", "story_dialogue")
                     else:
                         # Play error sound for locked battle
@@ -1049,7 +1133,7 @@ class ChessGame:
                 if button.collidepoint(pos) and difficulty in unlocked:
                     play_click_sound()
                     self.selected_difficulty = difficulty
-                    self.ai = ChessAI(difficulty)
+                    self.ai = self._create_ai(difficulty)
                     
                     self.start_fade(config.SCREEN_DIFFICULTY, config.SCREEN_GAME)
                     return
@@ -1341,6 +1425,19 @@ class ChessGame:
         
     def handle_key(self, key):
         """Handle keyboard input."""
+        # Frame profiler: F3 toggles it and its overlay, F4 saves a trace
+        if key == pygame.K_F3:
+            profiler.toggle()
+            return
+        if key == pygame.K_F4 and profiler.enabled:
+            profiler.export_trace()
+            return
+            
+        # F toggles fullscreen; the pacer hands back a new draw target
+        if key == pygame.K_f:
+            self._set_screen(pacer.toggle_fullscreen())
+            return
+            
         # CHEAT CODE: Press 'T' for TEST MODE - unlocks everything and gives money
         if key == pygame.K_t:
             # Check if SHIFT is also held for the cheat
@@ -1370,13 +1467,8 @@ class ChessGame:
                     
                 pass  # Cheat code applied
                 
-                # Visual feedback - flash the screen green
-                flash_surface = pygame.Surface((config.WIDTH, config.HEIGHT))
-                flash_surface.fill((100, 200, 100))
-                flash_surface.set_alpha(100)
-                self.screen.blit(flash_surface, (0, 0))
-                pygame.display.flip()
-                pygame.time.wait(200)
+                # Visual feedback - flash the screen green (drawn by draw())
+                self.cheat_flash_until = pygame.time.get_ticks() + 200
                 
                 return
             
@@ -1394,6 +1486,10 @@ class ChessGame:
                         self.start_fade(config.SCREEN_GAME, "story_chapter")
                     else:
                         self.start_fade(config.SCREEN_GAME, config.SCREEN_START)
+            elif key == pygame.K_h:
+                self.show_hints = not self.show_hints
+                if not self.show_hints:
+                    self.hint_service.cancel()
             elif key == pygame.K_r and self.board.game_over:
                 self.board.reset()
                 self.powerup_system = PowerupSystem()  # Reset powerup system
@@ -1435,6 +1531,10 @@ class ChessGame:
         self.fade_from = from_screen
         self.fade_to = to_screen
         
+        # Snapshot a fresh background for the game screen
+        if to_screen == config.SCREEN_GAME:
+            self.dirty_renderer.invalidate_static()
+            
         # Handle screen-specific cleanup
         if from_screen == "story_dialogue":
             # Reset dialogue state when leaving story dialogue
@@ -1649,6 +1749,16 @@ class ChessGame:
                             self.tutorial.handle_points_gained()
                         
                         
+            # Analyse the player's position in the background; moving cancels it
+            if (self.show_hints and self.ai and
+                self.board.current_turn == "white" and
+                not self.board.game_over and
+                not self.board.animating and
+                not self.board.promoting):
+                self.hint_service.request(self.board, self.ai)
+            else:
+                self.hint_service.cancel()
+                
             # Keep points unlimited in freeplay mode
             if self.current_mode == "freeplay":
                 self.powerup_system.points = {"white": 99999, "black": 99999}
@@ -1663,14 +1773,16 @@ class ChessGame:
                     if not self.ai.is_thinking() and self.ai.start_thinking is None:
                         if self.in_tutorial_battle:
                             pass  # AI starting turn
-                        self.ai.start_turn()
+                        with profiler.section("ai.start_turn"):
+                            self.ai.start_turn(self._ai_move_constraints())
                     
                     # Make move when done thinking
                     if not self.ai.is_thinking():
                         # First check if AI wants to use a powerup
-                        ai_powerup = self.ai.should_use_powerup(self.board, self.powerup_system)
+                        with profiler.section("ai.powerup"):
+                            ai_powerup = self.ai.should_use_powerup(self.board, self.powerup_system)
+                            powerup_action = ai_powerup and self.ai.execute_powerup(self.board, self.powerup_system, ai_powerup)
                         if ai_powerup:
-                            powerup_action = self.ai.execute_powerup(self.board, self.powerup_system, ai_powerup)
                             if powerup_action:
                                 self._handle_ai_powerup(ai_powerup, powerup_action)
                                 self.ai.start_thinking = None
@@ -1731,7 +1843,8 @@ class ChessGame:
                                 if (to_pos[1], to_pos[0]) not in legal_moves:
                                     # The scripted move is illegal, fallback to regular AI
                                     print(f"Tutorial move {from_pos} to {to_pos} is illegal, using regular AI")
-                                    ai_move = self.ai.get_move(self.board)
+                                    with profiler.section("ai.get_move"):
+                                        ai_move = self.ai.get_move(self.board)
                                     if ai_move:
                                         from_pos, to_pos = ai_move
                                         self.board.start_move(from_pos[0][0], from_pos[0][1], to_pos[0], to_pos[1])
@@ -1747,7 +1860,8 @@ class ChessGame:
                                 self.board.start_move(from_pos[1], from_pos[0], to_pos[1], to_pos[0])
                         else:
                             # Normal AI move
-                            ai_move = self.ai.get_move(self.board)
+                            with profiler.section("ai.get_move"):
+                                ai_move = self.ai.get_move(self.board)
                             
                             # TUTORIAL SAFETY: Don't let AI capture critical pieces during tutorial
                             if self.in_tutorial_battle and ai_move:
@@ -1807,6 +1921,16 @@ class ChessGame:
                                     self.board.start_move(from_pos[0], from_pos[1], to_pos[0], to_pos[1])
                         self.ai.start_thinking = None
                         
+            # Analyse the finished game in the background while the result screen shows
+            if self.postgame_analysis and self.postgame_analysis.move_history is not self.board.move_history:
+                self.postgame_analysis.cancel()  # A new game has started
+                self.postgame_analysis = None
+            if self.board.game_over and self.postgame_analysis is None and self.board.move_history:
+                self.postgame_analysis = PostGameAnalysis(self.board.move_history)
+                self.postgame_analysis.start()
+            if self.postgame_analysis:
+                self.postgame_analysis.poll()
+                
             # Check for player victory and unlock next difficulty
             if self.board.game_over and self.board.winner == "white":
                 pass  # Game over
@@ -1890,10 +2014,13 @@ class ChessGame:
                     
     def draw(self):
         """Draw everything."""
+        self.present_rects = None
+        
         # Handle chopper mode drawing separately
         if self.chopper_mode and self.chopper_mode.active:
-            self.chopper_mode.draw()
-            pygame.display.flip()
+            self.dirty_renderer.invalidate()
+            with profiler.section("chopper.draw"):
+                self.chopper_mode.draw()
             
             # Check if chopper mode is ending
             if self.chopper_mode.phase == "complete":
@@ -1935,6 +2062,8 @@ class ChessGame:
         
         # Handle fade transitions
         if self.fade_active:
+            self.dirty_renderer.invalidate()
+            
             # Disable typewriter additions during fade
             self.renderer.allow_typewriter_additions = False
             
@@ -1943,22 +2072,39 @@ class ChessGame:
             
             if progress < 0.5:
                 # Fade out
-                self.draw_screen(self.fade_from)
+                with profiler.section("draw_screen"):
+                    self.draw_screen(self.fade_from)
                 alpha = int(255 * (progress * 2))
                 self._fade_surface.set_alpha(alpha)
                 self.screen.blit(self._fade_surface, (0, 0))
             else:
                 # Fade in
-                self.draw_screen(self.fade_to)
+                with profiler.section("draw_screen"):
+                    self.draw_screen(self.fade_to)
                 alpha = int(255 * (2 - progress * 2))
                 self._fade_surface.set_alpha(alpha)
                 self.screen.blit(self._fade_surface, (0, 0))
                 
             # Re-enable typewriter additions
             self.renderer.allow_typewriter_additions = True
+        elif self.current_screen == config.SCREEN_GAME:
+            # The game screen redraws only the regions that changed, when it can
+            dirty = self._game_screen_dirty_rects()
+            if dirty is None:
+                with profiler.section("draw_screen"):
+                    self.draw_screen(self.current_screen)
+            else:
+                with profiler.section("draw_screen.dirty"):
+                    for area in dirty:
+                        self.screen.set_clip(area)
+                        self.draw_screen(self.current_screen)
+                    self.screen.set_clip(None)
+                self.present_rects = dirty
         else:
             # Normal drawing (no fade)
-            self.draw_screen(self.current_screen)
+            self.dirty_renderer.invalidate()
+            with profiler.section("draw_screen"):
+                self.draw_screen(self.current_screen)
             
         # Update and draw typewriter texts only on appropriate screens
         # Don't draw typewriter texts during fade transitions
@@ -1979,7 +2125,68 @@ class ChessGame:
             # Blit the game surface with shake offset
             self.screen.blit(self._shake_surface, (shake_x, shake_y))
             
-        pygame.display.flip()
+        # Cheat-code flash
+        if pygame.time.get_ticks() < self.cheat_flash_until:
+            flash_surface = pygame.Surface((config.WIDTH, config.HEIGHT))
+            flash_surface.fill((100, 200, 100))
+            flash_surface.set_alpha(100)
+            self.screen.blit(flash_surface, (0, 0))
+            
+    def _game_screen_dirty_rects(self):
+        """Regions of the game screen to redraw this frame, or None to redraw all of it."""
+        board = self.board
+        powerups = self.powerup_system
+        current_time = pygame.time.get_ticks()
+        
+        # Effects, overlays and menus that change too much to track
+        busy = (profiler.show_overlay or self.in_tutorial_battle or board.promoting or board.game_over
+                or powerups.animations or powerups.effects or powerups.screen_shake["active"]
+                or powerups.active_powerup or self.dragging_music_slider or self.dragging_sfx_slider
+                or current_time < self.cheat_flash_until
+                or current_time - self.arms_dealer_shake_start < self.arms_dealer_shake_duration)
+                
+        # Everything else the screen shows; any change redraws it all
+        analysis = self.hint_service.get_analysis() if self.show_hints else None
+        signature = (
+            bytes(board.squares), board.current_turn, board.selected_piece, board.animating, board.dragging,
+            powerups.shields.key, powerups.shields.turn, tuple(powerups.points.values()),
+            bool(self.ai and self.ai.is_thinking()),
+            analysis and (analysis["depth"], analysis["lines"]),
+            self.music_volume, self.sfx_volume, self.current_mode
+        )
+        
+        knob = self.volume_knob_radius * 2
+        hover_rects = list(powerups.button_rects.values())
+        hover_rects += [self.music_slider_rect.inflate(knob, knob), self.sfx_slider_rect.inflate(knob, knob)]
+        if self.arms_dealer_game_button:
+            hover_rects.append(self.arms_dealer_game_button)
+        # The chopper icon's rotor spins
+        animated_rects = [powerups.button_rects["chopper"]] if "chopper" in powerups.button_rects else []
+        return self.dirty_renderer.plan(signature, busy, board, powerups.shields, self.mouse_pos, hover_rects,
+                                        animated_rects)
+        
+    def _screen_is_static(self):
+        """Whether the screen is only waiting for input, so adaptive pacing may lower the frame rate."""
+        scrolled, self.renderer.background_scrolled = self.renderer.background_scrolled, False
+        if scrolled or self.fade_active or pygame.time.get_ticks() < self.cheat_flash_until:
+            return False  # Idling would make the parallax background stutter
+        if self.current_screen != config.SCREEN_GAME or self.in_tutorial_battle:
+            return False
+        if self.chopper_mode and self.chopper_mode.active:
+            return False
+            
+        # The player's turn with nothing moving on the board
+        board = self.board
+        if board.animating or board.dragging or board.game_over or board.current_turn != "white":
+            return False
+        if board.selected_piece:
+            return False  # Pulsing move dots
+        powerups = self.powerup_system
+        if powerups.animations or powerups.effects or powerups.screen_shake["active"] or powerups.shields.mask:
+            return False  # Shield bubbles pulse too
+        if "chopper" in powerups.button_rects:
+            return False  # The chopper icon's rotor spins
+        return pygame.time.get_ticks() - self.arms_dealer_shake_start >= self.arms_dealer_shake_duration
             
     def draw_screen(self, screen_type):
         """Draw specific screen."""
@@ -2085,32 +2292,41 @@ class ChessGame:
             self.draw_volume_sliders()
             
         elif screen_type == config.SCREEN_GAME:
-            # Background
-            self.renderer.draw_parallax_background(1.0)
+            # Background snapshot, side panels, board and resting pieces
+            self.dirty_renderer.draw_static(self.screen, self.board)
+            
+            # Skip whatever lies outside a dirty-rect redraw's clip
+            visible = self.screen.get_clip()
+            on_board = self.board.dragging or visible.colliderect(self.dirty_renderer.board_rect)
             
-            # Board and pieces
-            self.renderer.draw_board()
-            self.renderer.draw_pieces(self.board, self.mouse_pos)
+            # Moving and dragged pieces
+            if on_board:
+                self.renderer.draw_piece_sprites(self.board, self.mouse_pos)
             
             # Game elements
-            if not self.board.game_over:
+            if not self.board.game_over and on_board:
                 self.renderer.draw_highlights(self.board)
                 self.renderer.draw_check_indicator(self.board)
+                if self.show_hints:
+                    self.renderer.draw_hint_arrows(self.board, self.hint_service.get_analysis(),
+                                                   self.hint_service.get_hint_lines())
                 
             # UI with AI info (always show captured pieces)
             self.renderer.draw_ui(self.board, None, False, self.mouse_pos, 
                                  self.ai, self.selected_difficulty,
-                                 show_captured=True)
+                                 show_captured=True, show_panels=False)
             self.draw_volume_sliders()
             
             # Add Arms Dealer button in game
             self.draw_arms_dealer_button()
             
             # Powerup menu
-            self.powerup_renderer.draw_powerup_menu(self.board, self.mouse_pos)
+            if visible.colliderect(self.powerup_renderer.menu_rect()):
+                self.powerup_renderer.draw_powerup_menu(self.board, self.mouse_pos)
             
             # Powerup effects
-            self.powerup_renderer.draw_effects(self.board)
+            with profiler.section("draw_effects"):
+                self.powerup_renderer.draw_effects(self.board)
             
             # Powerup targeting
             self.powerup_renderer.draw_powerup_targeting(self.board, self.mouse_pos)
@@ -2159,6 +2375,8 @@ class ChessGame:
                             # Check if there's another battle after this one
                             self.board.has_next_battle = current_battle_idx >= 0 and current_battle_idx < len(chapter["battles"]) - 1
             self.game_over_buttons = self.renderer.draw_game_over(self.board)
+            if self.postgame_analysis and self.game_over_buttons[0] is not None:
+                self.renderer.draw_eval_graph(self.postgame_analysis)
             
     def draw_killstreak_ui(self):
         """Placeholder for removed killstreak UI."""
@@ -2329,8 +2547,18 @@ class ChessGame:
     def run(self):
         """Main game loop."""
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            pygame.display.flip()
-            self.clock.tick(config.FPS)
\ No newline at end of file
+            profiler.begin_frame()
+            with profiler.section("handle_events"):
+                self.handle_events()
+            with profiler.section("update"):
+                self.update()
+            with profiler.section("draw"):
+                self.draw()
+            profiler.draw_overlay(self.screen)
+            
+            # The frame's one and only present
+            with profiler.section("present"):
+                pacer.present(self.present_rects)
+            with profiler.section("pace"):
+                pacer.tick(self._screen_is_static())
+            profiler.end_frame()
\ No newline at end of file
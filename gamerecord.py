@@ -0,0 +1,248 @@
+"""
+Game Record
+Compact log of every move and powerup in a game, streamed to disk as it is played and exportable as PGN
+
+Each event is one fixed-size binary record appended to an array, so a
+game of any length costs a few bytes per ply and nothing per frame. When
+a records directory is set, every record is also appended to a .rec file
+and flushed straight away, so a crashed game can be read back with load().
+"""
+
+import json
+import os
+import struct
+import time
+from array import array
+from rng import get_seed
+
+RECORDS_DIR = "records"
+FILE_MAGIC = b"CPR1"
+
+# kind, player, from, to, promotion, SAN (move records), target squares as a
+# 64-bit mask (powerup records), milliseconds since the game started
+RECORD = struct.Struct("<BBBBB8sQI")
+HEADER_LENGTH = struct.Struct("<I")
+
+KINDS = ["move", "shield", "gun", "airstrike", "paratroopers", "chopper", "result"]
+PLAYERS = ["white", "black"]
+PROMOTIONS = ["", "Q", "R", "B", "N"]
+RESULTS = ["1-0", "0-1", "1/2-1/2"]
+NO_SQUARE = 0xFF
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+SEVEN_TAG_ROSTER = ["Event", "Site", "Date", "Round", "White", "Black", "Result"]
+PGN_LINE_WIDTH = 79
+
+
+def square_name(row, col):
+    """Algebraic name of a board square, e.g. (7, 4) -> "e1"."""
+    return "abcdefgh"[col] + str(8 - row)
+
+
+def _square_index(square):
+    return NO_SQUARE if square is None else square[0] * 8 + square[1]
+
+
+def _index_square(index):
+    return None if index == NO_SQUARE else divmod(index, 8)
+
+
+class GameRecord:
+    def __init__(self, tags=None, records_dir=RECORDS_DIR):
+        self.records_dir = records_dir  # None keeps the record in memory only
+        self.default_tags = dict(tags or {})
+        self.log = array('B')
+        self.file = None
+        self.path = None
+        self.new_game()
+        
+    def new_game(self, fen=START_FEN, tags=None):
+        """Close the current game's file and start an empty record."""
+        self.close()
+        del self.log[:]
+        self.fen = fen
+        self.tags = {
+            "Event": "Checkmate Protocol",
+            "Site": "?",
+            "Date": time.strftime("%Y.%m.%d"),
+            "Round": "-",
+            "White": "Player",
+            "Black": "Computer",
+            "Seed": str(get_seed())
+        }
+        self.tags.update(self.default_tags)
+        self.tags.update(tags or {})
+        self.started = time.monotonic()
+        
+    def set_tag(self, name, value):
+        """Set a PGN tag for this game and the games after it."""
+        self.default_tags[name] = value
+        self.tags[name] = value
+        
+    def __len__(self):
+        return len(self.log) // RECORD.size
+        
+    def __getitem__(self, index):
+        """One record as a dict of its fields."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        kind, player, from_index, to_index, promotion, san, targets, ms = RECORD.unpack_from(self.log, index * RECORD.size)
+        return {
+            "kind": KINDS[kind],
+            "player": PLAYERS[player],
+            "from": _index_square(from_index),
+            "to": _index_square(to_index),
+            "promotion": PROMOTIONS[promotion],
+            "san": san.rstrip(b"\0").decode("ascii"),
+            "targets": [divmod(square, 8) for square in range(64) if targets >> square & 1],
+            "result": RESULTS[promotion] if KINDS[kind] == "result" else None,
+            "time": ms
+        }
+        
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+    
+    def _append(self, kind, player, from_square=None, to_square=None, promotion=0, san="", targets=0):
+        """Pack one record onto the log and stream it to disk."""
+        ms = min(int((time.monotonic() - self.started) * 1000), 0xFFFFFFFF)
+        data = RECORD.pack(KINDS.index(kind), PLAYERS.index(player), _square_index(from_square),
+                           _square_index(to_square), promotion, san.encode("ascii"), targets, ms)
+        self.log.frombytes(data)
+        self._write(data)
+        
+    def add_move(self, player, from_square, to_square, promotion="", san=""):
+        """Log a board move; san is its Standard Algebraic Notation for PGN export."""
+        self._append("move", player, from_square, to_square, PROMOTIONS.index(promotion), san)
+        
+    def add_powerup(self, player, powerup_key, squares=(), shooter=None):
+        """Log a powerup with the squares it was aimed at (and the gun's shooter)."""
+        targets = 0
+        for row, col in squares:
+            targets |= 1 << (row * 8 + col)
+        self._append(powerup_key, player, shooter, targets=targets)
+        
+    def finish(self, winner):
+        """Log the result: winner is "white", "black" or None for a draw."""
+        result = {"white": 0, "black": 1, None: 2}[winner]
+        self._append("result", winner or "white", promotion=result)
+        
+    def truncate(self, count):
+        """Drop every record after the first count (e.g. to take a move back)."""
+        del self.log[count * RECORD.size:]
+        if self.file:
+            self.file.truncate(self.header_size + len(self.log))
+            self.file.seek(0, os.SEEK_END)
+    
+    def result(self):
+        """PGN result string of the game, "*" while it is still in progress."""
+        if len(self) and self[-1]["kind"] == "result":
+            return self[-1]["result"]
+        return "*"
+        
+    def _header(self):
+        header = json.dumps({"fen": self.fen, "tags": self.tags}).encode()
+        return FILE_MAGIC + HEADER_LENGTH.pack(len(header)) + header
+        
+    def _write(self, data):
+        """Append to the game's .rec file, creating it on the first record."""
+        if self.records_dir is None:
+            return
+        try:
+            if self.file is None:
+                os.makedirs(self.records_dir, exist_ok=True)
+                self.path = os.path.join(self.records_dir, time.strftime("game_%Y%m%d_%H%M%S.rec"))
+                self.file = open(self.path, "wb")
+                header = self._header()
+                self.header_size = len(header)
+                self.file.write(header)
+                self.file.write(self.log[:-len(data)].tobytes())  # Anything logged before the file opened
+            self.file.write(data)
+            self.file.flush()
+        except Exception as e:
+            print(f"Error writing game record: {e}")
+            self.records_dir = None
+    
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+    
+    @staticmethod
+    def load(path):
+        """Read a .rec file back, ignoring a partly written last record."""
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != FILE_MAGIC:
+            raise ValueError(f"{path} is not a game record")
+        header_length, = HEADER_LENGTH.unpack_from(data, 4)
+        start = 4 + HEADER_LENGTH.size
+        header = json.loads(data[start:start + header_length])
+        records = data[start + header_length:]
+        
+        record = GameRecord(records_dir=None)
+        record.fen = header["fen"]
+        record.tags = header["tags"]
+        record.log.frombytes(records[:len(records) - len(records) % RECORD.size])
+        return record
+        
+    def pgn_lines(self):
+        """Yield the game as PGN, one line at a time.
+        
+        Powerups have no PGN notation, so each one becomes a comment holding
+        a [%powerup player kind squares] command, e.g. {[%powerup black
+        gun c7 e5]}, with the number of powerups in a custom Powerups tag.
+        """
+        tags = dict(self.tags)
+        tags["Result"] = self.result()
+        tags["Powerups"] = str(sum(1 for entry in self if entry["kind"] not in ("move", "result")))
+        if self.fen != START_FEN:
+            tags["SetUp"] = "1"
+            tags["FEN"] = self.fen
+        for name in SEVEN_TAG_ROSTER + [name for name in tags if name not in SEVEN_TAG_ROSTER]:
+            value = tags.get(name, "?").replace("\\", "\\\\").replace('"', '\\"')
+            yield f'[{name} "{value}"]'
+        yield ""
+        
+        fields = self.fen.split()
+        move_number = int(fields[5]) if len(fields) > 5 else 1
+        black_to_move = len(fields) > 1 and fields[1] == "b"
+        numbered = False  # Whether the current move number has been written
+        line = ""
+        tokens = []
+        for entry in self:
+            if entry["kind"] == "move":
+                if not black_to_move:
+                    tokens.append(f"{move_number}.")
+                elif not numbered:
+                    tokens.append(f"{move_number}...")
+                tokens.append(entry["san"])
+                numbered = not black_to_move
+                if black_to_move:
+                    move_number += 1
+                black_to_move = not black_to_move
+            elif entry["kind"] != "result":
+                squares = [square_name(*entry["from"])] if entry["from"] else []
+                squares += [square_name(*square) for square in entry["targets"]]
+                tokens.append("{[%powerup " + " ".join([entry["player"], entry["kind"]] + squares) + "]}")
+                numbered = False  # A comment interrupts the move pair
+        tokens.append(tags["Result"])
+        
+        for token in tokens:
+            if line and len(line) + 1 + len(token) > PGN_LINE_WIDTH:
+                yield line
+                line = token
+            else:
+                line = f"{line} {token}" if line else token
+        yield line
+        
+    def to_pgn(self):
+        return "\n".join(self.pgn_lines()) + "\n"
+        
+    def save_pgn(self, path):
+        """Write the game to a PGN file a line at a time."""
+        with open(path, "w") as f:
+            for line in self.pgn_lines():
+                f.write(line + "\n")
@@ -5,24 +5,40 @@ Graphics and Rendering Functions - Enhanced with Mode Selection and Story UI
 import pygame
 import pygame.gfxdraw
 import math
-import random
+from rng import cosmetic_rng
 import config
+from profiler import profiler
+from framepacing import pacer
 from animated_dialogue import AnimatedDialogueBox
+from hud_layer import HudLayer
+from transform_cache import transform_cache, FINE_ROTATION_STEPS
+from text_cache import text_cache
+
+PARALLAX_FILL = (20, 20, 30)
+FAR_LAYER_SPEED = 0.3  # Layers this slow move under 0.1 px a frame and share one cached strip
+PARALLAX_EFFECT_LAYERS = (4, 5, 6, 7)  # Layers the fire and falling pieces are drawn in front of
+
+# Visual-only randomness (particles, backgrounds)
+_rng = cosmetic_rng("graphics")
 
 class Renderer:
     def __init__(self, screen, assets):
         self.screen = screen
         self.assets = assets
         self.parallax_offset = 0
-        self.scale = 1.0
+        self.background_scrolled = False  # Set when the parallax moves, cleared by the frame pacing check
         self.allow_typewriter_additions = True  # Flag to control typewriter text additions
         
         # Try to load pixel fonts
         self.pixel_fonts = self.load_pixel_fonts()
         
-        # Cache surfaces for better performance
+        # Cache surfaces for better performance (everything is drawn at the base resolution)
         self.board_surface_cache = None
-        self.board_cache_scale = None
+        self._scaled_pieces_cache = None
+        self._small_pieces_cache = None
+        self._promo_pieces_cache = None
+        self._hint_arrows_key = None  # (depth, lines) the cached hint arrows were drawn for
+        self._hint_arrows = None
         
         # Intro sequence state
         self.intro_start_time = None
@@ -53,22 +69,22 @@ class Renderer:
         # Animated dialogue box for story mode
         self.animated_dialogue_box = AnimatedDialogueBox(self)
         
+        # Game screen HUD, re-rendered only when what it shows changes
+        self.hud = HudLayer(self)
+        
         # Performance optimization: Cache frequently used surfaces
         self._cached_overlays = {}
-        self._cached_text_surfaces = {}
-        self._text_cache_max_size = 100
+        self._default_fonts = {}  # pygame's default font by size, for icons and fallbacks
         
         # Particle surface pool for performance
         self._particle_surface_pool = []
         self._max_pool_size = 50
         
-    def update_scale(self, scale):
-        """Update scale factor for fullscreen mode."""
-        self.scale = scale
-        self.pixel_fonts = self.load_pixel_fonts()
-        # Clear caches when scale changes
-        self._cached_overlays.clear()
-        self._cached_text_surfaces.clear()
+        # Parallax layers merged by speed, and the far layers' cached strip
+        self._parallax_bands = None
+        self._parallax_strip = None
+        self._parallax_strip_key = None
+        self._brightness_overlays = {}
         
     def _get_cached_overlay(self, width, height, color, alpha):
         """Get a cached overlay surface to avoid recreating it every frame."""
@@ -80,15 +96,20 @@ class Renderer:
         return self._cached_overlays[cache_key]
         
     def _get_cached_text(self, text, font_key, color):
-        """Get a cached text surface to avoid re-rendering every frame."""
-        cache_key = (text, font_key, color)
-        if cache_key not in self._cached_text_surfaces:
-            if len(self._cached_text_surfaces) > self._text_cache_max_size:
-                # Remove oldest cached text to prevent memory issues
-                self._cached_text_surfaces.pop(next(iter(self._cached_text_surfaces)))
-            font = self.pixel_fonts.get(font_key, self.pixel_fonts['medium'])
-            self._cached_text_surfaces[cache_key] = font.render(text, True, color)
-        return self._cached_text_surfaces[cache_key]
+        """Get a cached text surface to avoid re-rendering every frame (shared: don't modify it)."""
+        return text_cache.render(self.pixel_fonts.get(font_key, self.pixel_fonts['medium']), text, color)
+        
+    def _get_default_font(self, size):
+        """pygame's default font at size, loaded once."""
+        if size not in self._default_fonts:
+            self._default_fonts[size] = pygame.font.Font(None, size)
+        return self._default_fonts[size]
+        
+    def draw_text(self, text, font_key, color, pos, anchor="topleft", alpha=None, chars=None, surface=None):
+        """Draw cached text with its anchor at pos, optionally faded or cut to its first chars; returns its rect."""
+        font = self.pixel_fonts.get(font_key, self.pixel_fonts['medium'])
+        return text_cache.draw(self.screen if surface is None else surface, font, text, color, pos, anchor,
+                               alpha, chars)
         
     def _get_particle_surface(self, size):
         """Get a particle surface from the pool or create a new one."""
@@ -119,11 +140,11 @@ class Renderer:
         ]
         
         sizes = {
-            'tiny': int(12 * self.scale),
-            'small': int(14 * self.scale),
-            'medium': int(18 * self.scale),
-            'large': int(24 * self.scale),
-            'huge': int(36 * self.scale)
+            'tiny': 12,
+            'small': 14,
+            'medium': 18,
+            'large': 24,
+            'huge': 36
         }
         
         for font_name in pixel_font_names:
@@ -185,13 +206,9 @@ class Renderer:
         """Draw all active typewriter texts."""
         for text_data in self.typewriter_texts:
             if text_data['current_text']:
-                text_surface = self._get_cached_text(text_data['current_text'], text_data['font_key'], text_data['color'])
-                
-                if text_data['center']:
-                    text_rect = text_surface.get_rect(center=text_data['position'])
-                    self.screen.blit(text_surface, text_rect)
-                else:
-                    self.screen.blit(text_surface, text_data['position'])
+                # Reveal a prefix of the rendered full line, so each new character renders nothing
+                self.draw_text(text_data['full_text'], text_data['font_key'], text_data['color'], text_data['position'],
+                               "center" if text_data['center'] else "topleft", chars=text_data['char_index'])
                     
     def clear_typewriter_texts(self, preserve_ids=None):
         """Clear all typewriter texts.
@@ -227,13 +244,7 @@ class Renderer:
     def draw_text_typewriter(self, text, position, font_key='medium', color=config.WHITE, center=False, instant=False, text_id=None, speed=None):
         """Draw text with typewriter effect (immediate version for single frame)."""
         if instant:
-            font = self.pixel_fonts[font_key]
-            text_surface = font.render(text, True, color)
-            if center:
-                text_rect = text_surface.get_rect(center=position)
-                self.screen.blit(text_surface, text_rect)
-            else:
-                self.screen.blit(text_surface, position)
+            self.draw_text(text, font_key, color, position, "center" if center else "topleft")
         else:
             # Only add typewriter texts if allowed (not during fade transitions)
             if not self.allow_typewriter_additions:
@@ -266,15 +277,15 @@ class Renderer:
             # Start with just 1 jet, spawn the other later
             self._jets.append({
                 'x': -200,
-                'y': random.randint(150, 250),
-                'speed': random.uniform(6, 8),
+                'y': _rng.randint(150, 250),
+                'speed': _rng.uniform(6, 8),
                 'shooting': False,
                 'shoot_timer': 0,
                 'team': 0,
                 'frame': 0,
                 'frame_timer': 0,
                 'tilt': 0,
-                'target_y': random.randint(150, 250),
+                'target_y': _rng.randint(150, 250),
                 'vy': 0,
                 'evasion_timer': 0,
                 'pursuit_mode': False,
@@ -291,15 +302,15 @@ class Renderer:
                 # Spawn opponent jet
                 self._jets.append({
                     'x': config.WIDTH + 200,
-                    'y': random.randint(150, 250),
-                    'speed': random.uniform(-8, -6),
+                    'y': _rng.randint(150, 250),
+                    'speed': _rng.uniform(-8, -6),
                     'shooting': False,
                     'shoot_timer': 0,
                     'team': 1,
                     'frame': 0,
                     'frame_timer': 0,
                     'tilt': 0,
-                    'target_y': random.randint(150, 250),
+                    'target_y': _rng.randint(150, 250),
                     'vy': 0,
                     'evasion_timer': 0,
                     'pursuit_mode': False,
@@ -343,17 +354,17 @@ class Renderer:
                     if distance < 400:
                         jet['pursuit_mode'] = True
                         # Track enemy altitude
-                        jet['target_y'] = enemy_jet['y'] + random.uniform(-20, 20)
+                        jet['target_y'] = enemy_jet['y'] + _rng.uniform(-20, 20)
                         
                         # Shoot if aligned (reduced frequency)
-                        if abs(dy) < 40 and jet['shoot_timer'] > 60 and random.random() < 0.7:  # 70% chance even when aligned
+                        if abs(dy) < 40 and jet['shoot_timer'] > 60 and _rng.random() < 0.7:  # 70% chance even when aligned
                             # Fire burst at enemy
                             for _ in range(2):  # Reduced from 3 to 2 bullets
                                 self._projectiles.append({
                                     'x': jet['x'],
                                     'y': jet['y'],
                                     'vx': jet['speed'] * 3,
-                                    'vy': dy * 0.1 + random.uniform(-1, 1),
+                                    'vy': dy * 0.1 + _rng.uniform(-1, 1),
                                     'team': jet['team']
                                 })
                             jet['shoot_timer'] = 0
@@ -361,13 +372,13 @@ class Renderer:
                     jet['pursuit_mode'] = False
                 
                 # Evasive maneuvers if being pursued
-                if jet['evasion_timer'] <= 0 and random.random() < 0.02:
-                    jet['target_y'] = random.randint(100, 300)
+                if jet['evasion_timer'] <= 0 and _rng.random() < 0.02:
+                    jet['target_y'] = _rng.randint(100, 300)
                     jet['evasion_timer'] = 60
             
             # Default movement if not pursuing
-            if not jet['pursuit_mode'] and random.random() < 0.01:
-                jet['target_y'] = random.randint(100, 300)
+            if not jet['pursuit_mode'] and _rng.random() < 0.01:
+                jet['target_y'] = _rng.randint(100, 300)
             
             # Calculate vertical velocity towards target with smoother acceleration
             y_diff = jet['target_y'] - jet['y']
@@ -391,22 +402,22 @@ class Renderer:
             # Wrap around screen
             if jet['speed'] > 0 and jet['x'] > config.WIDTH + 200:
                 jet['x'] = -200
-                jet['y'] = random.randint(150, 250)
+                jet['y'] = _rng.randint(150, 250)
                 jet['target_y'] = jet['y']
             elif jet['speed'] < 0 and jet['x'] < -200:
                 jet['x'] = config.WIDTH + 200
-                jet['y'] = random.randint(150, 250)
+                jet['y'] = _rng.randint(150, 250)
                 jet['target_y'] = jet['y']
             
             # Randomly shoot
-            if jet['shoot_timer'] > 40 and random.random() < 0.03:
+            if jet['shoot_timer'] > 40 and _rng.random() < 0.03:
                 # Create multiple bullets for machine gun effect
                 for _ in range(2):
                     self._projectiles.append({
                         'x': jet['x'],
                         'y': jet['y'],
-                        'vx': jet['speed'] * 3 + random.uniform(-1, 1),
-                        'vy': random.uniform(-0.5, 0.5),
+                        'vx': jet['speed'] * 3 + _rng.uniform(-1, 1),
+                        'vy': _rng.uniform(-0.5, 0.5),
                         'team': jet['team']
                     })
                 jet['shoot_timer'] = 0
@@ -421,26 +432,13 @@ class Renderer:
                 jet_scale = 0.15  # Much smaller jets
                 scaled_width = int(jet_image.get_width() * jet_scale)
                 scaled_height = int(jet_image.get_height() * jet_scale)
-                scaled_jet = pygame.transform.scale(jet_image, (scaled_width, scaled_height))
-                
-                # Flip image based on direction (jets face LEFT by default in the image)
-                if jet['speed'] > 0:
-                    # Going right - need to flip
-                    scaled_jet = pygame.transform.flip(scaled_jet, True, False)
-                    # Apply rotation for right-facing jets
-                    scaled_jet = pygame.transform.rotate(scaled_jet, jet['tilt'])
-                else:
-                    # Going left - no flip needed
-                    # Apply rotation for left-facing jets
-                    scaled_jet = pygame.transform.rotate(scaled_jet, jet['tilt'])
-                
-                # Don't apply color tint - just use original jet colors
-                # Set slight transparency
-                scaled_jet.set_alpha(200)
+                # Jets face LEFT in the image, so flip the ones going right; keep the original
+                # colors at slight transparency
+                jet_stack = transform_cache.stack(jet_image, (scaled_width, scaled_height), flip_x=jet['speed'] > 0,
+                                                  steps=FINE_ROTATION_STEPS)
                 
                 # Draw the jet
-                jet_rect = scaled_jet.get_rect(center=(int(jet['x']), int(jet['y'])))
-                self.screen.blit(scaled_jet, jet_rect)
+                jet_stack.blit(self.screen, (int(jet['x']), int(jet['y'])), jet['tilt'], alpha=200)
                 
                 # Engine trail effect
                 direction = 1 if jet['speed'] > 0 else -1
@@ -487,11 +485,11 @@ class Renderer:
                             self._explosions[-1]['particles'].append({
                                 'x': jet['x'],
                                 'y': jet['y'],
-                                'vx': random.uniform(-8, 8),
-                                'vy': random.uniform(-8, 8),
-                                'size': random.uniform(2, 5),
-                                'life': random.randint(20, 40),
-                                'color_index': random.randint(0, 2)  # Different colors for variety
+                                'vx': _rng.uniform(-8, 8),
+                                'vy': _rng.uniform(-8, 8),
+                                'size': _rng.uniform(2, 5),
+                                'life': _rng.randint(20, 40),
+                                'color_index': _rng.randint(0, 2)  # Different colors for variety
                             })
                         # Mark jet for respawn
                         if jet_idx not in jets_to_remove:
@@ -507,7 +505,7 @@ class Renderer:
                 jet['x'] = -800  # Far off screen
             else:
                 jet['x'] = config.WIDTH + 800  # Far off screen
-            jet['y'] = random.randint(150, 250)
+            jet['y'] = _rng.randint(150, 250)
             jet['target_y'] = jet['y']
             jet['respawn_delay'] = 480  # 8 second respawn delay after destruction
         
@@ -625,14 +623,14 @@ class Renderer:
             glow_alpha = 20 - i * 4
             glow_color = (100, 150, 255)
             glow_surf = pygame.Surface((800, 100), pygame.SRCALPHA)
-            glow_text = self.pixel_fonts['huge'].render(title_text, True, (*glow_color, glow_alpha))
+            glow_text = self._get_cached_text(title_text, 'huge', (*glow_color, glow_alpha))
             glow_rect = glow_text.get_rect(center=(400, 50))
             glow_surf.blit(glow_text, glow_rect.move(0, i))
             title_surf_rect = glow_surf.get_rect(center=(config.WIDTH // 2, title_y))
             self.screen.blit(glow_surf, title_surf_rect)
         
         # Main title with gradient effect
-        title_surface = self.pixel_fonts['huge'].render(title_text, True, (255, 255, 255))
+        title_surface = self._get_cached_text(title_text, 'huge', (255, 255, 255))
         title_rect = title_surface.get_rect(center=(config.WIDTH // 2, title_y))
         self.screen.blit(title_surface, title_rect)
         
@@ -737,7 +735,7 @@ class Renderer:
             icon_y = animated_rect.y + 70
             icon_font_size = 72 if is_hover else 64
             try:
-                icon_font = pygame.font.Font(None, icon_font_size)
+                icon_font = self._get_default_font(icon_font_size)
             except:
                 icon_font = self.pixel_fonts['huge']
             
@@ -745,27 +743,23 @@ class Renderer:
             if is_hover:
                 for layer in range(3, 0, -1):
                     glow_alpha = 40 - layer * 10
-                    icon_glow = icon_font.render(mode['icon'], True, mode['glow_color'])
-                    icon_glow.set_alpha(glow_alpha)
                     for dx, dy in [(0, layer), (0, -layer), (layer, 0), (-layer, 0)]:
-                        glow_rect = icon_glow.get_rect(center=(animated_rect.centerx + dx, icon_y + dy))
-                        self.screen.blit(icon_glow, glow_rect)
+                        text_cache.draw(self.screen, icon_font, mode['icon'], mode['glow_color'],
+                                        (animated_rect.centerx + dx, icon_y + dy), "center", glow_alpha)
             
             # Main icon
-            icon_text = icon_font.render(mode['icon'], True, (255, 255, 255))
-            icon_rect = icon_text.get_rect(center=(animated_rect.centerx, icon_y))
-            self.screen.blit(icon_text, icon_rect)
+            text_cache.draw(self.screen, icon_font, mode['icon'], (255, 255, 255), (animated_rect.centerx, icon_y), "center")
             
             # Mode name with glow
             name_y = animated_rect.y + 140
             name_color = mode['glow_color'] if is_hover else (255, 255, 255)
-            name_text = self.pixel_fonts['large'].render(mode['name'], True, name_color)
+            name_text = self._get_cached_text(mode['name'], 'large', name_color)
             name_rect = name_text.get_rect(center=(animated_rect.centerx, name_y))
             self.screen.blit(name_text, name_rect)
             
             # Subtitle
             subtitle_y = name_y + 30
-            subtitle_text = self.pixel_fonts['small'].render(mode['subtitle'], True, (180, 180, 180))
+            subtitle_text = self._get_cached_text(mode['subtitle'], 'small', (180, 180, 180))
             subtitle_rect = subtitle_text.get_rect(center=(animated_rect.centerx, subtitle_y))
             self.screen.blit(subtitle_text, subtitle_rect)
             
@@ -780,7 +774,7 @@ class Renderer:
             feature_y = divider_y + 35
             for feature in mode['desc']:
                 feature_color = (220, 220, 220) if is_hover else (200, 200, 200)
-                feature_text = self.pixel_fonts['small'].render(feature, True, feature_color)
+                feature_text = self._get_cached_text(feature, 'small', feature_color)
                 feature_rect = feature_text.get_rect(center=(animated_rect.centerx, feature_y))
                 self.screen.blit(feature_text, feature_rect)
                 feature_y += 30
@@ -814,7 +808,7 @@ class Renderer:
                 
                 # Badge text with stars
                 badge_text = "★ RECOMMENDED ★"
-                text_surf = self.pixel_fonts['small'].render(badge_text, True, (50, 50, 50))
+                text_surf = self._get_cached_text(badge_text, 'small', (50, 50, 50))
                 text_rect = text_surf.get_rect(center=(animated_rect.centerx, badge_y))
                 self.screen.blit(text_surf, text_rect)
                 
@@ -833,20 +827,20 @@ class Renderer:
         self._draw_walking_capybaras()
         
         # Title
-        title = self.pixel_fonts['huge'].render("STORY MODE", True, config.WHITE)
+        title = self._get_cached_text("STORY MODE", 'huge', config.WHITE)
         title_rect = title.get_rect(center=(config.WIDTH // 2, 50))
         self.screen.blit(title, title_rect)
         
         # Overall progress
         total_progress = story_mode.get_total_progress()
         progress_text = f"Campaign Progress: {total_progress}%"
-        progress_surface = self.pixel_fonts['medium'].render(progress_text, True, (220, 190, 130))
+        progress_surface = self._get_cached_text(progress_text, 'medium', (220, 190, 130))
         progress_rect = progress_surface.get_rect(center=(config.WIDTH // 2, 100))
         self.screen.blit(progress_surface, progress_rect)
         
         # Display player money - use in-memory value
         money_text = f"Money: ${config.get_money()}"
-        money_surface = self.pixel_fonts['medium'].render(money_text, True, (180, 220, 180))
+        money_surface = self._get_cached_text(money_text, 'medium', (180, 220, 180))
         money_rect = money_surface.get_rect(center=(config.WIDTH // 2, 130))
         self.screen.blit(money_surface, money_rect)
         
@@ -891,7 +885,7 @@ class Renderer:
             # Chapter number and title
             chapter_text = f"Chapter {i + 1}: {chapter['title']}"
             text_color = config.WHITE if is_unlocked else (100, 100, 100)
-            text_surface = self.pixel_fonts['large'].render(chapter_text, True, text_color)
+            text_surface = self._get_cached_text(chapter_text, 'large', text_color)
             text_rect = text_surface.get_rect(midleft=(button_x + 20, button_rect.centery - 10))
             self.screen.blit(text_surface, text_rect)
             
@@ -916,14 +910,14 @@ class Renderer:
                                
             # Progress text
             progress_text = f"{progress}%"
-            prog_surface = self.pixel_fonts['tiny'].render(progress_text, True, (200, 200, 200))
+            prog_surface = self._get_cached_text(progress_text, 'tiny', (200, 200, 200))
             prog_rect = prog_surface.get_rect(center=(bar_x + bar_width // 2, bar_y + bar_height + 15))
             self.screen.blit(prog_surface, prog_rect)
             
             # Lock icon if locked
             if not is_unlocked:
                 lock_text = "LOCKED"
-                lock_surface = self.pixel_fonts['medium'].render(lock_text, True, (200, 50, 50))
+                lock_surface = self._get_cached_text(lock_text, 'medium', (200, 50, 50))
                 # Position on the right side, below the chapter title to avoid overlap
                 lock_rect = lock_surface.get_rect(center=(bar_x - 80, button_rect.centery + 15))
                 self.screen.blit(lock_surface, lock_rect)
@@ -945,7 +939,7 @@ class Renderer:
         self._draw_walking_capybaras()
         
         # Chapter title
-        title = self.pixel_fonts['huge'].render(chapter["title"], True, config.WHITE)
+        title = self._get_cached_text(chapter["title"], 'huge', config.WHITE)
         title_rect = title.get_rect(center=(config.WIDTH // 2, 50))
         self.screen.blit(title, title_rect)
         
@@ -953,7 +947,7 @@ class Renderer:
         intro_y = 100
         for line in chapter.get("intro", []):
             if line:
-                line_surface = self.pixel_fonts['small'].render(line, True, (200, 200, 200))
+                line_surface = self._get_cached_text(line, 'small', (200, 200, 200))
                 line_rect = line_surface.get_rect(center=(config.WIDTH // 2, intro_y))
                 self.screen.blit(line_surface, line_rect)
             intro_y += 25
@@ -1001,8 +995,8 @@ class Renderer:
                 if self.assets.bot_image:
                     # Scale bot image to fit card portrait area
                     mini_bot_size = 80
-                    bot_scaled = pygame.transform.smoothscale(self.assets.bot_image, 
-                                                            (mini_bot_size, mini_bot_size))
+                    bot_scaled = transform_cache.scale(self.assets.bot_image, (mini_bot_size, mini_bot_size),
+                                                       smooth=True)
                     bot_rect = bot_scaled.get_rect(center=(card_x + 60, card_rect.centery))
                     self.screen.blit(bot_scaled, bot_rect)
                 else:
@@ -1042,37 +1036,37 @@ class Renderer:
                 if self.assets.mills_image:
                     # Scale mills image to fit card portrait area
                     mini_mills_size = 80
-                    mills_scaled = pygame.transform.smoothscale(self.assets.mills_image, 
-                                                              (mini_mills_size, mini_mills_size))
+                    mills_scaled = transform_cache.scale(self.assets.mills_image, (mini_mills_size, mini_mills_size),
+                                                         smooth=True)
                     mills_rect = mills_scaled.get_rect(center=(card_x + 60, card_rect.centery))
                     self.screen.blit(mills_scaled, mills_rect)
                 else:
                     # Fallback to text if image not loaded
-                    portrait_surface = self.pixel_fonts['huge'].render(portrait_text, True, config.WHITE)
+                    portrait_surface = self._get_cached_text(portrait_text, 'huge', config.WHITE)
                     portrait_rect = portrait_surface.get_rect(center=(card_x + 60, card_rect.centery))
                     self.screen.blit(portrait_surface, portrait_rect)
             else:
                 # Regular portrait
-                portrait_surface = self.pixel_fonts['huge'].render(portrait_text, True, config.WHITE)
+                portrait_surface = self._get_cached_text(portrait_text, 'huge', config.WHITE)
                 portrait_rect = portrait_surface.get_rect(center=(card_x + 60, card_rect.centery))
                 self.screen.blit(portrait_surface, portrait_rect)
             
             # Battle name
             name_text = battle["opponent"]
-            name_surface = self.pixel_fonts['large'].render(name_text, True, config.WHITE)
+            name_surface = self._get_cached_text(name_text, 'large', config.WHITE)
             name_rect = name_surface.get_rect(midleft=(card_x + 100, card_rect.centery - 20))
             self.screen.blit(name_surface, name_rect)
             
             # Difficulty
             diff_text = f"Difficulty: {battle['difficulty'].upper()}"
             diff_color = config.AI_DIFFICULTY_COLORS.get(battle['difficulty'], (200, 200, 200))
-            diff_surface = self.pixel_fonts['small'].render(diff_text, True, diff_color)
+            diff_surface = self._get_cached_text(diff_text, 'small', diff_color)
             diff_rect = diff_surface.get_rect(midleft=(card_x + 100, card_rect.centery + 10))
             self.screen.blit(diff_surface, diff_rect)
             
             # Reward
             reward_text = f"Reward: ${battle.get('reward_money', 0)}"
-            reward_surface = self.pixel_fonts['small'].render(reward_text, True, (220, 190, 130))
+            reward_surface = self._get_cached_text(reward_text, 'small', (220, 190, 130))
             reward_rect = reward_surface.get_rect(midleft=(card_x + 100, card_rect.centery + 30))
             self.screen.blit(reward_surface, reward_rect)
             
@@ -1080,7 +1074,7 @@ class Renderer:
             if not is_unlocked:
                 # Draw lock icon
                 lock_text = "🔒 LOCKED"
-                lock_surface = self.pixel_fonts['medium'].render(lock_text, True, (150, 150, 150))
+                lock_surface = self._get_cached_text(lock_text, 'medium', (150, 150, 150))
                 lock_rect = lock_surface.get_rect(midright=(card_x + card_width - 20, card_rect.centery))
                 self.screen.blit(lock_surface, lock_rect)
                 
@@ -1089,12 +1083,12 @@ class Renderer:
                     req_text = "Complete previous chapter"
                 else:
                     req_text = "Complete previous battle"
-                req_surface = self.pixel_fonts['tiny'].render(req_text, True, (100, 100, 100))
+                req_surface = self._get_cached_text(req_text, 'tiny', (100, 100, 100))
                 req_rect = req_surface.get_rect(midright=(card_x + card_width - 20, card_rect.centery + 20))
                 self.screen.blit(req_surface, req_rect)
             elif is_completed:
                 complete_text = "✓ COMPLETE"
-                complete_surface = self.pixel_fonts['medium'].render(complete_text, True, (100, 255, 100))
+                complete_surface = self._get_cached_text(complete_text, 'medium', (100, 255, 100))
                 complete_rect = complete_surface.get_rect(midright=(card_x + card_width - 20, card_rect.centery))
                 self.screen.blit(complete_surface, complete_rect)
                 
@@ -1153,8 +1147,8 @@ class Renderer:
             # Use bot.png image if available, otherwise fall back to drawn robot
             if self.assets.bot_image:
                 # Scale bot image to fit portrait area
-                bot_scaled = pygame.transform.smoothscale(self.assets.bot_image, 
-                                                         (portrait_size - 20, portrait_size - 20))
+                bot_scaled = transform_cache.scale(self.assets.bot_image, (portrait_size - 20, portrait_size - 20),
+                                                   smooth=True)
                 bot_rect = bot_scaled.get_rect(center=(portrait_x + portrait_size // 2, 
                                                       portrait_y + portrait_size // 2))
                 self.screen.blit(bot_scaled, bot_rect)
@@ -1212,19 +1206,19 @@ class Renderer:
             # Use mills.png image if available
             if self.assets.mills_image:
                 # Scale mills image to fit portrait area
-                mills_scaled = pygame.transform.smoothscale(self.assets.mills_image, 
-                                                           (portrait_size - 20, portrait_size - 20))
+                mills_scaled = transform_cache.scale(self.assets.mills_image, (portrait_size - 20, portrait_size - 20),
+                                                     smooth=True)
                 mills_rect = mills_scaled.get_rect(center=(portrait_x + portrait_size // 2, 
                                                          portrait_y + portrait_size // 2))
                 self.screen.blit(mills_scaled, mills_rect)
             else:
                 # Fallback to text if image not loaded
-                portrait_surface = pygame.font.Font(None, 120).render(portrait_text, True, config.WHITE)
+                portrait_surface = text_cache.render(self._get_default_font(120), portrait_text, config.WHITE)
                 portrait_rect = portrait_surface.get_rect(center=(portrait_x + portrait_size // 2, portrait_y + portrait_size // 2))
                 self.screen.blit(portrait_surface, portrait_rect)
         else:
             # Regular emoji/text portrait
-            portrait_surface = pygame.font.Font(None, 120).render(portrait_text, True, config.WHITE)
+            portrait_surface = text_cache.render(self._get_default_font(120), portrait_text, config.WHITE)
             portrait_rect = portrait_surface.get_rect(center=(portrait_x + portrait_size // 2, portrait_y + portrait_size // 2))
             self.screen.blit(portrait_surface, portrait_rect)
         
@@ -1262,15 +1256,13 @@ class Renderer:
                          [(name_x + name_width - bracket_size, name_y + 20), (name_x + name_width, name_y + 20), (name_x + name_width, name_y + 20 - bracket_size)], 2)
         
         # Character name with glow
-        name_surface = self.pixel_fonts['large'].render(name_text, True, (255, 255, 255))
+        name_surface = self._get_cached_text(name_text, 'large', (255, 255, 255))
         name_rect = name_surface.get_rect(center=(config.WIDTH // 2, name_y))
         
         # Draw glow behind text
-        glow_surf = self.pixel_fonts['large'].render(name_text, True, (0, 255, 255))
         for offset in [(0, -2), (0, 2), (-2, 0), (2, 0)]:
-            glow_rect = glow_surf.get_rect(center=(config.WIDTH // 2 + offset[0], name_y + offset[1]))
-            glow_surf.set_alpha(100)
-            self.screen.blit(glow_surf, glow_rect)
+            self.draw_text(name_text, 'large', (0, 255, 255), (config.WIDTH // 2 + offset[0], name_y + offset[1]),
+                           "center", 100)
         
         self.screen.blit(name_surface, name_rect)
         
@@ -1310,7 +1302,7 @@ class Renderer:
             inst_text = "Click to continue..."
             inst_color = (200, 200, 200)
             
-        inst_surface = self.pixel_fonts['small'].render(inst_text, True, inst_color)
+        inst_surface = self._get_cached_text(inst_text, 'small', inst_color)
         inst_rect = inst_surface.get_rect(center=(config.WIDTH // 2, config.HEIGHT - 50))
         self.screen.blit(inst_surface, inst_rect)
         
@@ -1335,8 +1327,7 @@ class Renderer:
         
         for word in words:
             test_line = ' '.join(current_line + [word])
-            test_surface = font.render(test_line, True, config.WHITE)
-            if test_surface.get_width() > max_width:
+            if font.size(test_line)[0] > max_width:
                 if current_line:
                     lines.append(' '.join(current_line))
                     current_line = [word]
@@ -1379,7 +1370,7 @@ class Renderer:
         
         # Text with better contrast
         text_color = (255, 255, 255) if is_hover else (230, 230, 230)
-        text_surface = self.pixel_fonts['medium'].render(text, True, text_color)
+        text_surface = self._get_cached_text(text, 'medium', text_color)
         text_rect = text_surface.get_rect(center=rect.center)
         self.screen.blit(text_surface, text_rect)
         
@@ -1403,100 +1394,134 @@ class Renderer:
         pygame.draw.rect(button_surface, border_color_with_alpha, (0, 0, rect.width, rect.height), 3, border_radius=10)
         
         # Draw text
-        text_surface = self.pixel_fonts['medium'].render(text, True, config.WHITE)
-        text_surface.set_alpha(alpha)
-        text_rect = text_surface.get_rect(center=(rect.width // 2, rect.height // 2))
-        button_surface.blit(text_surface, text_rect)
+        self.draw_text(text, 'medium', config.WHITE, (rect.width // 2, rect.height // 2), "center", alpha,
+                       surface=button_surface)
         
         # Blit the button surface to screen
         self.screen.blit(button_surface, rect)
         
+    def _get_parallax_bands(self):
+        """Parallax layers, with neighbours of equal speed merged into one image."""
+        if self._parallax_bands is not None:
+            return self._parallax_bands
+            
+        bands = []
+        for i, layer in enumerate(self.assets.parallax_layers):
+            image = layer.get("image")
+            if not image:
+                continue
+            width = layer.get("width", image.get_width())
+            
+            # Merge into the band behind unless an effect is drawn between them
+            previous = bands[-1] if bands else None
+            if (previous and previous["speed"] == layer["speed"] and previous["width"] == width
+                    and i not in PARALLAX_EFFECT_LAYERS):
+                if not previous["merged"]:
+                    previous["image"] = previous["image"].copy()
+                    previous["merged"] = True
+                previous["image"].blit(image, (0, 0))
+                continue
+            bands.append({"image": image, "speed": layer["speed"], "width": width, "index": i, "merged": False})
+            
+        self._parallax_bands = bands
+        self._parallax_strip_key = None
+        return bands
+        
+    def _blit_parallax_band(self, target, band, x):
+        while x < config.WIDTH:
+            target.blit(band["image"], (x, 0))
+            x += band["width"]
+            
+    def _parallax_x(self, band):
+        return int(-(self.parallax_offset * band["speed"] % band["width"]))
+        
+    def _draw_parallax_bands(self, target, bands, on_layer=None):
+        """Draw the bands back to front: the slow ones from one cached strip, the rest tile by tile.
+        
+        on_layer(index) is called before each band drawn individually, for effects between layers.
+        """
+        far = 0
+        while far < len(bands) and bands[far]["speed"] <= FAR_LAYER_SPEED:
+            if on_layer and bands[far]["index"] >= PARALLAX_EFFECT_LAYERS[0]:
+                break
+            far += 1
+            
+        if far:
+            # Re-composite only when a far band has moved a whole pixel
+            positions = tuple(self._parallax_x(band) for band in bands[:far])
+            if self._parallax_strip is None:
+                self._parallax_strip = pygame.Surface((config.WIDTH, config.HEIGHT))
+            if positions != self._parallax_strip_key:
+                self._parallax_strip.fill(PARALLAX_FILL)
+                for band, x in zip(bands, positions):
+                    self._blit_parallax_band(self._parallax_strip, band, x)
+                self._parallax_strip_key = positions
+            target.blit(self._parallax_strip, (0, 0))
+        else:
+            target.fill(PARALLAX_FILL)
+            
+        for band in bands[far:]:
+            if on_layer:
+                on_layer(band["index"])
+            self._blit_parallax_band(target, band, self._parallax_x(band))
+            
+    def _apply_brightness(self, target, brightness):
+        """Darken or lighten the whole target with a reused overlay."""
+        if brightness < 1.0:
+            color, alpha = config.BLACK, int((1.0 - brightness) * 255)
+        elif brightness > 1.0:
+            color, alpha = config.WHITE, int((brightness - 1.0) * 128)
+        else:
+            return
+        overlay = self._brightness_overlays.get(color)
+        if overlay is None:
+            overlay = pygame.Surface((config.WIDTH, config.HEIGHT))
+            overlay.fill(color)
+            self._brightness_overlays[color] = overlay
+        overlay.set_alpha(alpha)
+        target.blit(overlay, (0, 0))
+        
+    @profiler.timed("parallax")
     def draw_parallax_background(self, brightness=1.0, surface=None):
         """Draw scrolling background."""
         target = surface if surface else self.screen
-        target.fill((20, 20, 30))
         
         if not hasattr(self.assets, 'parallax_layers') or not self.assets.parallax_layers:
+            target.fill(PARALLAX_FILL)
             for y in range(0, config.HEIGHT, 10):
                 color_val = int(30 + (y / config.HEIGHT) * 20)
                 pygame.draw.rect(target, (color_val, color_val, color_val + 10), 
                                (0, y, config.WIDTH, 10))
             return
             
-        self.parallax_offset += 0.3
-        
-        layers_to_draw = self.assets.parallax_layers
-        if self.scale > 1.5 and len(self.assets.parallax_layers) > 6:
-            layers_to_draw = self.assets.parallax_layers[::2]
+        self.parallax_offset += 0.3 * pacer.frame_scale  # Same speed at any frame rate
+        self.background_scrolled = True
+        self._draw_parallax_bands(target, self._get_parallax_bands())
+        self._apply_brightness(target, brightness)
         
-        for i, layer in enumerate(layers_to_draw):
-            if not layer.get("image"):
-                continue
-                
-            offset = self.parallax_offset * layer["speed"]
-            
-            if self.scale != 1.0:
-                aspect = layer["image"].get_width() / layer["image"].get_height()
-                new_h = config.HEIGHT
-                new_w = int(new_h * aspect)
-                scaled_img = pygame.transform.scale(layer["image"], (new_w, new_h))
-                layer_width = new_w
-            else:
-                scaled_img = layer["image"]
-                layer_width = layer.get("width", layer["image"].get_width())
-            
-            x = -(offset % layer_width)
-            while x < config.WIDTH:
-                target.blit(scaled_img, (x, 0))
-                x += layer_width
-                
-        if brightness < 1.0:
-            overlay = pygame.Surface((config.WIDTH, config.HEIGHT))
-            overlay.fill(config.BLACK)
-            overlay.set_alpha(int((1.0 - brightness) * 255))
-            target.blit(overlay, (0, 0))
-        elif brightness > 1.0:
-            overlay = pygame.Surface((config.WIDTH, config.HEIGHT))
-            overlay.fill(config.WHITE)
-            overlay.set_alpha(int((brightness - 1.0) * 128))
-            target.blit(overlay, (0, 0))
-            
+    @profiler.timed("parallax")
     def draw_parallax_background_with_fire(self, brightness=1.0):
         """Draw scrolling background with fire integrated at appropriate depth."""
         self._fire_updated_this_frame = False
-        self.screen.fill((20, 20, 30))
         
         if not hasattr(self.assets, 'parallax_layers') or not self.assets.parallax_layers:
-            pass  # No parallax layers warning
+            self.screen.fill(PARALLAX_FILL)
             for y in range(0, config.HEIGHT, 10):
                 color_val = int(30 + (y / config.HEIGHT) * 20)
                 pygame.draw.rect(self.screen, (color_val, color_val, color_val + 10), 
                                (0, y, config.WIDTH, 10))
             
             if brightness < 1.0:
-                overlay = pygame.Surface((config.WIDTH, config.HEIGHT))
-                overlay.fill(config.BLACK)
-                overlay.set_alpha(int((1.0 - brightness) * 255))
-                self.screen.blit(overlay, (0, 0))
+                self._apply_brightness(self.screen, brightness)
             return
             
-        parallax_delta = self.parallax_offset - self.last_parallax_offset
         self.last_parallax_offset = self.parallax_offset
-        self.parallax_offset += 0.3
-        
-        layers_to_draw = self.assets.parallax_layers
-        if self.scale > 1.5 and len(self.assets.parallax_layers) > 6:
-            layers_to_draw = self.assets.parallax_layers[::2]
+        self.parallax_offset += 0.3 * pacer.frame_scale  # Same speed at any frame rate
+        self.background_scrolled = True
         
         current_time = pygame.time.get_ticks()
-        self._fire_updated_this_frame = False
         
-        layers_drawn = 0
-        for i, layer in enumerate(layers_to_draw):
-            if not layer.get("image"):
-                pass  # Layer has no image warning
-                continue
-            
+        def draw_effects(i):
             if i == 5:
                 self._draw_fire_at_depth(current_time, 0.5)
             elif i == 6:
@@ -1513,37 +1538,8 @@ class Renderer:
             elif i == 7 and self.chess_pieces_enabled:
                 self._draw_chess_pieces_at_layer(0.9)
                 
-            offset = self.parallax_offset * layer["speed"]
-            
-            if self.scale != 1.0:
-                aspect = layer["image"].get_width() / layer["image"].get_height()
-                new_h = config.HEIGHT
-                new_w = int(new_h * aspect)
-                scaled_img = pygame.transform.scale(layer["image"], (new_w, new_h))
-                layer_width = new_w
-            else:
-                scaled_img = layer["image"]
-                layer_width = layer.get("width", layer["image"].get_width())
-            
-            x = -(offset % layer_width)
-            positions_drawn = 0
-            while x < config.WIDTH:
-                self.screen.blit(scaled_img, (x, 0))
-                x += layer_width
-                positions_drawn += 1
-            layers_drawn += 1
-                
-        if brightness < 1.0:
-            overlay = pygame.Surface((config.WIDTH, config.HEIGHT))
-            overlay.fill(config.BLACK)
-            overlay.set_alpha(int((1.0 - brightness) * 255))
-            self.screen.blit(overlay, (0, 0))
-        elif brightness > 1.0:
-            overlay = pygame.Surface((config.WIDTH, config.HEIGHT))
-            overlay.fill(config.WHITE)
-            overlay.set_alpha(int((brightness - 1.0) * 128))
-            self.screen.blit(overlay, (0, 0))
-            
+        self._draw_parallax_bands(self.screen, self._get_parallax_bands(), on_layer=draw_effects)
+        self._apply_brightness(self.screen, brightness)
         self._fire_updated_this_frame = False
         
     def _draw_fire_at_depth(self, current_time, depth):
@@ -1579,16 +1575,16 @@ class Renderer:
                         
                     if zone_age > 3 and zone_age < 15 and zone['spawn_timer'] <= 0:
                         smoke_intensity = max(0, 1.0 - (zone_age - 10) / 5.0) if zone_age > 10 else 1.0
-                        if random.random() < 0.3 * smoke_intensity:
+                        if _rng.random() < 0.3 * smoke_intensity:
                             smoke_particle = {
-                                'x': zone['world_x'] - self.parallax_offset * depth + random.randint(-zone['width']//2, zone['width']//2),
-                                'y': zone['y'] + random.randint(-20, 0),
-                                'vx': random.uniform(-0.3, 0.3),
-                                'vy': random.uniform(-0.8, -0.3),
-                                'size': random.randint(15, 30),
+                                'x': zone['world_x'] - self.parallax_offset * depth + _rng.randint(-zone['width']//2, zone['width']//2),
+                                'y': zone['y'] + _rng.randint(-20, 0),
+                                'vx': _rng.uniform(-0.3, 0.3),
+                                'vy': _rng.uniform(-0.8, -0.3),
+                                'size': _rng.randint(15, 30),
                                 'life': 1.0,
                                 'depth': depth,
-                                'opacity': random.uniform(0.2, 0.4) * smoke_intensity
+                                'opacity': _rng.uniform(0.2, 0.4) * smoke_intensity
                             }
                             self.smoke_particles.append(smoke_particle)
                 
@@ -1596,18 +1592,18 @@ class Renderer:
                     num_particles = int(2 * zone['intensity'])
                     for _ in range(max(1, num_particles)):
                         particle = {
-                            'x': zone['world_x'] - self.parallax_offset * depth + random.randint(-zone['width']//3, zone['width']//3),
-                            'y': zone['y'] + random.randint(0, 10),
-                            'vx': random.uniform(-0.5, 0.5),
-                            'vy': random.uniform(-1.5, -0.5) * zone['intensity'],
-                            'size': random.randint(8, 20) * zone['intensity'],
+                            'x': zone['world_x'] - self.parallax_offset * depth + _rng.randint(-zone['width']//3, zone['width']//3),
+                            'y': zone['y'] + _rng.randint(0, 10),
+                            'vx': _rng.uniform(-0.5, 0.5),
+                            'vy': _rng.uniform(-1.5, -0.5) * zone['intensity'],
+                            'size': _rng.randint(8, 20) * zone['intensity'],
                             'life': zone['intensity'],
                             'depth': depth,
-                            'spike_height': random.uniform(0.5, 1.5),
-                            'flicker': random.uniform(0, 6.28)
+                            'spike_height': _rng.uniform(0.5, 1.5),
+                            'flicker': _rng.uniform(0, 6.28)
                         }
                         self.fire_particles.append(particle)
-                    zone['spawn_timer'] = random.randint(1, 3)
+                    zone['spawn_timer'] = _rng.randint(1, 3)
                 else:
                     zone['spawn_timer'] -= 1
         
@@ -1624,7 +1620,7 @@ class Renderer:
                 smoke['vy'] -= 0.02
                 smoke['life'] -= 0.008
                 smoke['size'] += 0.3
-                smoke['vx'] += random.uniform(-0.05, 0.05)
+                smoke['vx'] += _rng.uniform(-0.05, 0.05)
                 
                 if smoke['life'] <= 0 or smoke['y'] < -100:
                     smoke_to_remove.append(smoke)
@@ -1636,12 +1632,12 @@ class Renderer:
                         gray_value = int(50 + (1 - smoke['life']) * 100)
                         smoke_color = (gray_value, gray_value, gray_value)
                         alpha = int(smoke['life'] * smoke['opacity'] * 120)
-                        size = int(smoke['size'] * self.scale)
+                        size = int(smoke['size'])
                         
                         smoke_surf = self._get_particle_surface(size)
                         for i in range(2):
-                            offset_x = random.randint(-3, 3)
-                            offset_y = random.randint(-3, 3)
+                            offset_x = _rng.randint(-3, 3)
+                            offset_y = _rng.randint(-3, 3)
                             pygame.draw.circle(smoke_surf, (*smoke_color, alpha // 2), 
                                              (size + offset_x, size + offset_y), size)
                         fire_surface.blit(smoke_surf, (screen_x - size, screen_y - size))
@@ -1662,7 +1658,7 @@ class Renderer:
                 particle['flicker'] += 0.3
                 
                 flicker_offset = math.sin(particle['flicker']) * 2
-                particle['vx'] += random.uniform(-0.1, 0.1) + flicker_offset * 0.1
+                particle['vx'] += _rng.uniform(-0.1, 0.1) + flicker_offset * 0.1
                 
                 if particle['life'] <= 0 or particle['y'] < zone['y'] - 60:
                     particles_to_remove.append(particle)
@@ -1684,7 +1680,7 @@ class Renderer:
                         glow_color = (80, 20, 0)
                     
                     alpha = int(particle['life'] * 180)
-                    size = int(particle['size'] * self.scale)
+                    size = int(particle['size'])
                     
                     if 0 <= screen_x <= config.WIDTH and particle['life'] > 0.3:
                         flame_height = int(size * particle['spike_height'])
@@ -1734,16 +1730,10 @@ class Renderer:
                         piece_img = self.assets.pieces[piece_key]
                         
                         scale_factor = 0.3 + (piece['depth'] * 0.7)
-                        piece_size = int(50 * self.scale * scale_factor)
-                        scaled_piece = pygame.transform.scale(piece_img, (piece_size, piece_size))
-                        
-                        rotated_piece = pygame.transform.rotate(scaled_piece, piece['rotation'])
-                        
+                        piece_size = int(50 * scale_factor)
                         alpha = int(100 + piece['depth'] * 155)
-                        rotated_piece.set_alpha(alpha)
-                        
-                        piece_rect = rotated_piece.get_rect(center=(screen_x, screen_y))
-                        self.screen.blit(rotated_piece, piece_rect)
+                        piece_stack = transform_cache.stack(piece_img, (piece_size, piece_size))
+                        piece_stack.blit(self.screen, (screen_x, screen_y), piece['rotation'], alpha)
                         
     def _update_chess_pieces(self):
         """Update physics for falling chess pieces."""
@@ -1751,23 +1741,23 @@ class Renderer:
         current_time = pygame.time.get_ticks()
         
         if not hasattr(self, 'next_piece_spawn'):
-            self.next_piece_spawn = current_time + random.randint(500, 2000)
+            self.next_piece_spawn = current_time + _rng.randint(500, 2000)
         
         if current_time >= self.next_piece_spawn and len(self.falling_chess_pieces) < 20:
             piece_types = ['wP', 'wN', 'wB', 'wR', 'wQ', 'wK', 'bP', 'bN', 'bB', 'bR', 'bQ', 'bK']
             
             new_piece = {
-                'x': random.randint(0, config.WIDTH) + self.parallax_offset * 0.7,
-                'y': random.randint(config.HEIGHT // 3, config.HEIGHT // 2),
-                'vy': random.uniform(0.5, 1.5),
-                'vx': random.uniform(-0.3, 0.3),
-                'rotation': random.uniform(0, 360),
-                'rotation_speed': random.uniform(-2, 2),
-                'piece': random.choice(piece_types),
-                'depth': random.choice([0.3, 0.5, 0.7, 0.9])
+                'x': _rng.randint(0, config.WIDTH) + self.parallax_offset * 0.7,
+                'y': _rng.randint(config.HEIGHT // 3, config.HEIGHT // 2),
+                'vy': _rng.uniform(0.5, 1.5),
+                'vx': _rng.uniform(-0.3, 0.3),
+                'rotation': _rng.uniform(0, 360),
+                'rotation_speed': _rng.uniform(-2, 2),
+                'piece': _rng.choice(piece_types),
+                'depth': _rng.choice([0.3, 0.5, 0.7, 0.9])
             }
             self.falling_chess_pieces.append(new_piece)
-            self.next_piece_spawn = current_time + random.randint(500, 2000)
+            self.next_piece_spawn = current_time + _rng.randint(500, 2000)
         
         for piece in self.falling_chess_pieces:
             piece['x'] += piece['vx']
@@ -1804,12 +1794,10 @@ class Renderer:
             frame_index = int((time_elapsed / 100) % len(self.assets.jet_frames))
             jet_frame = self.assets.jet_frames[frame_index]
             
-            jet_scale = 0.3 * self.scale
+            jet_scale = 0.3
             jet_width = int(jet_frame.get_width() * jet_scale)
             jet_height = int(jet_frame.get_height() * jet_scale)
-            scaled_jet = pygame.transform.scale(jet_frame, (jet_width, jet_height))
-            
-            flipped_jet = pygame.transform.flip(scaled_jet, True, False)
+            flipped_jet = transform_cache.get(jet_frame, (jet_width, jet_height), flip_x=True)
             
             self.screen.blit(flipped_jet, (int(jet_x), int(jet_y)))
             
@@ -1843,65 +1831,74 @@ class Renderer:
             
     def draw_board(self):
         """Draw chess board."""
-        board_size_scaled = int(config.BOARD_SIZE * self.scale)
+        board_size = config.BOARD_SIZE
         
-        if self.board_surface_cache is None or self.board_cache_scale != self.scale:
-            self.board_surface_cache = pygame.Surface((board_size_scaled, board_size_scaled), pygame.SRCALPHA)
-            self.board_cache_scale = self.scale
+        if self.board_surface_cache is None:
+            self.board_surface_cache = pygame.Surface((board_size, board_size), pygame.SRCALPHA)
             
             if self.assets.board_texture:
                 scaled_texture = pygame.transform.scale(self.assets.board_texture, 
-                    (board_size_scaled, board_size_scaled))
+                    (board_size, board_size))
                 self.board_surface_cache.blit(scaled_texture, (0, 0))
                 self.board_surface_cache.set_alpha(255)
             else:
-                square_size_scaled = int(config.SQUARE_SIZE * self.scale)
-                border_left_scaled = int(config.BOARD_BORDER_LEFT * self.scale)
-                border_top_scaled = int(config.BOARD_BORDER_TOP * self.scale)
+                square_size = config.SQUARE_SIZE
+                border_left = config.BOARD_BORDER_LEFT
+                border_top = config.BOARD_BORDER_TOP
                 
                 for row in range(config.ROWS):
                     for col in range(config.COLS):
                         color = (*config.LIGHT_SQUARE, 230) if (row + col) % 2 == 0 else (*config.DARK_SQUARE, 230)
-                        x = border_left_scaled + col * square_size_scaled
-                        y = border_top_scaled + row * square_size_scaled
+                        x = border_left + col * square_size
+                        y = border_top + row * square_size
                         pygame.draw.rect(self.board_surface_cache, color, 
-                            (x, y, square_size_scaled, square_size_scaled))
+                            (x, y, square_size, square_size))
         
         self.screen.blit(self.board_surface_cache, (config.BOARD_OFFSET_X, config.BOARD_OFFSET_Y))
         pygame.draw.rect(self.screen, (60, 60, 60), 
                         (config.BOARD_OFFSET_X - 2, config.BOARD_OFFSET_Y - 2, 
-                         board_size_scaled + 4, board_size_scaled + 4), 2)
+                         board_size + 4, board_size + 4), 2)
                          
-    def draw_pieces(self, board, mouse_pos):
-        """Draw all pieces."""
-        current_time = pygame.time.get_ticks()
-        square_size_scaled = int(config.SQUARE_SIZE * self.scale)
-        
-        if not hasattr(self, '_scaled_pieces_cache') or self._cache_scale != self.scale:
+    def _scaled_pieces(self):
+        """Piece images at the board's square size."""
+        if self._scaled_pieces_cache is None:
+            square_size = config.SQUARE_SIZE
             self._scaled_pieces_cache = {}
-            self._cache_scale = self.scale
             for piece_code, piece_img in self.assets.pieces.items():
                 self._scaled_pieces_cache[piece_code] = pygame.transform.scale(
-                    piece_img, (square_size_scaled, square_size_scaled))
-        
+                    piece_img, (square_size, square_size))
+        return self._scaled_pieces_cache
+        
+    def moving_squares(self, board):
+        """Squares whose piece is drawn as a sprite instead of resting on the board."""
+        hidden = []
+        if board.dragging and board.drag_start:
+            hidden.append(board.drag_start)
+        if board.animating and board.animation_from:
+            hidden.append(board.animation_from)
+        return tuple(hidden)
+        
+    def draw_resting_pieces(self, surface, board, hidden=(), origin=(0, 0)):
+        """Draw every piece not in hidden onto surface, whose top-left sits at origin on screen."""
+        scaled_pieces = self._scaled_pieces()
+        origin_x, origin_y = origin
         for row in range(8):
             for col in range(8):
                 piece = board.get_piece(row, col)
-                if not piece:
-                    continue
-                    
-                if board.dragging and (row, col) == board.drag_start:
-                    continue
-                if board.animating and (row, col) == board.animation_from:
+                if not piece or (row, col) in hidden:
                     continue
                     
                 x, y = board.get_square_pos(row, col)
-                scaled_piece = self._scaled_pieces_cache.get(piece)
+                scaled_piece = scaled_pieces.get(piece)
                 if scaled_piece:
-                    self.screen.blit(scaled_piece, (x, y))
+                    surface.blit(scaled_piece, (x - origin_x, y - origin_y))
                     
+    def draw_piece_sprites(self, board, mouse_pos):
+        """Draw the animating and dragged pieces."""
+        scaled_pieces = self._scaled_pieces()
+        
         if board.animating and board.animation_piece:
-            progress = min(1.0, (current_time - board.animation_start) / config.MOVE_ANIMATION_DURATION)
+            progress = min(1.0, (pygame.time.get_ticks() - board.animation_start) / config.MOVE_ANIMATION_DURATION)
             t = progress * progress * (3.0 - 2.0 * progress)
             
             from_x, from_y = board.get_square_pos(*board.animation_from)
@@ -1910,32 +1907,37 @@ class Renderer:
             current_x = from_x + (to_x - from_x) * t
             current_y = from_y + (to_y - from_y) * t
             
-            scaled_piece = self._scaled_pieces_cache.get(board.animation_piece)
+            scaled_piece = scaled_pieces.get(board.animation_piece)
             if scaled_piece:
                 self.screen.blit(scaled_piece, (current_x, current_y))
                 
         if board.dragging and board.drag_piece:
-            scaled_piece = self._scaled_pieces_cache.get(board.drag_piece)
+            scaled_piece = scaled_pieces.get(board.drag_piece)
             if scaled_piece:
                 rect = scaled_piece.get_rect()
                 rect.center = mouse_pos
                 self.screen.blit(scaled_piece, rect)
                 
+    def draw_pieces(self, board, mouse_pos):
+        """Draw all pieces."""
+        self.draw_resting_pieces(self.screen, board, self.moving_squares(board))
+        self.draw_piece_sprites(board, mouse_pos)
+        
     def draw_highlights(self, board):
         """Draw valid move indicators."""
         if not board.selected_piece:
             return
             
         current_time = pygame.time.get_ticks()
-        square_size_scaled = int(config.SQUARE_SIZE * self.scale)
+        square_size = config.SQUARE_SIZE
         pulse = math.sin(current_time / 300) * 0.3 + 0.7
         
         for move_row, move_col in board.valid_moves:
             x, y = board.get_square_pos(move_row, move_col)
-            center_x = x + square_size_scaled // 2
-            center_y = y + square_size_scaled // 2
+            center_x = x + square_size // 2
+            center_y = y + square_size // 2
             
-            base_size = int(12 * self.scale)
+            base_size = 12
             size = int(base_size * pulse)
             alpha = int(180 * pulse)
             
@@ -1943,89 +1945,76 @@ class Renderer:
             pygame.draw.circle(dot_surface, (100, 100, 100, alpha), (size, size), size)
             self.screen.blit(dot_surface, (center_x - size, center_y - size))
             
-    def draw_ui(self, board, mute_button, music_muted, mouse_pos, ai=None, difficulty=None, show_captured=True):
-        """Draw UI elements."""
-        ui_width_scaled = int(config.UI_WIDTH * self.scale)
-        ui_height_scaled = int(config.UI_HEIGHT * self.scale)
-        board_size_scaled = int(config.BOARD_SIZE * self.scale)
-        
-        board_left = config.BOARD_OFFSET_X
-        board_top = config.BOARD_OFFSET_Y
-        board_right = config.BOARD_OFFSET_X + board_size_scaled
-        board_bottom = config.BOARD_OFFSET_Y + board_size_scaled
-        
-        ui_color = (0, 0, 0, 200)
-        
-        ui_surface = pygame.Surface((config.WIDTH, config.HEIGHT), pygame.SRCALPHA)
-        pygame.draw.rect(ui_surface, ui_color, (0, 0, config.WIDTH, board_top))
-        pygame.draw.rect(ui_surface, ui_color, (0, board_bottom, config.WIDTH, config.HEIGHT - board_bottom))
-        pygame.draw.rect(ui_surface, ui_color, (0, board_top, board_left, board_size_scaled))
-        pygame.draw.rect(ui_surface, ui_color, (board_right, board_top, config.WIDTH - board_right, board_size_scaled))
-        self.screen.blit(ui_surface, (0, 0))
-        
-        if ai and board.current_turn == "black" and ai.is_thinking():
-            turn_text = "AI IS THINKING..."
-        else:
-            turn_text = f"CURRENT TURN: {board.current_turn.upper()}"
-        text = self.pixel_fonts['large'].render(turn_text, True, config.WHITE)
-        rect = text.get_rect(center=(config.WIDTH // 2, board_top // 2))
-        self.screen.blit(text, rect)
-        
-        if ai and difficulty:
-            elo_rating = config.AI_DIFFICULTY_ELO.get(difficulty, 1200)
-            diff_text = f"VS {config.AI_DIFFICULTY_NAMES[difficulty]} AI (ELO: {elo_rating})"
-            text = self.pixel_fonts['small'].render(diff_text, True, config.AI_DIFFICULTY_COLORS[difficulty])
-            rect = text.get_rect(center=(config.WIDTH // 2, board_top // 2 + 25 * self.scale))
-            self.screen.blit(text, rect)
-        
-        if not hasattr(self, '_small_pieces_cache') or getattr(self, '_small_cache_scale', None) != self.scale:
+    def draw_hint_arrows(self, board, analysis, lines):
+        """Draw arrows for the hint service's best moves, strongest first."""
+        if not analysis or not lines:
+            return
+            
+        # The arrows only change when the analysis does, so they are drawn once onto a board-sized layer
+        key = (analysis["depth"], tuple(lines))
+        if key != self._hint_arrows_key:
+            self._hint_arrows_key = key
+            self._hint_arrows = self._render_hint_arrows(board, lines)
+        origin, arrow_surface = self._hint_arrows
+        self.screen.blit(arrow_surface, origin)
+        
+        # Search depth so the player can see the hint refining
+        depth_text = self._get_cached_text(f"HINT DEPTH {analysis['depth']}", 'small', (80, 200, 120))
+        self.screen.blit(depth_text, (config.BOARD_OFFSET_X, config.BOARD_OFFSET_Y - depth_text.get_height() - 4))
+        
+    def _render_hint_arrows(self, board, lines):
+        """The hint arrows on a transparent layer covering the squares; returns (screen origin, layer)."""
+        square_size = config.SQUARE_SIZE
+        origin_x, origin_y = board.get_square_pos(0, 0)
+        arrow_surface = pygame.Surface((square_size * 8, square_size * 8), pygame.SRCALPHA)
+        
+        # Draw weaker candidates first so the best move sits on top
+        for rank in range(len(lines) - 1, -1, -1):
+            _, move = lines[rank]
+            (from_row, from_col), (to_row, to_col) = move
+            
+            from_x, from_y = board.get_square_pos(from_row, from_col)
+            to_x, to_y = board.get_square_pos(to_row, to_col)
+            start = (from_x - origin_x + square_size // 2, from_y - origin_y + square_size // 2)
+            end = (to_x - origin_x + square_size // 2, to_y - origin_y + square_size // 2)
+            
+            color = (80, 200, 120, 200) if rank == 0 else (80, 160, 220, 120)
+            width = 8 if rank == 0 else 5
+            head = 18
+            
+            angle = math.atan2(end[1] - start[1], end[0] - start[0])
+            shaft_end = (end[0] - math.cos(angle) * head, end[1] - math.sin(angle) * head)
+            pygame.draw.line(arrow_surface, color, start, shaft_end, width)
+            pygame.draw.polygon(arrow_surface, color, [
+                end,
+                (shaft_end[0] + math.cos(angle + math.pi / 2) * head * 0.6,
+                 shaft_end[1] + math.sin(angle + math.pi / 2) * head * 0.6),
+                (shaft_end[0] + math.cos(angle - math.pi / 2) * head * 0.6,
+                 shaft_end[1] + math.sin(angle - math.pi / 2) * head * 0.6)
+            ])
+            
+        return (origin_x, origin_y), arrow_surface
+        
+    def draw_ui_panels(self, surface=None):
+        """Dim everything around the board."""
+        self.hud.draw_frame(surface if surface else self.screen)
+        
+    def _small_pieces(self):
+        """Piece images at captured-piece size."""
+        if self._small_pieces_cache is None:
             self._small_pieces_cache = {}
-            self._small_cache_scale = self.scale
-            small_size = int(30 * self.scale)
+            small_size = 30
             for piece_code, piece_img in self.assets.pieces.items():
                 self._small_pieces_cache[piece_code] = pygame.transform.scale(
                     piece_img, (small_size, small_size))
+        return self._small_pieces_cache
         
-        if show_captured:
-            y_position = board_top + 10 * self.scale
-            
-            if board.captured_pieces["white"]:
-                title = self.pixel_fonts['medium'].render("WHITE CAPTURED:", True, config.WHITE)
-                self.screen.blit(title, (10 * self.scale, y_position))
-                
-                y_offset = y_position + 30 * self.scale
-                for i, piece in enumerate(board.captured_pieces["white"][:12]):
-                    if piece in self._small_pieces_cache:
-                        small = self._small_pieces_cache[piece]
-                        if small:
-                            self.screen.blit(small, 
-                                (10 * self.scale + (i % 4) * 35 * self.scale, 
-                                 y_offset + (i // 4) * 35 * self.scale))
-                                 
-                rows_used = min(3, (len(board.captured_pieces["white"]) + 3) // 4)
-                y_position = y_offset + rows_used * 35 * self.scale + 20 * self.scale
-            
-            if board.captured_pieces["black"]:
-                title = self.pixel_fonts['medium'].render("BLACK CAPTURED:", True, config.WHITE)
-                self.screen.blit(title, (10 * self.scale, y_position))
-                
-                y_offset = y_position + 30 * self.scale
-                for i, piece in enumerate(board.captured_pieces["black"][:12]):
-                    if piece in self._small_pieces_cache:
-                        small = self._small_pieces_cache[piece]
-                        if small:
-                            self.screen.blit(small, 
-                                (10 * self.scale + (i % 4) * 35 * self.scale, 
-                                 y_offset + (i // 4) * 35 * self.scale))
-                        
-        if ai and board.current_turn == "black":
-            info_text = "AI IS PLAYING..."
-        else:
-            info_text = "DRAG TO MOVE - CLICK TO SELECT"
-        text = self.pixel_fonts['small'].render(info_text, True, config.WHITE)
-        rect = text.get_rect(center=(config.WIDTH // 2, 
-            board_bottom + (config.HEIGHT - board_bottom) // 2))
-        self.screen.blit(text, rect)
+    def draw_ui(self, board, mute_button, music_muted, mouse_pos, ai=None, difficulty=None, show_captured=True,
+                show_panels=True):
+        """Draw UI elements; show_panels=False when the panels come from a cached layer."""
+        if show_panels:
+            self.draw_ui_panels()
+        self.hud.draw(self.screen, board, ai, difficulty, show_captured)
         
     def draw_check_indicator(self, board):
         """Draw exclamation mark above king if in check."""
@@ -2038,12 +2027,12 @@ class Renderer:
             
         row, col = king_pos
         x, y = board.get_square_pos(row, col)
-        square_size_scaled = int(config.SQUARE_SIZE * self.scale)
+        square_size = config.SQUARE_SIZE
         
-        exc_x = x + square_size_scaled - int(15 * self.scale)
-        exc_y = y + int(10 * self.scale)
+        exc_x = x + square_size - 15
+        exc_y = y + 10
         
-        exc_text = self.pixel_fonts['small'].render("!", True, (255, 0, 0))
+        exc_text = self._get_cached_text("!", 'small', (255, 0, 0))
         exc_rect = exc_text.get_rect(center=(exc_x, exc_y))
         self.screen.blit(exc_text, exc_rect)
         
@@ -2057,8 +2046,8 @@ class Renderer:
         overlay.fill(config.BLACK)
         self.screen.blit(overlay, (0, 0))
         
-        menu_w = int(300 * self.scale)
-        menu_h = int(100 * self.scale)
+        menu_w = 300
+        menu_h = 100
         menu_x = config.WIDTH // 2 - menu_w // 2
         menu_y = config.HEIGHT // 2 - menu_h // 2
         
@@ -2067,19 +2056,18 @@ class Renderer:
         pygame.draw.rect(self.screen, (200, 200, 200), (menu_x, menu_y, menu_w, menu_h))
         pygame.draw.rect(self.screen, config.BLACK, (menu_x, menu_y, menu_w, menu_h), 3)
         
-        text = self.pixel_fonts['medium'].render("CHOOSE PROMOTION:", True, config.BLACK)
-        rect = text.get_rect(centerx=menu_x + menu_w // 2, y=menu_y + 10 * self.scale)
+        text = self._get_cached_text("CHOOSE PROMOTION:", 'medium', config.BLACK)
+        rect = text.get_rect(centerx=menu_x + menu_w // 2, y=menu_y + 10)
         self.screen.blit(text, rect)
         
         pieces = ["Q", "R", "B", "N"]
-        size = int(50 * self.scale)
-        spacing = int(10 * self.scale)
+        size = 50
+        spacing = 10
         total_w = len(pieces) * size + (len(pieces) - 1) * spacing
         start_x = menu_x + (menu_w - total_w) // 2
         
-        if not hasattr(self, '_promo_pieces_cache') or self._promo_cache_scale != self.scale:
+        if self._promo_pieces_cache is None:
             self._promo_pieces_cache = {}
-            self._promo_cache_scale = self.scale
             for color in ['w', 'b']:
                 for piece_type in pieces:
                     piece_key = color + piece_type
@@ -2090,7 +2078,7 @@ class Renderer:
         rects = []
         for i, piece_type in enumerate(pieces):
             x = start_x + i * (size + spacing)
-            y = menu_y + int(40 * self.scale)
+            y = menu_y + 40
             
             rect = pygame.Rect(x, y, size, size)
             if rect.collidepoint(mouse_pos):
@@ -2226,8 +2214,8 @@ class Renderer:
             # Portrait - Use bot.png if available
             if battle_data.get("portrait") == "BOT":
                 if self.assets.bot_image:
-                    bot_scaled = pygame.transform.smoothscale(self.assets.bot_image, 
-                                                             (portrait_size - 20, portrait_size - 20))
+                    bot_scaled = transform_cache.scale(self.assets.bot_image, (portrait_size - 20, portrait_size - 20),
+                                                       smooth=True).copy()
                     bot_scaled.set_alpha(int(255 * content_fade))
                     bot_rect = bot_scaled.get_rect(center=(portrait_x + portrait_size // 2, 
                                                           portrait_y + portrait_size // 2))
@@ -2239,7 +2227,7 @@ class Renderer:
             
             # Just draw the text once, cleanly with fade
             text_color = (int(220 * content_fade), int(190 * content_fade), int(130 * content_fade))
-            victory_text_surface = self.pixel_fonts['huge'].render(victory_text_str, True, text_color)
+            victory_text_surface = self._get_cached_text(victory_text_str, 'huge', text_color)
             victory_text_rect = victory_text_surface.get_rect(center=(config.WIDTH // 2, victory_y))
             victory_surface.blit(victory_text_surface, victory_text_rect)
             
@@ -2279,19 +2267,17 @@ class Renderer:
             
             # Name text with glow and fade
             name_glow_color = (int(0 * content_fade), int(255 * content_fade), int(255 * content_fade))
-            name_glow = self.pixel_fonts['huge'].render(name_text, True, name_glow_color)
-            name_glow.set_alpha(int(50 * content_fade))
-            name_glow_rect = name_glow.get_rect(center=(config.WIDTH // 2, name_y))
-            victory_surface.blit(name_glow, name_glow_rect)
+            self.draw_text(name_text, 'huge', name_glow_color, (config.WIDTH // 2, name_y), "center",
+                           int(50 * content_fade), surface=victory_surface)
             
-            name_surface_text = self.pixel_fonts['huge'].render(name_text, True, name_glow_color)
+            name_surface_text = self._get_cached_text(name_text, 'huge', name_glow_color)
             name_rect = name_surface_text.get_rect(center=(config.WIDTH // 2, name_y))
             victory_surface.blit(name_surface_text, name_rect)
             
             # Status text with fade
             status_text = "STATUS: DEFEATED"
             status_color = (int(255 * content_fade), int(100 * content_fade), int(100 * content_fade))
-            status_surface = self.pixel_fonts['medium'].render(status_text, True, status_color)
+            status_surface = self._get_cached_text(status_text, 'medium', status_color)
             status_rect = status_surface.get_rect(center=(config.WIDTH // 2, name_y + 50))
             victory_surface.blit(status_surface, status_rect)
             
@@ -2302,7 +2288,7 @@ class Renderer:
             if hasattr(board, 'victory_reward') and board.victory_reward > 0:
                 reward_text = f"REWARD: + ${board.victory_reward}"
                 reward_color = (int(220 * content_fade), int(190 * content_fade), int(130 * content_fade))
-                reward_surface = self.pixel_fonts['large'].render(reward_text, True, reward_color)
+                reward_surface = self._get_cached_text(reward_text, 'large', reward_color)
                 reward_rect = reward_surface.get_rect(center=(config.WIDTH // 2, info_y))
                 victory_surface.blit(reward_surface, reward_rect)
                 info_y += 40
@@ -2313,7 +2299,7 @@ class Renderer:
             if battle_data.get("victory"):
                 for i, line in enumerate(battle_data["victory"][:2]):
                     dialogue_color = (int(0 * content_fade), int(200 * content_fade), int(255 * content_fade))
-                    line_surface = self.pixel_fonts['small'].render(line, True, dialogue_color)
+                    line_surface = self._get_cached_text(line, 'small', dialogue_color)
                     line_rect = line_surface.get_rect(center=(config.WIDTH // 2, info_y))
                     victory_surface.blit(line_surface, line_rect)
                     info_y += 25
@@ -2322,8 +2308,8 @@ class Renderer:
             self.screen.blit(victory_surface, (0, 0))
                 
         elif content_fade > 0:
-            # DEFEAT screen with similar design
-            defeat_text = "DEFEAT"
+            # DEFEAT screen with similar design (draws share it)
+            defeat_text = "DRAW" if board.winner is None else "DEFEAT"
             
             # Create defeat surface for fading
             defeat_content = pygame.Surface((config.WIDTH, config.HEIGHT), pygame.SRCALPHA)
@@ -2334,57 +2320,55 @@ class Renderer:
                 for i in range(3):
                     glow_alpha = int((100 - i * 30) * content_fade)
                     glow_color = (int(200 * content_fade), int(50 * content_fade), int(50 * content_fade))
-                    glow_surface = self.pixel_fonts['huge'].render(defeat_text, True, glow_color)
-                    glow_surface.set_alpha(glow_alpha)
-                    glow_rect = glow_surface.get_rect(center=(config.WIDTH // 2, 
-                                                             config.HEIGHT // 2 - 200 * self.scale))
-                    glow_rect.inflate_ip(i * 4, i * 4)
-                    defeat_content.blit(glow_surface, glow_rect)
+                    # Each layer sits a little up and left of the text
+                    self.draw_text(defeat_text, 'huge', glow_color,
+                                   (config.WIDTH // 2 - i * 2, config.HEIGHT // 2 - 200 - i * 2), "center", glow_alpha,
+                                   surface=defeat_content)
                 
                 # Main text with fade
                 defeat_color = (int(200 * content_fade), int(50 * content_fade), int(50 * content_fade))
-                defeat_surface = self.pixel_fonts['huge'].render(defeat_text, True, defeat_color)
+                defeat_surface = self._get_cached_text(defeat_text, 'huge', defeat_color)
             else:
-                defeat_font = pygame.font.Font(None, int(72 * self.scale))
+                defeat_font = self._get_default_font(72)
                 defeat_color = (int(200 * content_fade), int(50 * content_fade), int(50 * content_fade))
-                defeat_surface = defeat_font.render(defeat_text, True, defeat_color)
+                defeat_surface = text_cache.render(defeat_font, defeat_text, defeat_color)
             
-            rect = defeat_surface.get_rect(center=(config.WIDTH // 2, config.HEIGHT // 2 - 200 * self.scale))
+            rect = defeat_surface.get_rect(center=(config.WIDTH // 2, config.HEIGHT // 2 - 200))
             defeat_content.blit(defeat_surface, rect)
             
             if hasattr(board, 'is_story_mode') and board.is_story_mode and hasattr(board, 'story_battle'):
                 battle = board.story_battle
                 if "defeat" in battle:
-                    defeat_dialogue_y = config.HEIGHT // 2 - 20 * self.scale
+                    defeat_dialogue_y = config.HEIGHT // 2 - 20
                     for line in battle["defeat"]:
                         if line:
                             line_color = (int(200 * content_fade), int(200 * content_fade), int(200 * content_fade))
-                            line_surface = self.pixel_fonts['small'].render(line, True, line_color)
+                            line_surface = self._get_cached_text(line, 'small', line_color)
                             line_rect = line_surface.get_rect(center=(config.WIDTH // 2, defeat_dialogue_y))
                             defeat_content.blit(line_surface, line_rect)
                             defeat_dialogue_y += 25
                 else:
                     encourage_text = "Better luck next time!"
                     text_color = (int(150 * content_fade), int(150 * content_fade), int(150 * content_fade))
-                    text = self.pixel_fonts['medium'].render(encourage_text, True, text_color)
-                    rect = text.get_rect(center=(config.WIDTH // 2, config.HEIGHT // 2 - 20 * self.scale))
+                    text = self._get_cached_text(encourage_text, 'medium', text_color)
+                    rect = text.get_rect(center=(config.WIDTH // 2, config.HEIGHT // 2 - 20))
                     defeat_content.blit(text, rect)
             
             # Blit defeat content to screen
             self.screen.blit(defeat_content, (0, 0))
         
         # Clean button design positioned lower
-        button_y = config.HEIGHT // 2 + 180 * self.scale
-        button_width = 180 * self.scale
-        button_height = 50 * self.scale
-        button_spacing = 40 * self.scale
+        button_y = config.HEIGHT // 2 + 180
+        button_width = 180
+        button_height = 50
+        button_spacing = 40
         
         # Restart button
         restart_x = config.WIDTH // 2 - button_width - button_spacing // 2
         restart_rect = pygame.Rect(restart_x, button_y, button_width, button_height)
         
         # Modern button style with hover effect
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = pacer.get_mouse_pos()
         restart_hover = restart_rect.collidepoint(mouse_pos)
         
         # Button background with fade
@@ -2412,7 +2396,7 @@ class Renderer:
         # Button text with fade
         text_alpha = int(255 * content_fade) if content_fade > 0 else 255
         text_color = (text_alpha, text_alpha, text_alpha)
-        restart_text = self.pixel_fonts['medium'].render(button_label, True, text_color)
+        restart_text = self._get_cached_text(button_label, 'medium', text_color)
         restart_text_rect = restart_text.get_rect(center=restart_rect.center)
         self.screen.blit(restart_text, restart_text_rect)
         
@@ -2436,21 +2420,86 @@ class Renderer:
         self.screen.blit(menu_surface, menu_rect)
         
         # Menu text with fade
-        menu_text = self.pixel_fonts['medium'].render("MAIN MENU", True, text_color)
+        menu_text = self._get_cached_text("MAIN MENU", 'medium', text_color)
         menu_text_rect = menu_text.get_rect(center=menu_rect.center)
         self.screen.blit(menu_text, menu_text_rect)
         
         # Keyboard shortcuts hint with fade
-        hint_y = button_y + button_height + 20 * self.scale
+        hint_y = button_y + button_height + 20
         hint_alpha = int(150 * content_fade) if content_fade > 0 else 150
         hint_color = (hint_alpha, hint_alpha, hint_alpha)
-        hint_text = self.pixel_fonts['tiny'].render("Press R to restart • ESC for menu", True, hint_color)
+        hint_text = self._get_cached_text("Press R to restart • ESC for menu", 'tiny', hint_color)
         hint_rect = hint_text.get_rect(center=(config.WIDTH // 2, hint_y))
         self.screen.blit(hint_text, hint_rect)
         
         # Return button rectangles for click handling
         return restart_rect, menu_rect
         
+    def draw_eval_graph(self, analysis):
+        """Draw the post-game evaluation graph with mistakes and better moves."""
+        panel = pygame.Rect(30, 250, 380, 330)
+        graph = pygame.Rect(panel.x + 15, panel.y + 40, panel.width - 30, 150)
+        
+        panel_surface = pygame.Surface(panel.size, pygame.SRCALPHA)
+        pygame.draw.rect(panel_surface, (10, 20, 30, 220), panel_surface.get_rect(), border_radius=8)
+        pygame.draw.rect(panel_surface, (0, 200, 255, 200), panel_surface.get_rect(), 2, border_radius=8)
+        self.screen.blit(panel_surface, panel)
+        
+        title = "GAME ANALYSIS" if analysis.complete else f"ANALYSING... {int(analysis.progress() * 100)}%"
+        title_surface = self._get_cached_text(title, 'small', (0, 255, 200))
+        self.screen.blit(title_surface, (panel.x + 15, panel.y + 12))
+        
+        # Centre line is an even position; white advantage goes up
+        pygame.draw.rect(self.screen, (30, 40, 50), graph)
+        pygame.draw.line(self.screen, (90, 90, 90), (graph.left, graph.centery), (graph.right, graph.centery))
+        
+        results = analysis.results
+        if len(results) < 2:
+            return
+            
+        eval_cap = 1000
+        step = graph.width / (len(results) - 1)
+        points = []
+        markers = []
+        for ply, result in enumerate(results):
+            if result is None:
+                continue
+            clamped = max(-eval_cap, min(eval_cap, result["eval"]))
+            point = (graph.left + ply * step, graph.centery - clamped / eval_cap * (graph.height // 2))
+            points.append(point)
+            if result["classification"]:
+                markers.append((point, result["classification"]))
+                
+        if len(points) > 1:
+            pygame.draw.lines(self.screen, (220, 220, 220), False, points, 2)
+        for point, classification in markers:
+            color = (255, 60, 60) if classification == "blunder" else (255, 170, 0)
+            pygame.draw.circle(self.screen, color, (int(point[0]), int(point[1])), 4)
+            
+        # The player's costliest moves with the better alternative
+        files = "abcdefgh"
+        def square_name(row, col):
+            return f"{files[col]}{8 - row}"
+            
+        worst = sorted(
+            (ply for ply in range(len(results))
+             if results[ply] and results[ply]["classification"]
+             and analysis.move_history[ply]["before"]["current_turn"] == "white"),
+            key=lambda ply: results[ply]["loss"], reverse=True
+        )[:3]
+        text_y = graph.bottom + 12
+        for ply in worst:
+            result = results[ply]
+            (from_row, from_col), (to_row, to_col) = analysis.move_history[ply]["move"]
+            best_from_row, best_from_col, best_to_row, best_to_col = result["best_move"]
+            line = (f"{ply // 2 + 1}. {square_name(from_row, from_col)}-{square_name(to_row, to_col)} "
+                    f"{result['classification'].upper()}, BEST {square_name(best_from_row, best_from_col)}-"
+                    f"{square_name(best_to_row, best_to_col)}")
+            color = (255, 100, 100) if result["classification"] == "blunder" else (255, 190, 80)
+            line_surface = self._get_cached_text(line, 'tiny', color)
+            self.screen.blit(line_surface, (panel.x + 15, text_y))
+            text_y += line_surface.get_height() + 6
+            
     def _draw_star(self, x, y, size, color):
         """Helper method to draw a star."""
         points = []
@@ -2489,7 +2538,7 @@ class Renderer:
             game_center_x = config.WIDTH // 2
             game_center_y = config.HEIGHT // 2
         
-        text = self.pixel_fonts['huge'].render("SELECT DIFFICULTY", True, config.WHITE)
+        text = self._get_cached_text("SELECT DIFFICULTY", 'huge', config.WHITE)
         rect = text.get_rect(center=(game_center_x, game_center_y - 250 * config.SCALE))
         self.screen.blit(text, rect)
         
@@ -2513,7 +2562,7 @@ class Renderer:
             pygame.draw.rect(self.screen, border_color, button, 3, border_radius=10)
             
             text = config.AI_DIFFICULTY_NAMES[difficulty]
-            text_surface = self.pixel_fonts['large'].render(text, True, config.WHITE)
+            text_surface = self._get_cached_text(text, 'large', config.WHITE)
             text_rect = text_surface.get_rect(center=button.center)
             self.screen.blit(text_surface, text_rect)
             
@@ -2538,7 +2587,7 @@ class Renderer:
                 desc_text = f"Beat {config.AI_DIFFICULTY_NAMES[prev_difficulty]} to unlock"
                 desc_color = (150, 150, 150)
             
-            desc = self.pixel_fonts['small'].render(desc_text, True, desc_color)
+            desc = self._get_cached_text(desc_text, 'small', desc_color)
             desc_rect = desc.get_rect(center=(button.centerx, button.bottom + 10 * config.SCALE))
             self.screen.blit(desc, desc_rect)
             
@@ -2574,16 +2623,16 @@ class Renderer:
             
             if not hasattr(self, 'high_flying_jets'):
                 self.high_flying_jets = []
-                self.next_high_jet_spawn = current_time + random.randint(15000, 30000)
+                self.next_high_jet_spawn = current_time + _rng.randint(15000, 30000)
             
             if current_time >= self.next_high_jet_spawn:
                 self.high_flying_jets.append({
                     'x': -100,
-                    'y': random.randint(50, 150),
-                    'speed': random.uniform(5, 8),
-                    'scale': random.uniform(0.15, 0.25)
+                    'y': _rng.randint(50, 150),
+                    'speed': _rng.uniform(5, 8),
+                    'scale': _rng.uniform(0.15, 0.25)
                 })
-                self.next_high_jet_spawn = current_time + random.randint(20000, 40000)
+                self.next_high_jet_spawn = current_time + _rng.randint(20000, 40000)
             
             jets_to_remove = []
             for jet in self.high_flying_jets:
@@ -2595,10 +2644,7 @@ class Renderer:
                     
                     jet_width = int(jet_frame.get_width() * jet['scale'])
                     jet_height = int(jet_frame.get_height() * jet['scale'])
-                    scaled_jet = pygame.transform.scale(jet_frame, (jet_width, jet_height))
-                    
-                    flipped_jet = pygame.transform.flip(scaled_jet, True, False)
-                    flipped_jet.set_alpha(180)
+                    flipped_jet = transform_cache.get(jet_frame, (jet_width, jet_height), flip_x=True, alpha=180)
                     
                     self.screen.blit(flipped_jet, (int(jet['x']), int(jet['y'])))
                 
@@ -2635,7 +2681,7 @@ class Renderer:
                                     'world_x': bomb['x'] + self.parallax_offset * layer['depth'],
                                     'y': config.HEIGHT - 80 + layer['y_offset'],
                                     'width': int(80 * layer['size']),
-                                    'spawn_timer': random.randint(0, 5),
+                                    'spawn_timer': _rng.randint(0, 5),
                                     'intensity': 1.0,
                                     'depth': layer['depth'],
                                     'creation_time': pygame.time.get_ticks()
@@ -2652,8 +2698,8 @@ class Renderer:
             if hasattr(self, 'falling_bombs'):
                 for bomb in self.falling_bombs:
                     if not bomb['exploded']:
-                        bomb_width = int(8 * self.scale)
-                        bomb_height = int(16 * self.scale)
+                        bomb_width = 8
+                        bomb_height = 16
                         
                         pygame.draw.ellipse(self.screen, (60, 60, 60), 
                                           (bomb['x'] - bomb_width//2, bomb['y'] - bomb_height//2, 
@@ -2669,7 +2715,7 @@ class Renderer:
                         ]
                         pygame.draw.polygon(self.screen, (50, 50, 50), nose_points)
                         
-                        fin_height = int(5 * self.scale)
+                        fin_height = 5
                         pygame.draw.polygon(self.screen, (70, 70, 70), [
                             (bomb['x'] - bomb_width//2, bomb['y'] - bomb_height//2),
                             (bomb['x'] - bomb_width//2 - 3, bomb['y'] - bomb_height//2 - fin_height),
@@ -2697,8 +2743,7 @@ class Renderer:
                 aspect_ratio = self.assets.beta_badge.get_width() / self.assets.beta_badge.get_height()
                 badge_width = int(badge_height * aspect_ratio)
                 
-                scaled_badge = pygame.transform.scale(self.assets.beta_badge, (badge_width, badge_height))
-                rotated_badge = pygame.transform.rotate(scaled_badge, -15)
+                rotated_badge = transform_cache.get(self.assets.beta_badge, (badge_width, badge_height), -15)
                 
                 # Calculate badge position based on title
                 title_width = self.pixel_fonts['huge'].size("CHECKMATE PROTOCOL")[0]
@@ -2713,7 +2758,9 @@ class Renderer:
                 elapsed = pygame.time.get_ticks() - self.badge_fade_start
                 alpha = min(255, int(255 * (elapsed / fade_duration)))
                 
-                rotated_badge.set_alpha(alpha)
+                if alpha < 255:
+                    rotated_badge = rotated_badge.copy()  # The cached badge is shared, so fade a copy
+                    rotated_badge.set_alpha(alpha)
                 self.screen.blit(rotated_badge, (badge_x, badge_y))
                 
                 # Calculate button fade-in based on badge fade completion
@@ -2736,7 +2783,7 @@ class Renderer:
                 pass
             
         elif screen_type == config.SCREEN_CREDITS:
-            text = self.pixel_fonts['huge'].render("CREDITS", True, config.WHITE)
+            text = self._get_cached_text("CREDITS", 'huge', config.WHITE)
             rect = text.get_rect(center=(game_center_x, config.GAME_OFFSET_Y + 60 * config.SCALE))
             self.screen.blit(text, rect)
             
@@ -2762,9 +2809,9 @@ class Renderer:
             for text, font_type, color in credits:
                 if font_type:
                     if font_type == "header":
-                        surface = self.pixel_fonts['medium'].render(text, True, color)
+                        surface = self._get_cached_text(text, 'medium', color)
                     else:
-                        surface = self.pixel_fonts['small'].render(text, True, color)
+                        surface = self._get_cached_text(text, 'small', color)
                     rect = surface.get_rect(center=(game_center_x, y))
                     self.screen.blit(surface, rect)
                 y += 28 * config.SCALE
@@ -2780,11 +2827,11 @@ class Renderer:
                 self._mode_particles = []
                 for _ in range(30):
                     self._mode_particles.append({
-                        'x': random.randint(0, config.WIDTH),
-                        'y': random.randint(0, config.HEIGHT),
-                        'size': random.randint(2, 5),
-                        'speed': random.uniform(0.5, 2),
-                        'opacity': random.randint(30, 100)
+                        'x': _rng.randint(0, config.WIDTH),
+                        'y': _rng.randint(0, config.HEIGHT),
+                        'size': _rng.randint(2, 5),
+                        'speed': _rng.uniform(0.5, 2),
+                        'opacity': _rng.randint(30, 100)
                     })
             
             # Update and draw particles
@@ -2792,7 +2839,7 @@ class Renderer:
                 particle['y'] -= particle['speed']
                 if particle['y'] < -10:
                     particle['y'] = config.HEIGHT + 10
-                    particle['x'] = random.randint(0, config.WIDTH)
+                    particle['x'] = _rng.randint(0, config.WIDTH)
                 
                 # Glow effect
                 glow_surf = pygame.Surface((particle['size']*4, particle['size']*4), pygame.SRCALPHA)
@@ -2810,13 +2857,10 @@ class Renderer:
             for i in range(3, 0, -1):
                 glow_alpha = 40 - i * 10
                 glow_color = (100 + i*20, 150 + i*20, 255)
-                glow_text = self.pixel_fonts['huge'].render(title_text, True, glow_color)
-                glow_text.set_alpha(glow_alpha)
-                glow_rect = glow_text.get_rect(center=(game_center_x, title_y))
-                self.screen.blit(glow_text, glow_rect.move(0, i))
+                self.draw_text(title_text, 'huge', glow_color, (game_center_x, title_y + i), "center", glow_alpha)
             
             # Main title
-            text = self.pixel_fonts['huge'].render(title_text, True, (255, 255, 255))
+            text = self._get_cached_text(title_text, 'huge', (255, 255, 255))
             rect = text.get_rect(center=(game_center_x, title_y))
             self.screen.blit(text, rect)
             
@@ -2915,35 +2959,32 @@ class Renderer:
                 if 'huge' in self.pixel_fonts:
                     icon_font = self.pixel_fonts['huge']
                 else:
-                    icon_font = pygame.font.Font(None, int(80 * config.SCALE))
+                    icon_font = self._get_default_font(int(80 * config.SCALE))
                 
                 # Multiple layers for glow effect
                 for glow_layer in range(3, 0, -1):
                     glow_alpha = 60 - glow_layer * 15
                     glow_size = glow_layer * 2
-                    icon_glow = icon_font.render(mode['icon'], True, icon_color)
-                    icon_glow.set_alpha(glow_alpha)
                     for dx in range(-glow_size, glow_size+1):
                         for dy in range(-glow_size, glow_size+1):
                             if abs(dx) == glow_size or abs(dy) == glow_size:
-                                glow_rect = icon_glow.get_rect(center=(card_x + card_width // 2 + dx, icon_y + dy))
-                                self.screen.blit(icon_glow, glow_rect)
+                                text_cache.draw(self.screen, icon_font, mode['icon'], icon_color,
+                                                (card_x + card_width // 2 + dx, icon_y + dy), "center", glow_alpha)
                 
                 # Main icon
-                icon_text = icon_font.render(mode['icon'], True, (255, 255, 255))
-                icon_rect = icon_text.get_rect(center=(card_x + card_width // 2, icon_y))
-                self.screen.blit(icon_text, icon_rect)
+                text_cache.draw(self.screen, icon_font, mode['icon'], (255, 255, 255), (card_x + card_width // 2, icon_y),
+                                "center")
                 
                 # Mode name with futuristic style
                 name_y = animated_rect.y + int(140 * config.SCALE)
                 name_color = mode['hover_color'] if is_hover else mode['color']
-                name_text = self.pixel_fonts['large'].render(mode['name'], True, name_color)
+                name_text = self._get_cached_text(mode['name'], 'large', name_color)
                 name_rect = name_text.get_rect(center=(card_x + card_width // 2, name_y))
                 self.screen.blit(name_text, name_rect)
                 
                 # Subtitle
                 subtitle_y = name_y + int(30 * config.SCALE)
-                subtitle_text = self.pixel_fonts['small'].render(mode['subtitle'], True, (180, 180, 180))
+                subtitle_text = self._get_cached_text(mode['subtitle'], 'small', (180, 180, 180))
                 subtitle_rect = subtitle_text.get_rect(center=(card_x + card_width // 2, subtitle_y))
                 self.screen.blit(subtitle_text, subtitle_rect)
                 
@@ -2964,7 +3005,7 @@ class Renderer:
                                      int(3 * config.SCALE))
                     
                     # Feature text
-                    feature_text = self.pixel_fonts['small'].render(feature, True, (220, 220, 220))
+                    feature_text = self._get_cached_text(feature, 'small', (220, 220, 220))
                     feature_rect = feature_text.get_rect(left=card_x + int(55 * config.SCALE), 
                                                         centery=feature_y)
                     self.screen.blit(feature_text, feature_rect)
@@ -3001,7 +3042,7 @@ class Renderer:
                     # Badge text with star icons
                     star = "★"
                     badge_text = f"{star} RECOMMENDED {star}"
-                    text_surf = self.pixel_fonts['tiny'].render(badge_text, True, (50, 50, 50))
+                    text_surf = self._get_cached_text(badge_text, 'tiny', (50, 50, 50))
                     text_rect = text_surf.get_rect(center=(card_x + card_width // 2, badge_y))
                     self.screen.blit(text_surf, text_rect)
             
@@ -3013,10 +3054,8 @@ class Renderer:
             
             # Create instruction surface for alpha
             inst_surf = pygame.Surface((config.WIDTH, 30), pygame.SRCALPHA)
-            inst_text_render = self.pixel_fonts['medium'].render(instruction_text, True, (150, 200, 255))
-            inst_text_render.set_alpha(inst_alpha)
-            inst_rect = inst_text_render.get_rect(center=(config.WIDTH // 2, 15))
-            inst_surf.blit(inst_text_render, inst_rect)
+            self.draw_text(instruction_text, 'medium', (150, 200, 255), (config.WIDTH // 2, 15), "center", inst_alpha,
+                           surface=inst_surf)
             self.screen.blit(inst_surf, (0, instruction_y))
             
             # Clean back button
@@ -3040,19 +3079,19 @@ class Renderer:
             game_center_x = config.WIDTH // 2
             game_center_y = config.HEIGHT // 2
         
-        text = self.pixel_fonts['huge'].render("TUTORIAL", True, config.WHITE)
+        text = self._get_cached_text("TUTORIAL", 'huge', config.WHITE)
         rect = text.get_rect(center=(game_center_x, game_center_y - 250 * config.SCALE))
         self.screen.blit(text, rect)
         
         page_text = f"Page {current_index + 1}/{total_pages}"
-        page_surface = self.pixel_fonts['small'].render(page_text, True, (200, 200, 200))
+        page_surface = self._get_cached_text(page_text, 'small', (200, 200, 200))
         page_rect = page_surface.get_rect(center=(game_center_x, game_center_y - 200 * config.SCALE))
         self.screen.blit(page_surface, page_rect)
         
         y = game_center_y - 150 * config.SCALE
         
         if "title" in tutorial_page:
-            title_surface = self.pixel_fonts['large'].render(tutorial_page["title"], True, (220, 190, 130))
+            title_surface = self._get_cached_text(tutorial_page["title"], 'large', (220, 190, 130))
             title_rect = title_surface.get_rect(center=(game_center_x, y))
             self.screen.blit(title_surface, title_rect)
             y += 50 * config.SCALE
@@ -3067,7 +3106,7 @@ class Renderer:
                     else:
                         color = (200, 200, 200)
                     
-                    text_surface = self.pixel_fonts['medium'].render(line, True, color)
+                    text_surface = self._get_cached_text(line, 'medium', color)
                     text_rect = text_surface.get_rect(center=(game_center_x, y))
                     self.screen.blit(text_surface, text_rect)
                 y += 35 * config.SCALE
@@ -3086,38 +3125,38 @@ class Renderer:
         for square in story_tutorial.get_highlight_squares():
             col, row = square  # Tutorial stores as (col, row)
             # Use the same positioning calculation as board.get_square_pos() but with scaling
-            border_left_scaled = int(config.BOARD_BORDER_LEFT * self.scale)
-            border_top_scaled = int(config.BOARD_BORDER_TOP * self.scale)
-            square_size_scaled = int(config.SQUARE_SIZE * self.scale)
+            border_left = config.BOARD_BORDER_LEFT
+            border_top = config.BOARD_BORDER_TOP
+            square_size = config.SQUARE_SIZE
             
-            x = config.BOARD_OFFSET_X + border_left_scaled + col * square_size_scaled
-            y = config.BOARD_OFFSET_Y + border_top_scaled + row * square_size_scaled
+            x = config.BOARD_OFFSET_X + border_left + col * square_size
+            y = config.BOARD_OFFSET_Y + border_top + row * square_size
             
             # Center of the square
-            center_x = x + square_size_scaled // 2
-            center_y = y + square_size_scaled // 2
+            center_x = x + square_size // 2
+            center_y = y + square_size // 2
             
             # Create pulsing highlight with cleaner pixel-art style
             pulse = (pygame.time.get_ticks() // 150) % 20  # Smoother pulsing
             pulse_factor = abs(10 - pulse) / 10.0  # Creates smooth in-out pulse
             
             # Draw a cleaner double-ring highlight
-            outer_radius = int(square_size_scaled * 0.42)
-            inner_radius = int(square_size_scaled * 0.35)
+            outer_radius = int(square_size * 0.42)
+            inner_radius = int(square_size * 0.35)
             
             # Outer ring with subtle glow (just one clean layer)
             glow_alpha = int(80 + pulse_factor * 40)
-            glow_surf = pygame.Surface((square_size_scaled * 2, square_size_scaled * 2), pygame.SRCALPHA)
+            glow_surf = pygame.Surface((square_size * 2, square_size * 2), pygame.SRCALPHA)
             pygame.draw.circle(glow_surf, (200, 180, 100, glow_alpha), 
-                             (square_size_scaled, square_size_scaled), outer_radius, 2)
-            self.screen.blit(glow_surf, (center_x - square_size_scaled, center_y - square_size_scaled))
+                             (square_size, square_size), outer_radius, 2)
+            self.screen.blit(glow_surf, (center_x - square_size, center_y - square_size))
             
             # Main highlight ring (solid, clean edges)
             ring_alpha = int(180 + pulse_factor * 75)
             pygame.draw.circle(self.screen, (220, 190, 130, ring_alpha), (center_x, center_y), inner_radius, 3)
             
             # Inner dot for emphasis
-            dot_radius = int(3 * self.scale)
+            dot_radius = 3
             pygame.draw.circle(self.screen, (230, 210, 160), (center_x, center_y), dot_radius)
         
         # Draw highlight for powerup buttons
@@ -3185,7 +3224,7 @@ class Renderer:
             lines = self._wrap_text(instruction, self.pixel_fonts['medium'], panel_width - 20)
             y_offset = 15
             for line in lines:
-                text_surf = self.pixel_fonts['medium'].render(line, True, (255, 255, 255))
+                text_surf = self._get_cached_text(line, 'medium', (255, 255, 255))
                 text_rect = text_surf.get_rect(centerx=config.WIDTH // 2, y=panel_y + y_offset)
                 self.screen.blit(text_surf, text_rect)
                 y_offset += 25
@@ -3220,7 +3259,7 @@ class Renderer:
         
         # Simple background
         if hasattr(self.assets, 'arms_background') and self.assets.arms_background:
-            scaled_bg = pygame.transform.scale(self.assets.arms_background, (config.WIDTH, config.HEIGHT))
+            scaled_bg = transform_cache.scale(self.assets.arms_background, (config.WIDTH, config.HEIGHT))
             self.screen.blit(scaled_bg, (0, 0))
         else:
             # Simple dark background
@@ -3239,7 +3278,7 @@ class Renderer:
             aspect_ratio = self.assets.tariq_image.get_width() / self.assets.tariq_image.get_height()
             tariq_width = int(tariq_height * aspect_ratio)
             
-            scaled_tariq = pygame.transform.smoothscale(self.assets.tariq_image, (tariq_width, tariq_height))
+            scaled_tariq = transform_cache.scale(self.assets.tariq_image, (tariq_width, tariq_height), smooth=True)
             
             # Apply fade effect to Tariq
             if fade_progress < 1.0:
@@ -3279,7 +3318,7 @@ class Renderer:
         title_text = "TARIQ'S ARMORY"
         title_y = game_center_y - 280 * config.SCALE
         
-        title_surface = self.pixel_fonts['huge'].render(title_text, True, (255, 255, 255))
+        title_surface = self._get_cached_text(title_text, 'huge', (255, 255, 255))
         title_rect = title_surface.get_rect(center=(game_center_x, title_y))
         self.screen.blit(title_surface, title_rect)
         
@@ -3287,7 +3326,7 @@ class Renderer:
         money = config.get_money()
         
         money_text = f"Money: ${money:,}"
-        money_surface = self.pixel_fonts['large'].render(money_text, True, (220, 190, 130))
+        money_surface = self._get_cached_text(money_text, 'large', (220, 190, 130))
         money_rect = money_surface.get_rect(center=(game_center_x, title_y + 60))
         self.screen.blit(money_surface, money_rect)
         
@@ -3304,12 +3343,12 @@ class Renderer:
         powerup_keys = ["shield", "gun", "airstrike", "paratroopers", "chopper"]
         
         # Calculate positions for simple row arrangement - smaller cards
-        card_width = 100 * self.scale
-        card_height = 140 * self.scale
-        card_spacing = 15 * self.scale
+        card_width = 100
+        card_height = 140
+        card_spacing = 15
         total_width = len(powerup_keys) * card_width + (len(powerup_keys) - 1) * card_spacing
-        start_x = game_center_x - total_width / 2 + 100 * self.scale  # Shift right
-        card_y = game_center_y - 80 * self.scale
+        start_x = game_center_x - total_width / 2 + 100  # Shift right
+        card_y = game_center_y - 80
         
         shop_buttons.clear()
         
@@ -3398,7 +3437,7 @@ class Renderer:
                 pygame.draw.rect(self.screen, (255, 215, 0), card_rect, thickness, border_radius=5)
                 
                 # Add "CLICK ME!" text
-                click_text = self.pixel_fonts['small'].render("CLICK TO UNLOCK!", True, (220, 190, 130))
+                click_text = self._get_cached_text("CLICK TO UNLOCK!", 'small', (220, 190, 130))
                 click_rect = click_text.get_rect(center=(card_rect.centerx, card_rect.top - 20))
                 self.screen.blit(click_text, click_rect)
             
@@ -3407,7 +3446,7 @@ class Renderer:
             
             if powerup_key == "gun" and hasattr(self, 'assets') and hasattr(self.assets, 'revolver_image') and self.assets.revolver_image:
                 icon_size = 40
-                scaled_revolver = pygame.transform.scale(self.assets.revolver_image, (icon_size, icon_size))
+                scaled_revolver = transform_cache.scale(self.assets.revolver_image, (icon_size, icon_size))
                 icon_rect = scaled_revolver.get_rect(center=(card_rect.centerx, icon_y))
                 self.screen.blit(scaled_revolver, icon_rect)
             elif powerup_key == "shield":
@@ -3425,8 +3464,8 @@ class Renderer:
             # Special handling for very long names
             if powerup_key == "chopper":
                 # Split "CHOPPER GUNNER" into two lines with less spacing
-                line1_surface = self.pixel_fonts['small'].render("CHOPPER", True, (255, 255, 255))
-                line2_surface = self.pixel_fonts['small'].render("GUNNER", True, (255, 255, 255))
+                line1_surface = self._get_cached_text("CHOPPER", 'small', (255, 255, 255))
+                line2_surface = self._get_cached_text("GUNNER", 'small', (255, 255, 255))
                 line1_rect = line1_surface.get_rect(center=(card_rect.centerx, card_rect.centery + 12))
                 line2_rect = line2_surface.get_rect(center=(card_rect.centerx, card_rect.centery + 28))
                 self.screen.blit(line1_surface, line1_rect)
@@ -3435,32 +3474,32 @@ class Renderer:
                 # Use extra small font for PARATROOPERS
                 # Try using tiny font if available, otherwise use small
                 if 'tiny' in self.pixel_fonts:
-                    name_surface = self.pixel_fonts['tiny'].render(powerup_name, True, (255, 255, 255))
+                    name_surface = self._get_cached_text(powerup_name, 'tiny', (255, 255, 255))
                 else:
-                    name_surface = self.pixel_fonts['small'].render(powerup_name, True, (255, 255, 255))
+                    name_surface = self._get_cached_text(powerup_name, 'small', (255, 255, 255))
                 name_rect = name_surface.get_rect(center=(card_rect.centerx, card_rect.centery + 20))
                 self.screen.blit(name_surface, name_rect)
             else:
                 # Check if name fits in card width
-                test_surface = self.pixel_fonts['medium'].render(powerup_name, True, (255, 255, 255))
+                test_surface = self._get_cached_text(powerup_name, 'medium', (255, 255, 255))
                 if test_surface.get_width() > card_width - 20:
                     # Use small font for long names with more padding
-                    name_surface = self.pixel_fonts['small'].render(powerup_name, True, (255, 255, 255))
+                    name_surface = self._get_cached_text(powerup_name, 'small', (255, 255, 255))
                 else:
                     # Use medium font for short names
-                    name_surface = self.pixel_fonts['medium'].render(powerup_name, True, (255, 255, 255))
+                    name_surface = self._get_cached_text(powerup_name, 'medium', (255, 255, 255))
                 name_rect = name_surface.get_rect(center=(card_rect.centerx, card_rect.centery + 20))
                 self.screen.blit(name_surface, name_rect)
             
             # Simple price/status display
             if is_unlocked:
-                owned_text = self.pixel_fonts['small'].render("OWNED", True, (100, 255, 100))
+                owned_text = self._get_cached_text("OWNED", 'small', (100, 255, 100))
                 owned_rect = owned_text.get_rect(center=(card_rect.centerx, card_rect.bottom - 30))
                 self.screen.blit(owned_text, owned_rect)
             else:
                 price_text = f"${price}"
                 price_color = (255, 255, 255) if can_afford else (150, 150, 150)
-                price_surface = self.pixel_fonts['medium'].render(price_text, True, price_color)
+                price_surface = self._get_cached_text(price_text, 'medium', price_color)
                 price_rect = price_surface.get_rect(center=(card_rect.centerx, card_rect.bottom - 30))
                 self.screen.blit(price_surface, price_rect)
         
@@ -3484,15 +3523,15 @@ class Renderer:
                 lines = self._wrap_text(instruction, self.pixel_fonts['medium'], panel_width - 20)
                 y_offset = 15
                 for line in lines:
-                    text_surf = self.pixel_fonts['medium'].render(line, True, (255, 255, 255))
+                    text_surf = self._get_cached_text(line, 'medium', (255, 255, 255))
                     text_rect = text_surf.get_rect(centerx=config.WIDTH // 2, y=panel_y + y_offset)
                     self.screen.blit(text_surf, text_rect)
                     y_offset += 25
         else:
             # Normal instruction text when not in tutorial
             inst_text = "Click on items to purchase. Click Tariq for more info!"
-            inst_surface = self.pixel_fonts['small'].render(inst_text, True, (255, 255, 255))
-            inst_rect = inst_surface.get_rect(center=(game_center_x, game_center_y + 180 * self.scale))
+            inst_surface = self._get_cached_text(inst_text, 'small', (255, 255, 255))
+            inst_rect = inst_surface.get_rect(center=(game_center_x, game_center_y + 180))
             self.screen.blit(inst_surface, inst_rect)
         
         # Simple back button
@@ -3509,8 +3548,8 @@ class Renderer:
             use_typewriter: Whether to use typewriter effect for the text
             text_id: ID for typewriter effect tracking
         """
-        padding = int(20 * self.scale)
-        line_height = int(20 * self.scale)
+        padding = 20
+        line_height = 20
         
         words = text.split(' ')
         lines = []
@@ -3518,7 +3557,7 @@ class Renderer:
         
         for word in words:
             test_line = ' '.join(current_line + [word])
-            text_surface = self.pixel_fonts['small'].render(test_line, True, config.BLACK)
+            text_surface = self._get_cached_text(test_line, 'small', config.BLACK)
             if text_surface.get_width() > width - 2 * padding:
                 if current_line:
                     lines.append(' '.join(current_line))
@@ -3563,7 +3602,7 @@ class Renderer:
         else:
             # Draw text normally
             for i, line in enumerate(lines):
-                text_surface = self.pixel_fonts['small'].render(line, True, config.BLACK)
+                text_surface = self._get_cached_text(line, 'small', config.BLACK)
                 text_rect = text_surface.get_rect(centerx=x + width // 2, 
                                                  y=y + padding + i * line_height)
                 self.screen.blit(text_surface, text_rect)
@@ -3954,10 +3993,10 @@ class Renderer:
             for x in range(0, config.WIDTH, spacing):
                 columns.append({
                     'x': x,
-                    'y': random.randint(-config.HEIGHT, 0),
-                    'speed': random.uniform(2, 6),
-                    'chars': [chr(random.randint(33, 126)) for _ in range(20)],
-                    'length': random.randint(10, 20)
+                    'y': _rng.randint(-config.HEIGHT, 0),
+                    'speed': _rng.uniform(2, 6),
+                    'chars': [chr(_rng.randint(33, 126)) for _ in range(20)],
+                    'length': _rng.randint(10, 20)
                 })
             setattr(self, column_attr, columns)
         
@@ -3977,10 +4016,10 @@ class Renderer:
             
             # Reset column when it goes off screen
             if col['y'] > config.HEIGHT + 200:
-                col['y'] = random.randint(-400, -100)
-                col['speed'] = random.uniform(2, 6)
-                col['chars'] = [chr(random.randint(33, 126)) for _ in range(20)]
-                col['length'] = random.randint(10, 20)
+                col['y'] = _rng.randint(-400, -100)
+                col['speed'] = _rng.uniform(2, 6)
+                col['chars'] = [chr(_rng.randint(33, 126)) for _ in range(20)]
+                col['length'] = _rng.randint(10, 20)
             
             # Draw characters in column
             for i in range(col['length']):
@@ -3996,12 +4035,12 @@ class Renderer:
                         alpha = int(200 * fade)
                     
                     # Change character occasionally
-                    if random.random() < 0.1:
-                        col['chars'][i % len(col['chars'])] = chr(random.randint(33, 126))
+                    if _rng.random() < 0.1:
+                        col['chars'][i % len(col['chars'])] = chr(_rng.randint(33, 126))
                     
                     # Draw character
                     if 'tiny' in self.pixel_fonts:
-                        char_surf = self.pixel_fonts['tiny'].render(col['chars'][i % len(col['chars'])], True, (*color, alpha))
+                        char_surf = self._get_cached_text(col['chars'][i % len(col['chars'])], 'tiny', (*color, alpha))
                         rain_surf.blit(char_surf, (col['x'], char_y))
         
         self.screen.blit(rain_surf, (0, 0))
@@ -4037,7 +4076,7 @@ class Renderer:
         
         # Affiliation text
         aff_text = affiliation
-        aff_surf = self.pixel_fonts['tiny'].render(aff_text, True, (255, 255, 255))
+        aff_surf = self._get_cached_text(aff_text, 'tiny', (255, 255, 255))
         sheet_surf.blit(aff_surf, (90, badge_y + 5))
         
         # Information fields
@@ -4065,7 +4104,7 @@ class Renderer:
         diff = battle_data.get("difficulty", "unknown")
         diff_text = f"DIFFICULTY: {diff.upper()}"
         diff_color = {"easy": (100, 255, 100), "medium": (255, 255, 100), "hard": (255, 100, 100)}.get(diff, (200, 200, 200))
-        diff_surf = self.pixel_fonts['small'].render(diff_text, True, diff_color)
+        diff_surf = self._get_cached_text(diff_text, 'small', diff_color)
         sheet_surf.blit(diff_surf, (20, sheet_height - 30))
         
         # Blit the sheet to screen
@@ -4073,10 +4112,10 @@ class Renderer:
     
     def _draw_info_field(self, surface, label, value, x, y, color):
         """Draw an information field with label and value."""
-        label_surf = self.pixel_fonts['tiny'].render(label, True, (150, 150, 150))
+        label_surf = self._get_cached_text(label, 'tiny', (150, 150, 150))
         surface.blit(label_surf, (x, y))
         
-        value_surf = self.pixel_fonts['small'].render(value, True, color)
+        value_surf = self._get_cached_text(value, 'small', color)
         surface.blit(value_surf, (x + 60, y - 2))
     
     def _get_affiliation_color(self, affiliation):
@@ -4120,13 +4159,13 @@ class Renderer:
         self.story_mode_scroll_offset += 2.0  # Constant rightward scroll speed
         
         # Spawn new capybara occasionally (every 8-15 seconds)
-        spawn_interval = random.randint(8000, 15000) if self.last_capybara_spawn == 0 else 8000
+        spawn_interval = _rng.randint(8000, 15000) if self.last_capybara_spawn == 0 else 8000
         if current_time - self.last_capybara_spawn > spawn_interval:
             # Spawn capybara just off-screen to the left
             self.sitting_capybaras.append({
                 'world_x': -150 + self.story_mode_scroll_offset,  # World position (off-screen left)
-                'size': random.randint(45, 65),
-                'flip': random.choice([True, False])
+                'size': _rng.randint(45, 65),
+                'flip': _rng.choice([True, False])
             })
             self.last_capybara_spawn = current_time
         
@@ -4144,10 +4183,8 @@ class Renderer:
                 continue
             
             # Draw sitting capybara
-            capy_scaled = pygame.transform.smoothscale(self.assets.capy_image, 
-                                                      (capy['size'], capy['size']))
-            if capy['flip']:
-                capy_scaled = pygame.transform.flip(capy_scaled, True, False)
+            capy_scaled = transform_cache.get(self.assets.capy_image, (capy['size'], capy['size']),
+                                              flip_x=capy['flip'], smooth=True)
             
             self.screen.blit(capy_scaled, (int(screen_x), int(capy_y)))
         
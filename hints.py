@@ -0,0 +1,96 @@
+"""
+Hint and Analysis Service
+Runs a multi-PV search for the human player in a background thread
+"""
+
+import threading
+from ai import ChessAI
+
+# Analysis stops after this depth or this much time, whichever comes first
+HINT_MAX_DEPTH = 4
+HINT_MAX_TIME_MS = 5000
+
+# Number of candidate moves shown to the player
+HINT_LINES = 3
+
+# Positions remembered before the oldest analysis is dropped
+HINT_CACHE_SIZE = 128
+
+
+class HintService:
+    def __init__(self):
+        # {position key: {"depth": n, "lines": [(score, move), ...]}}, best line first
+        self.cache = {}
+        self.position_key = None
+        self._searcher = None
+        self._lock = threading.Lock()
+        
+    def _key_for(self, board):
+        """Cache key for a position: the board hash, which covers the shields in play."""
+        return board.position_hash()
+        
+    def request(self, board, ai):
+        """Make sure the position on board is being (or has been) analysed.
+        
+        Cheap to call every frame. A new position cancels the old search and
+        continues from the deepest cached result, so revisiting a position
+        picks up where the last analysis stopped.
+        """
+        key = self._key_for(board)
+        if key == self.position_key:
+            return
+            
+        self.cancel()
+        self.position_key = key
+        
+        cached = self.cache.get(key)
+        start_depth = cached["depth"] + 1 if cached else 1
+        if start_depth > HINT_MAX_DEPTH:
+            return
+            
+        # Own searcher per job so cancelling never races with the AI's search
+        # state, but share the AI's transposition table
+        searcher = ChessAI(ai.difficulty)
+        searcher.transposition_table = ai.transposition_table
+        searcher.yield_gil = True  # Runs during the player's turn, alongside the frame loop
+        searcher._begin_search(0, HINT_MAX_TIME_MS)
+        self._searcher = searcher
+        
+        worker = threading.Thread(
+            target=self._analyse,
+            args=(searcher, board.clone(), key, start_depth),
+            daemon=True
+        )
+        worker.start()
+        
+    def _analyse(self, searcher, board, key, start_depth):
+        """Worker thread: deepen one ply at a time, publishing each finished depth."""
+        color = 'w' if board.current_turn == "white" else 'b'
+        for depth in range(start_depth, HINT_MAX_DEPTH + 1):
+            lines = searcher.analyse_position(board, depth, color)
+            if lines is None:
+                break  # Cancelled or out of time
+                
+            with self._lock:
+                self.cache[key] = {"depth": depth, "lines": lines}
+                if len(self.cache) > HINT_CACHE_SIZE:
+                    del self.cache[next(iter(self.cache))]
+    
+    def cancel(self):
+        """Stop the running analysis, if any."""
+        if self._searcher:
+            self._searcher.search_aborted = True
+            self._searcher = None
+        self.position_key = None
+        
+    def get_analysis(self):
+        """Deepest finished analysis of the requested position, or None."""
+        with self._lock:
+            return self.cache.get(self.position_key)
+    
+    def get_hint_lines(self):
+        """Top HINT_LINES (score, move) pairs for the requested position."""
+        analysis = self.get_analysis()
+        if not analysis:
+            return []
+        return analysis["lines"][:HINT_LINES]
@@ -0,0 +1,102 @@
+"""
+HUD Layer for the Game Screen
+Keeps the translucent frame around the board and the text drawn on it, rebuilt only when what it shows changes
+"""
+
+import pygame
+import config
+
+PANEL_COLOR = (0, 0, 0)
+PANEL_ALPHA = 200
+
+
+class HudLayer:
+    """Frame panels, turn and opponent text, captured pieces and the move hint, as ready-made blits."""
+    
+    def __init__(self, renderer):
+        self.renderer = renderer
+        self.frame = []
+        self.key = None
+        self.blits = []
+        
+    def draw_frame(self, target):
+        """Dim everything around the board with four cached panels."""
+        if not self.frame:
+            self._build_frame()
+        target.blits(self.frame, doreturn=False)
+        
+    def _build_frame(self):
+        board_size = config.BOARD_SIZE
+        board_left = config.BOARD_OFFSET_X
+        board_top = config.BOARD_OFFSET_Y
+        board_right = board_left + board_size
+        board_bottom = board_top + board_size
+        
+        panels = [
+            pygame.Rect(0, 0, config.WIDTH, board_top),
+            pygame.Rect(0, board_bottom, config.WIDTH, config.HEIGHT - board_bottom),
+            pygame.Rect(0, board_top, board_left, board_size),
+            pygame.Rect(board_right, board_top, config.WIDTH - board_right, board_size)
+        ]
+        self.frame = [(self.renderer._get_cached_overlay(rect.width, rect.height, PANEL_COLOR, PANEL_ALPHA), rect.topleft)
+                      for rect in panels if rect.width > 0 and rect.height > 0]
+        
+    def draw(self, target, board, ai=None, difficulty=None, show_captured=True):
+        """Blit the HUD text and captured pieces, re-rendering them only if their inputs changed."""
+        thinking = bool(ai) and board.current_turn == "black" and ai.is_thinking()
+        key = (
+            board.current_turn, bool(ai), thinking, difficulty, show_captured,
+            tuple(board.captured_pieces["white"]), tuple(board.captured_pieces["black"])
+        )
+        if key != self.key:
+            self._build(board, ai, difficulty, show_captured, thinking)
+            self.key = key
+        target.blits(self.blits, doreturn=False)
+        
+    def _build(self, board, ai, difficulty, show_captured, thinking):
+        renderer = self.renderer
+        board_top = config.BOARD_OFFSET_Y
+        board_bottom = config.BOARD_OFFSET_Y + config.BOARD_SIZE
+        blits = []
+        
+        if thinking:
+            turn_text = "AI IS THINKING..."
+        else:
+            turn_text = f"CURRENT TURN: {board.current_turn.upper()}"
+        text = renderer._get_cached_text(turn_text, 'large', config.WHITE)
+        blits.append((text, text.get_rect(center=(config.WIDTH // 2, board_top // 2))))
+        
+        if ai and difficulty:
+            elo_rating = config.AI_DIFFICULTY_ELO.get(difficulty, 1200)
+            diff_text = f"VS {config.AI_DIFFICULTY_NAMES[difficulty]} AI (ELO: {elo_rating})"
+            text = renderer._get_cached_text(diff_text, 'small', config.AI_DIFFICULTY_COLORS[difficulty])
+            blits.append((text, text.get_rect(center=(config.WIDTH // 2, board_top // 2 + 25))))
+            
+        if show_captured:
+            small_pieces = renderer._small_pieces()
+            y_position = board_top + 10
+            for color in ("white", "black"):
+                captured = board.captured_pieces[color]
+                if not captured:
+                    continue
+                title = renderer._get_cached_text(f"{color.upper()} CAPTURED:", 'medium', config.WHITE)
+                blits.append((title, (10, y_position)))
+                
+                # Up to twelve pieces, four to a row
+                y_offset = y_position + 30
+                for i, piece in enumerate(captured[:12]):
+                    small = small_pieces.get(piece)
+                    if small:
+                        blits.append((small, (10 + (i % 4) * 35, y_offset + (i // 4) * 35)))
+                
+                rows_used = min(3, (len(captured) + 3) // 4)
+                y_position = y_offset + rows_used * 35 + 20
+        
+        if ai and board.current_turn == "black":
+            info_text = "AI IS PLAYING..."
+        else:
+            info_text = "DRAG TO MOVE - CLICK TO SELECT"
+        text = renderer._get_cached_text(info_text, 'small', config.WHITE)
+        blits.append((text, text.get_rect(center=(config.WIDTH // 2, board_bottom + (config.HEIGHT - board_bottom) // 2))))
+        
+        self.blits = blits
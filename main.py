@@ -5,7 +5,10 @@ A chess game with special abilities by Thomas Kantecki
 
 import pygame
 import sys
+import rng
 from game import ChessGame
+from profiler import profiler
+from framepacing import pacer
 
 def print_game_info():
     """Print game information and controls."""
@@ -28,14 +31,24 @@ def print_game_info():
     print("- ESC to cancel active powerup")
     print("- F for fullscreen mode")
     print("- Shift+T for test mode (cheat)")
+    print("- F3 for the frame profiler, F4 to save its trace")
     print("=" * 50)
 
-def main(show_info=True):
+def main(show_info=True, opponent_command=None, seed=None, profile=False, vsync=None, pacing=None, adaptive=None,
+         fullscreen=None):
     """Main entry point for the chess game.
     
     Args:
         show_info: Whether to display game information at startup
+        opponent_command: Command line of a UCI engine to play against instead of the built-in AI
+        seed: Master seed for all random streams; a fresh one is picked if None
+        profile: Start with the frame profiler and its overlay on
+        vsync, pacing, adaptive, fullscreen: Display overrides; None keeps the config.py setting
     """
+    # Seed before anything draws random numbers, and report it so the run can be replayed
+    seed = rng.set_seed(seed)
+    print(f"Random seed: {seed}")
+    
     # Initialize Pygame
     pygame.init()
     pygame.mixer.init()
@@ -45,7 +58,10 @@ def main(show_info=True):
         print_game_info()
     
     # Create and run the game
-    game = ChessGame()
+    pacer.configure(mode=pacing, adaptive=adaptive, vsync=vsync, fullscreen=fullscreen)
+    game = ChessGame(opponent_command)
+    if profile:
+        profiler.toggle()
     game.run()
     
     # Cleanup
@@ -57,6 +73,15 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description='Checkmate Protocol - Chess with Powerups')
     parser.add_argument('--no-info', action='store_true', help='Skip displaying game info at startup')
+    parser.add_argument('--uci-opponent', metavar='COMMAND', help='Play against an external UCI engine (e.g. "stockfish")')
+    parser.add_argument('--seed', type=int, help='Master random seed, to replay identical AI decisions and effects')
+    parser.add_argument('--profile', action='store_true', help='Start with the frame profiler overlay on (F3 toggles it)')
+    parser.add_argument('--vsync', action='store_true', default=None, help='Sync frames to the monitor refresh rate')
+    parser.add_argument('--pacing', choices=['sleep', 'busy'], help='Wait between frames by sleeping or busy-waiting')
+    parser.add_argument('--fixed-fps', dest='adaptive', action='store_false', default=None,
+                        help='Keep full frame rate on static screens')
+    parser.add_argument('--fullscreen', action='store_true', default=None, help='Start in fullscreen mode (F toggles it)')
     args = parser.parse_args()
     
-    main(show_info=not args.no_info)
\ No newline at end of file
+    main(show_info=not args.no_info, opponent_command=args.uci_opponent, seed=args.seed, profile=args.profile,
+         vsync=args.vsync, pacing=args.pacing, adaptive=args.adaptive, fullscreen=args.fullscreen)
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Pawn Structure Evaluation
+Doubled, isolated and passed pawn terms, cached in a small table keyed by the pawn-only hash
+"""
+
+from board import MAILBOX, PAWN, WHITE, BLACK
+
+# Table slots; must be a power of two so the key can be masked into an index
+PAWN_TABLE_SIZE = 4096
+
+DOUBLED_PAWN_PENALTY = 15
+ISOLATED_PAWN_PENALTY = 12
+
+# Passed pawn bonus by rank counted from the pawn's own side (0 is the back
+# rank, 7 the promotion rank; a pawn is never on either)
+PASSED_PAWN_BONUS = [0, 10, 15, 25, 40, 60, 90, 0]
+
+
+class PawnStructureEvaluator:
+    def __init__(self, size=PAWN_TABLE_SIZE):
+        self.mask = size - 1
+        self.keys = [None] * size
+        self.scores = [0] * size
+        self.probes = 0
+        self.hits = 0
+        
+    def evaluate(self, board):
+        """Pawn structure score from black's perspective (the AI plays black)."""
+        key = board.pawn_hash
+        index = key & self.mask
+        self.probes += 1
+        if self.keys[index] == key:
+            self.hits += 1
+            return self.scores[index]
+            
+        score = self._score_structure(board)
+        self.keys[index] = key
+        self.scores[index] = score
+        return score
+        
+    def hit_rate(self):
+        """Fraction of evaluations answered from the table."""
+        return self.hits / self.probes if self.probes else 0.0
+        
+    def _score_structure(self, board):
+        """Compute the pawn terms from scratch."""
+        # Rows of each colour's pawns, per file
+        files = {'w': [[] for _ in range(8)], 'b': [[] for _ in range(8)]}
+        white_pawn = WHITE | PAWN
+        black_pawn = BLACK | PAWN
+        squares = board.squares
+        for index, square in enumerate(MAILBOX):
+            code = squares[square]
+            if code == white_pawn:
+                files['w'][index & 7].append(index >> 3)
+            elif code == black_pawn:
+                files['b'][index & 7].append(index >> 3)
+        return score_pawn_files(files)
+
+
+def score_pawn_files(files):
+    """Pawn structure score from black's perspective for {'w'/'b': [rows of that colour's pawns, per file]}."""
+    totals = {'w': 0, 'b': 0}
+    for color, enemy in (('w', 'b'), ('b', 'w')):
+        own_files = files[color]
+        enemy_files = files[enemy]
+        for col in range(8):
+            pawns = own_files[col]
+            if not pawns:
+                continue
+                
+            # Doubled: every extra pawn on the same file
+            totals[color] -= DOUBLED_PAWN_PENALTY * (len(pawns) - 1)
+            
+            # Isolated: no friendly pawns on either neighbouring file
+            neighbours = [c for c in (col - 1, col + 1) if 0 <= c < 8]
+            if not any(own_files[c] for c in neighbours):
+                totals[color] -= ISOLATED_PAWN_PENALTY * len(pawns)
+                
+            # Passed: no enemy pawn ahead on this or a neighbouring file
+            for row in pawns:
+                blocked = False
+                for c in [col] + neighbours:
+                    for enemy_row in enemy_files[c]:
+                        if (enemy_row < row) if color == 'w' else (enemy_row > row):
+                            blocked = True
+                            break
+                    if blocked:
+                        break
+                if not blocked:
+                    totals[color] += PASSED_PAWN_BONUS[7 - row if color == 'w' else row]
+    
+    return totals['b'] - totals['w']
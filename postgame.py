@@ -0,0 +1,201 @@
+"""
+Post-Game Analysis
+Scores every move of a finished game in a process pool and flags mistakes
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from board import ChessBoard
+from ai import ChessAI
+
+ANALYSIS_DIR = "analysis"
+POSITION_CACHE_FILE = os.path.join(ANALYSIS_DIR, "positions.json")
+
+# Fixed search depth for every position, so results can be shared between games
+ANALYSIS_DEPTH = 2
+
+# Positions kept in the shared cache before the oldest are dropped
+POSITION_CACHE_SIZE = 20000
+
+# Centipawns lost against the best move before a move is flagged
+MISTAKE_THRESHOLD = 100
+BLUNDER_THRESHOLD = 300
+
+
+def _analyse_position(snapshot, depth):
+    """Worker process: score every move of one position at a fixed depth.
+    
+    Returns [[score, [from_row, from_col, to_row, to_col]], ...], best first,
+    with scores from the side to move's point of view.
+    """
+    board = ChessBoard.from_snapshot(snapshot)
+    searcher = ChessAI("very_hard")
+    searcher._begin_search(0, 0)
+    color = 'w' if board.current_turn == "white" else 'b'
+    lines = searcher.analyse_position(board, depth, color) or []
+    return [[int(score), [move[0][0], move[0][1], move[1][0], move[1][1]]] for score, move in lines]
+
+
+def _load_json(path, default):
+    """Read a JSON file, falling back to default if missing or unreadable."""
+    try:
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"Error loading {path}: {e}")
+    return default
+
+
+def _save_json(path, data):
+    """Write a JSON file, creating the analysis directory if needed."""
+    try:
+        os.makedirs(ANALYSIS_DIR, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f)
+    except Exception as e:
+        print(f"Error saving {path}: {e}")
+
+
+class PostGameAnalysis:
+    def __init__(self, move_history, game_id=None, depth=ANALYSIS_DEPTH):
+        self.move_history = move_history
+        # Same moves from the same positions give the same id, so replays hit the game file
+        self.game_id = game_id or hashlib.sha1(json.dumps(
+            [(ply["before"]["key"], ply["move"]) for ply in move_history]
+        ).encode()).hexdigest()[:16]
+        self.depth = depth
+        
+        # One entry per ply: eval before the move (white's view), centipawn
+        # loss, best alternative and "mistake"/"blunder"/None
+        self.results = [None] * len(move_history)
+        self.complete = False
+        
+        self._position_cache = {}
+        self._executor = None
+        self._pending = {}  # {future: position key}
+        
+    def _game_file(self):
+        return os.path.join(ANALYSIS_DIR, f"game_{self.game_id}.json")
+        
+    def _cache_key(self, ply):
+        return f"{ply['before']['key']}:{self.depth}"
+        
+    def start(self):
+        """Queue the game for analysis without blocking the caller.
+        
+        A game analysed before is loaded from its own file. Otherwise only
+        positions missing from the cache shared across games are searched,
+        each once, however often it occurred.
+        """
+        saved = _load_json(self._game_file(), None)
+        if saved and saved.get("depth") == self.depth and len(saved.get("results", [])) == len(self.results):
+            self.results = saved["results"]
+            self.complete = True
+            return
+            
+        self._position_cache = _load_json(POSITION_CACHE_FILE, {})
+        
+        needed = {}
+        for ply in self.move_history:
+            key = self._cache_key(ply)
+            if key not in self._position_cache and key not in needed:
+                needed[key] = ply["before"]
+        
+        if needed:
+            self._executor = ProcessPoolExecutor(max_workers=max(1, min(len(needed), (os.cpu_count() or 2) - 1)))
+            for key, snapshot in needed.items():
+                future = self._executor.submit(_analyse_position, snapshot, self.depth)
+                self._pending[future] = key
+        
+        self.poll()
+        
+    def poll(self):
+        """Collect finished positions. Call once per frame; never blocks."""
+        if self.complete:
+            return
+            
+        for future in [f for f in self._pending if f.done()]:
+            key = self._pending.pop(future)
+            try:
+                self._position_cache[key] = future.result()
+            except Exception as e:
+                print(f"Post-game analysis failed for position {key}: {e}")
+                self._position_cache[key] = []
+        
+        for index, ply in enumerate(self.move_history):
+            if self.results[index] is None:
+                lines = self._position_cache.get(self._cache_key(ply))
+                if lines is not None:
+                    self.results[index] = self._judge(ply, lines)
+        
+        if not self._pending:
+            self._finish()
+    
+    def _judge(self, ply, lines):
+        """Compare the played move with the best line for one ply."""
+        color = ply["before"]["current_turn"]
+        if not lines:
+            return {"eval": 0, "loss": 0, "best_move": None, "classification": None}
+            
+        best_score, best_move = lines[0]
+        (from_row, from_col), (to_row, to_col) = ply["move"]
+        played = [from_row, from_col, to_row, to_col]
+        played_score = best_score  # Moves outside the search (special rules) aren't judged
+        for score, move in lines:
+            if move == played:
+                played_score = score
+                break
+        
+        loss = best_score - played_score
+        if loss >= BLUNDER_THRESHOLD:
+            classification = "blunder"
+        elif loss >= MISTAKE_THRESHOLD:
+            classification = "mistake"
+        else:
+            classification = None
+            
+        return {
+            "eval": best_score if color == "white" else -best_score,
+            "loss": loss,
+            "best_move": best_move,
+            "classification": classification
+        }
+        
+    def _finish(self):
+        """Shut the pool down and write the game and shared caches to disk."""
+        self.complete = True
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            
+        _save_json(self._game_file(), {
+            "depth": self.depth,
+            "moves": [ply["move"] for ply in self.move_history],
+            "results": self.results
+        })
+        
+        # Keep the newest positions when the shared cache grows too large
+        if len(self._position_cache) > POSITION_CACHE_SIZE:
+            keys = list(self._position_cache)[-POSITION_CACHE_SIZE:]
+            self._position_cache = {key: self._position_cache[key] for key in keys}
+        _save_json(POSITION_CACHE_FILE, self._position_cache)
+        
+    def cancel(self):
+        """Abandon the analysis (e.g. when a new game starts)."""
+        if self._executor:
+            # shutdown's cancel_futures needs Python 3.9, so cancel the queued jobs here
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._pending = {}
+        self.complete = True
+        
+    def progress(self):
+        """Fraction of plies analysed so far."""
+        if not self.results:
+            return 1.0
+        return sum(1 for result in self.results if result is not None) / len(self.results)
@@ -4,21 +4,24 @@ Handles all visual aspects of the powerup system
 """
 
 import pygame
+import random
 import math
 from config import *
+from targeting import board_grids, airstrike_value_map
+from transform_cache import transform_cache
 
 class PowerupRenderer:
     def __init__(self, screen, renderer, powerup_system):
         self.screen = screen
         self.renderer = renderer  # Reference to main renderer for fonts
         self.powerup_system = powerup_system
-        self.explosion_frames_scaled = {}  # Cache for scaled explosion frames
         # Performance: Cache progress to avoid file I/O every frame
         self._cached_progress = None
         self._progress_cache_time = 0
         self._progress_cache_duration = 1000  # Refresh cache every second
-        # Cache scaled revolver image
-        self._scaled_revolver_cache = {}
+        # Airstrike heatmap, recomputed only when the position changes
+        self._airstrike_heatmap_key = None
+        self._airstrike_heatmap = None
         
     def _get_cached_progress(self):
         """Get cached progress data to avoid file I/O every frame."""
@@ -29,16 +32,19 @@ class PowerupRenderer:
             self._progress_cache_time = current_time
         return self._cached_progress
         
-    def draw_powerup_menu(self, board, mouse_pos):
-        """Draw the powerup menu on the right side of the screen."""
+    def menu_rect(self):
+        """Screen area of the powerup menu."""
         # Calculate menu position (right side of board)
         extra_spacing = 20  # Normal gap in windowed mode
             
         # Add the border width to ensure we're past the entire board
         menu_x = BOARD_OFFSET_X + BOARD_SIZE + extra_spacing
         menu_y = BOARD_OFFSET_Y + 36  # Move down by the board border size
-        menu_width = POWERUP_MENU_WIDTH
-        menu_height = BOARD_SIZE - 72  # Subtract top and bottom borders
+        return pygame.Rect(menu_x, menu_y, POWERUP_MENU_WIDTH, BOARD_SIZE - 72)  # Less top and bottom borders
+        
+    def draw_powerup_menu(self, board, mouse_pos):
+        """Draw the powerup menu on the right side of the screen."""
+        menu_x, menu_y, menu_width, menu_height = self.menu_rect()
         
         # Store position for click handling
         self.powerup_system.menu_x = menu_x
@@ -63,7 +69,7 @@ class PowerupRenderer:
         
         # Title
         title_text = "POWERUPS"
-        title_surface = self.renderer.pixel_fonts['large'].render(title_text, True, (180, 200, 180))
+        title_surface = self.renderer._get_cached_text(title_text, 'large', (180, 200, 180))
         title_rect = title_surface.get_rect(centerx=menu_x + menu_width // 2, y=menu_y + 20)
         self.screen.blit(title_surface, title_rect)
         
@@ -71,13 +77,13 @@ class PowerupRenderer:
         player = board.current_turn
         points = self.powerup_system.points[player]
         points_text = f"POINTS: {points}"
-        points_surface = self.renderer.pixel_fonts['medium'].render(points_text, True, (220, 190, 130))
+        points_surface = self.renderer._get_cached_text(points_text, 'medium', (220, 190, 130))
         points_rect = points_surface.get_rect(centerx=menu_x + menu_width // 2, y=menu_y + 60)
         self.screen.blit(points_surface, points_rect)
         
         # Show whose turn it is
         turn_text = f"({player.upper()}'S TURN)"
-        turn_surface = self.renderer.pixel_fonts['tiny'].render(turn_text, True, (150, 150, 150))
+        turn_surface = self.renderer._get_cached_text(turn_text, 'tiny', (150, 150, 150))
         turn_rect = turn_surface.get_rect(centerx=menu_x + menu_width // 2, y=menu_y + 85)
         self.screen.blit(turn_surface, turn_rect)
         
@@ -116,13 +122,13 @@ class PowerupRenderer:
         # If no powerups unlocked, show message
         if not available_powerups:
             no_powerups_text = "No powerups unlocked!"
-            no_powerups_surface = self.renderer.pixel_fonts['small'].render(no_powerups_text, True, (200, 200, 200))
+            no_powerups_surface = self.renderer._get_cached_text(no_powerups_text, 'small', (200, 200, 200))
             no_powerups_rect = no_powerups_surface.get_rect(centerx=menu_x + menu_width // 2, 
                                                            centery=menu_y + menu_height // 2)
             self.screen.blit(no_powerups_surface, no_powerups_rect)
             
             hint_text = "Visit Arms Dealer"
-            hint_surface = self.renderer.pixel_fonts['tiny'].render(hint_text, True, (150, 150, 150))
+            hint_surface = self.renderer._get_cached_text(hint_text, 'tiny', (150, 150, 150))
             hint_rect = hint_surface.get_rect(centerx=menu_x + menu_width // 2, 
                                              y=no_powerups_rect.bottom + 10)
             self.screen.blit(hint_surface, hint_rect)
@@ -170,11 +176,7 @@ class PowerupRenderer:
             if key == "gun" and hasattr(self.renderer, 'assets') and hasattr(self.renderer.assets, 'revolver_image') and self.renderer.assets.revolver_image:
                 # Use the actual revolver image for gun powerup
                 icon_size = 25
-                # Cache scaled revolver to avoid scaling every frame
-                cache_key = (icon_size, icon_size)
-                if cache_key not in self._scaled_revolver_cache:
-                    self._scaled_revolver_cache[cache_key] = pygame.transform.scale(self.renderer.assets.revolver_image, cache_key)
-                scaled_revolver = self._scaled_revolver_cache[cache_key]
+                scaled_revolver = transform_cache.scale(self.renderer.assets.revolver_image, (icon_size, icon_size))
                 
                 # Apply grayscale effect if can't afford
                 if not can_afford:
@@ -210,21 +212,21 @@ class PowerupRenderer:
                 else:
                     # Fallback to text icon
                     icon_color = WHITE if can_afford else (80, 80, 80)
-                    icon_surface = self.renderer.pixel_fonts['large'].render(powerup["icon"], True, icon_color)
+                    icon_surface = self.renderer._get_cached_text(powerup["icon"], 'large', icon_color)
                 
                 icon_rect = icon_surface.get_rect(centerx=button_rect.centerx, y=button_rect.y + 10)
                 self.screen.blit(icon_surface, icon_rect)
             
             # Draw name
             name_color = (200, 220, 200) if can_afford else (80, 80, 80)
-            name_surface = self.renderer.pixel_fonts['small'].render(powerup["name"], True, name_color)
+            name_surface = self.renderer._get_cached_text(powerup["name"], 'small', name_color)
             name_rect = name_surface.get_rect(centerx=button_rect.centerx, y=button_rect.y + 35)
             self.screen.blit(name_surface, name_rect)
             
             # Draw cost
             cost_text = f"Cost: {powerup['cost']}"
             cost_color = (200, 180, 140) if can_afford else (80, 80, 80)
-            cost_surface = self.renderer.pixel_fonts['tiny'].render(cost_text, True, cost_color)
+            cost_surface = self.renderer._get_cached_text(cost_text, 'tiny', cost_color)
             cost_rect = cost_surface.get_rect(centerx=button_rect.centerx, y=button_rect.y + 55)
             self.screen.blit(cost_surface, cost_rect)
             
@@ -233,14 +235,14 @@ class PowerupRenderer:
         # Draw instructions at bottom
         if self.powerup_system.active_powerup:
             instruction_text = self._get_instruction_text()
-            inst_surface = self.renderer.pixel_fonts['small'].render(instruction_text, True, (220, 220, 180))
+            inst_surface = self.renderer._get_cached_text(instruction_text, 'small', (220, 220, 180))
             inst_rect = inst_surface.get_rect(centerx=menu_x + menu_width // 2, 
                                              bottom=menu_y + menu_height - 20)
             self.screen.blit(inst_surface, inst_rect)
             
             # Cancel instruction
             cancel_text = "ESC to cancel"
-            cancel_surface = self.renderer.pixel_fonts['tiny'].render(cancel_text, True, (200, 100, 100))
+            cancel_surface = self.renderer._get_cached_text(cancel_text, 'tiny', (200, 100, 100))
             cancel_rect = cancel_surface.get_rect(centerx=menu_x + menu_width // 2, 
                                                 bottom=menu_y + menu_height - 40)
             self.screen.blit(cancel_surface, cancel_rect)
@@ -446,8 +448,37 @@ class PowerupRenderer:
         elif self.powerup_system.active_powerup == "paratroopers":
             self._draw_paratroopers_targeting(board, mouse_pos)
             
+    def _get_airstrike_heatmap(self, board):
+        """Net airstrike value of every centre for the active player, cached per position."""
+        player = self.powerup_system.powerup_state["player"]
+        attacker = 'w' if player == "white" else 'b'
+        key = (
+            bytes(board.squares),
+            self.powerup_system.shields.mask,
+            attacker
+        )
+        if key != self._airstrike_heatmap_key:
+            grids = board_grids(board, self.powerup_system.piece_values, self.powerup_system)
+            self._airstrike_heatmap = airstrike_value_map(grids, attacker=attacker)
+            self._airstrike_heatmap_key = key
+        return self._airstrike_heatmap
+        
     def _draw_airstrike_targeting(self, board, mouse_pos):
         """Draw 3x3 targeting grid for airstrike."""
+        # Heatmap preview: tint each centre by how much enemy material it would destroy
+        heatmap = self._get_airstrike_heatmap(board)
+        best_value = heatmap.max()
+        if best_value > 0:
+            heat_surface = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+            for heat_row in range(8):
+                for heat_col in range(8):
+                    value = heatmap[heat_row, heat_col]
+                    if value <= 0:
+                        continue
+                    alpha = int(20 + 80 * value / best_value)
+                    heat_surface.fill((255, 140, 0, alpha))
+                    self.screen.blit(heat_surface, board.get_square_pos(heat_row, heat_col))
+                    
         row, col = board.get_square_from_pos(mouse_pos)
         if row < 0 or col < 0:
             return
@@ -514,11 +545,7 @@ class PowerupRenderer:
             if hasattr(self.renderer, 'assets') and hasattr(self.renderer.assets, 'revolver_image') and self.renderer.assets.revolver_image:
                 # Scale the revolver
                 revolver_size = int(SQUARE_SIZE * 0.4)
-                # Cache scaled revolver to avoid scaling every frame
-                cache_key = (revolver_size, revolver_size)
-                if cache_key not in self._scaled_revolver_cache:
-                    self._scaled_revolver_cache[cache_key] = pygame.transform.scale(self.renderer.assets.revolver_image, cache_key)
-                scaled_revolver = self._scaled_revolver_cache[cache_key]
+                scaled_revolver = transform_cache.scale(self.renderer.assets.revolver_image, (revolver_size, revolver_size))
                 
                 # Position it at the top-right of the piece
                 revolver_x = shooter_x + SQUARE_SIZE - revolver_size - 5
@@ -582,18 +609,18 @@ class PowerupRenderer:
         
         # Warning text
         warning_text = "WARNING!"
-        warning_surface = self.renderer.pixel_fonts['large'].render(warning_text, True, (255, 50, 50))
+        warning_surface = self.renderer._get_cached_text(warning_text, 'large', (255, 50, 50))
         warning_rect = warning_surface.get_rect(centerx=WIDTH // 2, y=dialog_y + 20)
         self.screen.blit(warning_surface, warning_rect)
         
         # Message text
         message = "This will destroy all enemy pieces!"
-        message_surface = self.renderer.pixel_fonts['medium'].render(message, True, (255, 255, 255))
+        message_surface = self.renderer._get_cached_text(message, 'medium', (255, 255, 255))
         message_rect = message_surface.get_rect(centerx=WIDTH // 2, y=dialog_y + 60)
         self.screen.blit(message_surface, message_rect)
         
         question = "Are you sure you want to continue?"
-        question_surface = self.renderer.pixel_fonts['medium'].render(question, True, (200, 200, 200))
+        question_surface = self.renderer._get_cached_text(question, 'medium', (200, 200, 200))
         question_rect = question_surface.get_rect(centerx=WIDTH // 2, y=dialog_y + 90)
         self.screen.blit(question_surface, question_rect)
         
@@ -619,7 +646,7 @@ class PowerupRenderer:
         pygame.draw.rect(self.screen, yes_color, self.powerup_system.chopper_yes_button, border_radius=5)
         pygame.draw.rect(self.screen, (100, 255, 100), self.powerup_system.chopper_yes_button, 2, border_radius=5)
         
-        yes_text = self.renderer.pixel_fonts['medium'].render("YES", True, (255, 255, 255))
+        yes_text = self.renderer._get_cached_text("YES", 'medium', (255, 255, 255))
         yes_text_rect = yes_text.get_rect(center=self.powerup_system.chopper_yes_button.center)
         self.screen.blit(yes_text, yes_text_rect)
         
@@ -629,7 +656,7 @@ class PowerupRenderer:
         pygame.draw.rect(self.screen, no_color, self.powerup_system.chopper_no_button, border_radius=5)
         pygame.draw.rect(self.screen, (255, 100, 100), self.powerup_system.chopper_no_button, 2, border_radius=5)
         
-        no_text = self.renderer.pixel_fonts['medium'].render("NO", True, (255, 255, 255))
+        no_text = self.renderer._get_cached_text("NO", 'medium', (255, 255, 255))
         no_text_rect = no_text.get_rect(center=self.powerup_system.chopper_no_button.center)
         self.screen.blit(no_text, no_text_rect)
                                
@@ -640,7 +667,7 @@ class PowerupRenderer:
         remaining = 3 - placed
         
         info_text = f"PLACE {remaining} MORE PAWN{'S' if remaining > 1 else ''}"
-        text_surface = self.renderer.pixel_fonts['medium'].render(info_text, True, (100, 200, 100))
+        text_surface = self.renderer._get_cached_text(info_text, 'medium', (100, 200, 100))
         text_rect = text_surface.get_rect(center=(BOARD_OFFSET_X + BOARD_SIZE // 2, 
                                                   BOARD_OFFSET_Y - 30))
         self.screen.blit(text_surface, text_rect)
@@ -664,7 +691,7 @@ class PowerupRenderer:
                         
                         # Draw parachute icon
                         chute_text = "🪂"
-                        chute_surface = self.renderer.pixel_fonts['large'].render(chute_text, True, (255, 255, 255))
+                        chute_surface = self.renderer._get_cached_text(chute_text, 'large', (255, 255, 255))
                         chute_rect = chute_surface.get_rect(center=(x + SQUARE_SIZE // 2, 
                                                                    y + SQUARE_SIZE // 2))
                         self.screen.blit(chute_surface, chute_rect)
@@ -747,7 +774,7 @@ class PowerupRenderer:
         jet_height = int(jet_frame.get_height() * jet_scale)
         
         # Just scale the jet, no flip needed
-        scaled_jet = pygame.transform.scale(jet_frame, (jet_width, jet_height))
+        scaled_jet = transform_cache.scale(jet_frame, (jet_width, jet_height))
         
         # Draw the jet
         self.screen.blit(scaled_jet, (jet_x, jet_y))
@@ -818,13 +845,7 @@ class PowerupRenderer:
             # Scale the explosion to cover 3x3 grid
             explosion_size = SQUARE_SIZE * 3
             
-            # Cache scaled frames for performance
-            cache_key = (frame_index, explosion_size)
-            if cache_key not in self.explosion_frames_scaled:
-                self.explosion_frames_scaled[cache_key] = pygame.transform.scale(
-                    explosion_frame, (explosion_size, explosion_size))
-                    
-            scaled_frame = self.explosion_frames_scaled[cache_key]
+            scaled_frame = transform_cache.scale(explosion_frame, (explosion_size, explosion_size))
             
             # Position explosion centered on the target square
             center_x = anim["x"] + SQUARE_SIZE // 2
@@ -890,15 +911,14 @@ class PowerupRenderer:
             bolt_y = start_y
             
             # Generate jagged lightning path
-            import random
-            random.seed(int(anim["start_time"]))  # Consistent randomness for this bolt
+            bolt_rng = random.Random(int(anim["start_time"]))  # Consistent randomness for this bolt
             
             points = [(center_x, start_y)]
             for i in range(segments):
                 progress_segment = (i + 1) / segments
                 next_y = start_y + (center_y - start_y) * progress_segment
                 # Zigzag left and right
-                offset = random.randint(-20, 20)
+                offset = bolt_rng.randint(-20, 20)
                 next_x = center_x + offset
                 points.append((next_x, next_y))
             
@@ -927,11 +947,11 @@ class PowerupRenderer:
                 for _ in range(2):
                     max_idx = len(visible_points) - 1
                     if max_idx > 2:
-                        branch_start_idx = random.randint(2, min(5, max_idx))
+                        branch_start_idx = bolt_rng.randint(2, min(5, max_idx))
                         if branch_start_idx < len(visible_points):
                             branch_start = visible_points[branch_start_idx]
-                            branch_end_x = branch_start[0] + random.randint(-30, 30)
-                            branch_end_y = branch_start[1] + random.randint(20, 40)
+                            branch_end_x = branch_start[0] + bolt_rng.randint(-30, 30)
+                            branch_end_y = branch_start[1] + bolt_rng.randint(20, 40)
                             pygame.draw.line(self.screen, (200, 200, 255), branch_start, (branch_end_x, branch_end_y), 2)
         
         # Flash effect at impact point
@@ -951,11 +971,7 @@ class PowerupRenderer:
             # Calculate revolver position (it should appear to recoil)
             recoil = int(10 * progress * 3)  # Quick recoil effect
             revolver_size = int(SQUARE_SIZE * 0.4)
-            # Cache scaled revolver to avoid scaling every frame
-            cache_key = (revolver_size, revolver_size)
-            if cache_key not in self._scaled_revolver_cache:
-                self._scaled_revolver_cache[cache_key] = pygame.transform.scale(self.renderer.assets.revolver_image, cache_key)
-            scaled_revolver = self._scaled_revolver_cache[cache_key]
+            scaled_revolver = transform_cache.scale(self.renderer.assets.revolver_image, (revolver_size, revolver_size))
             
             # Position based on the starting position
             revolver_x = anim["start_x"] - revolver_size // 2 - recoil
@@ -1070,7 +1086,7 @@ class PowerupRenderer:
                              
             # Turns remaining indicator
             turns_text = str(turns_remaining)
-            text_surface = self.renderer.pixel_fonts['tiny'].render(turns_text, True, (255, 255, 255))
+            text_surface = self.renderer._get_cached_text(turns_text, 'tiny', (255, 255, 255))
             text_rect = text_surface.get_rect(center=(center, center))
             shield_surface.blit(text_surface, text_rect)
             
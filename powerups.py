@@ -4,10 +4,16 @@ Handles powerup logic, effects, and visual feedback
 """
 
 import pygame
-import random
+from rng import cosmetic_rng
 import math
 from config import *
 from config import load_progress
+from targeting import NEIGHBOURHOOD, gun_targets
+from board import ShieldSet, ShieldMap
+from framepacing import pacer
+
+# Visual-only randomness (screen shake)
+_rng = cosmetic_rng("powerups")
 
 class PowerupSystem:
     def __init__(self):
@@ -76,8 +82,9 @@ class PowerupSystem:
         self.active_powerup = None
         self.powerup_state = None
         
-        # Shield tracking
-        self.shielded_pieces = {}  # {(row, col): turns_remaining}
+        # Shield tracking; shared with the board once it is attached
+        self.shields = ShieldSet()
+        self._shield_map = ShieldMap(self.shields)
         
         # Visual effects
         self.effects = []
@@ -184,6 +191,7 @@ class PowerupSystem:
         # Spend points
         player = self.powerup_state["player"]
         self.points[player] -= self.powerups["airstrike"]["cost"]
+        board.record_powerup(player, "airstrike", [(row, col)])
         
         # Create airstrike effect
         self._create_airstrike_effect(row, col, board)
@@ -215,6 +223,7 @@ class PowerupSystem:
         if piece and piece_color == player:
             # Spend points
             self.points[player] -= self.powerups["shield"]["cost"]
+            board.record_powerup(player, "shield", [(row, col)])
             
             # Create lightning strike animation first
             self._create_lightning_effect(row, col, board)
@@ -260,12 +269,14 @@ class PowerupSystem:
                 
                 # Create gun effect
                 shooter_pos = self.powerup_state["data"]["shooter"]
+                board.record_powerup(player, "gun", [(row, col)], shooter_pos)
                 self._create_gun_effect(shooter_pos, (row, col), board)
                 
                 # Destroy target (if not king or shielded)
                 target = board.get_piece(row, col)
                 if target and target[1] != 'K' and (row, col) not in self.shielded_pieces:
                     board.set_piece(row, col, "")
+                    board.restart_position_history()  # Earlier positions can't recur
                     
                 # Clear powerup state
                 self.active_powerup = None
@@ -281,53 +292,22 @@ class PowerupSystem:
         if not piece:
             return []
             
-        targets = []
         enemy_color = 'b' if piece[0] == 'w' else 'w'
-        
-        # Check all 8 directions for line of sight
-        directions = [
-            (-1, 0),  # North
-            (1, 0),   # South
-            (0, -1),  # West
-            (0, 1),   # East
-            (-1, -1), # Northwest
-            (-1, 1),  # Northeast
-            (1, -1),  # Southwest
-            (1, 1)    # Southeast
-        ]
-        
-        for dr, dc in directions:
-            # Check each square in this direction until we hit something
-            for distance in range(1, 8):
-                check_row = row + dr * distance
-                check_col = col + dc * distance
-                
-                # Stop if we go off the board
-                if not (0 <= check_row < 8 and 0 <= check_col < 8):
-                    break
-                    
-                target = board.get_piece(check_row, check_col)
-                if target:
-                    # Found a piece - if it's an enemy and not a king, it's a valid target
-                    if target[0] == enemy_color and target[1] != 'K':
-                        targets.append((check_row, check_col))
-                    # Stop looking in this direction (can't shoot through pieces)
-                    break
-                    
-        return targets
+        return gun_targets(board, row, col, enemy_color)
         
     def _handle_chopper_click(self, row, col, board):
         """Handle chopper gunner activation."""
         # Check if we're clicking on YES/NO buttons
         if hasattr(self, 'chopper_yes_button') and hasattr(self, 'chopper_no_button'):
             import pygame
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = pacer.get_mouse_pos()
             
             if self.chopper_yes_button.collidepoint(mouse_pos):
                 # User clicked YES - activate chopper gunner
                 player = self.powerup_state["player"]
                 # Spend points
                 self.points[player] -= self.powerups["chopper"]["cost"]
+                board.record_powerup(player, "chopper")
                 
                 # Set flag to request chopper mode
                 self.chopper_gunner_requested = True
@@ -392,6 +372,7 @@ class PowerupSystem:
         if len(self.powerup_state["data"]["placed"]) >= 3:
             # Spend points
             self.points[player] -= self.powerups["paratroopers"]["cost"]
+            board.record_powerup(player, "paratroopers", self.powerup_state["data"]["placed"])
             
             # Clear powerup state
             self.active_powerup = None
@@ -401,50 +382,41 @@ class PowerupSystem:
             
         return False
         
-    def update_shields(self):
-        """Decrement shield counters each turn."""
-        # Update shield turns
-        pass
-        
-        to_remove = []
-        for pos, turns in self.shielded_pieces.items():
-            self.shielded_pieces[pos] = turns - 1
-            pass  # Decrement shield turn
-            if self.shielded_pieces[pos] <= 0:
-                to_remove.append(pos)
-                pass  # Shield expired
-                
-        for pos in to_remove:
-            del self.shielded_pieces[pos]
+    @property
+    def shielded_pieces(self):
+        """Shielded squares as {(row, col): turns_remaining}."""
+        return self._shield_map
+        
+    @shielded_pieces.setter
+    def shielded_pieces(self, pieces):
+        self.shields.clear()
+        for (row, col), turns in pieces.items():
+            self.shields.add(row * 8 + col, turns)
             
-        # Shields updated
+    def share_shields(self, shields):
+        """Keep shields in the board's ShieldSet, carrying over any already placed."""
+        if shields is self.shields:
+            return
+        for (row, col), turns in list(self._shield_map.items()):
+            shields.add(row * 8 + col, turns)
+        self.shields = shields
+        self._shield_map = ShieldMap(shields)
+        
+    def update_shields(self):
+        """Count down shields each turn, dropping the ones that run out."""
+        self.shields.tick()
             
     def remove_shield_at(self, row, col):
         """Remove shield at a specific position (e.g., when piece is captured)."""
-        pos = (row, col)
-        if pos in self.shielded_pieces:
-            del self.shielded_pieces[pos]
-            pass  # Shield removed
+        self.shields.remove(row * 8 + col)
             
     def move_shield(self, from_pos, to_pos):
         """Move shield when a shielded piece moves."""
-        # Move shield with piece
-        pass
-        pass
-        
-        if from_pos in self.shielded_pieces:
-            turns_remaining = self.shielded_pieces[from_pos]
-            del self.shielded_pieces[from_pos]
-            self.shielded_pieces[to_pos] = turns_remaining
-            pass  # Shield moved
-            pass
-        else:
-            pass  # No shield at from_pos
-        pass
+        self.shields.move(from_pos[0] * 8 + from_pos[1], to_pos[0] * 8 + to_pos[1])
             
     def is_piece_shielded(self, row, col):
         """Check if a piece is protected by shield."""
-        return (row, col) in self.shielded_pieces
+        return self.shields.is_shielded(row, col)
         
     def update_effects(self, current_time):
         """Update visual effects."""
@@ -490,16 +462,13 @@ class PowerupSystem:
         self.start_screen_shake(15, 500)  # 15 pixel intensity, 500ms duration
         
         # Destroy pieces in 3x3 area
-        for dr in range(-1, 2):
-            for dc in range(-1, 2):
-                target_row = row + dr
-                target_col = col + dc
-                if 0 <= target_row < 8 and 0 <= target_col < 8:
-                    piece = board.get_piece(target_row, target_col)
-                    if piece:
-                        # Can't destroy kings or shielded pieces
-                        if piece[1] != 'K' and (target_row, target_col) not in self.shielded_pieces:
-                            board.set_piece(target_row, target_col, "")
+        for target_row, target_col in NEIGHBOURHOOD[(row, col)]:
+            piece = board.get_piece(target_row, target_col)
+            if piece:
+                # Can't destroy kings or shielded pieces
+                if piece[1] != 'K' and (target_row, target_col) not in self.shielded_pieces:
+                    board.set_piece(target_row, target_col, "")
+        board.restart_position_history()  # Earlier positions can't recur
                             
     def _execute_delayed_pawn_placement(self, anim):
         """Execute the delayed placement of a pawn from paratroopers."""
@@ -510,6 +479,7 @@ class PowerupSystem:
         
         # Place the pawn on the board
         board.set_piece(row, col, pawn)
+        board.restart_position_history()  # Earlier positions can't recur
         
     def _create_airstrike_effect(self, row, col, board):
         """Create visual effect for airstrike."""
@@ -639,8 +609,8 @@ class PowerupSystem:
         current_intensity = self.screen_shake["intensity"] * (1 - progress)
         
         # Random shake offset
-        offset_x = random.randint(-int(current_intensity), int(current_intensity))
-        offset_y = random.randint(-int(current_intensity), int(current_intensity))
+        offset_x = _rng.randint(-int(current_intensity), int(current_intensity))
+        offset_y = _rng.randint(-int(current_intensity), int(current_intensity))
         
         return offset_x, offset_y
         
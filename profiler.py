@@ -0,0 +1,206 @@
+"""
+Frame Profiler
+Hierarchical per-frame timers with an in-game overlay and Chrome trace export
+
+Call sites wrap their work in `with profiler.section("name"):`, or a whole
+function in @profiler.timed("name"). While the profiler is off, section()
+hands back one shared do-nothing context, so an instrumented frame costs a
+few attribute lookups. While it is on, every section's start, duration and
+nesting depth is kept for the last PROFILE_FRAMES frames; F3 toggles the
+overlay and F4 writes the frames to a trace file that chrome://tracing or
+Perfetto can open.
+"""
+
+import functools
+import json
+import time
+import pygame
+
+PROFILE_FRAMES = 240  # Frames kept in the ring buffer (4 seconds at 60 FPS)
+TRACE_FILE = "profile_trace.json"
+
+OVERLAY_WIDTH = 360
+GRAPH_HEIGHT = 80
+GRAPH_SCALE_MS = 50.0  # Frame time at the top of the graph
+FRAME_BUDGET_MS = 1000.0 / 60
+TOP_SECTIONS = 8
+
+
+class _NullSection:
+    """Shared context returned while profiling is off."""
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        
+    def __enter__(self):
+        self.depth = len(self.profiler.stack)
+        self.profiler.stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+        
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.profiler.stack.pop()
+        self.profiler.events.append((self.name, self.depth, self.start, end - self.start))
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, frames=PROFILE_FRAMES):
+        self.enabled = False
+        self.show_overlay = False
+        # Ring of (frame start, frame duration, [(name, depth, start, duration), ...])
+        self.frames = [None] * frames
+        self.index = 0
+        self.count = 0
+        self.stack = []
+        self.events = []
+        self.frame_start = None
+        self.font = None
+        self.counters = []  # Callables returning one extra overlay line each
+        
+    def toggle(self):
+        """Turn profiling and its overlay on or off together."""
+        self.enabled = not self.enabled
+        self.show_overlay = self.enabled
+        self.frame_start = None
+        print(f"Frame profiler {'on' if self.enabled else 'off'}")
+        
+    def add_counter(self, counter):
+        """Show counter() (a one-line string) under the frame summary in the overlay."""
+        self.counters.append(counter)
+        
+    def section(self, name):
+        """Context manager timing one named piece of the frame."""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+        
+    def timed(self, name):
+        """Decorator timing every call of a function as a section."""
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with _Section(self, name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+        
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+            self.events = []
+            self.stack = []
+    
+    def end_frame(self):
+        """Store the finished frame in the ring buffer."""
+        if not self.enabled or self.frame_start is None:
+            return
+        duration = time.perf_counter() - self.frame_start
+        self.frames[self.index] = (self.frame_start, duration, self.events)
+        self.index = (self.index + 1) % len(self.frames)
+        self.count = min(self.count + 1, len(self.frames))
+        self.frame_start = None
+        
+    def recent_frames(self):
+        """Stored frames, oldest first."""
+        start = (self.index - self.count) % len(self.frames)
+        return [self.frames[(start + offset) % len(self.frames)] for offset in range(self.count)]
+        
+    def top_sections(self, limit=TOP_SECTIONS):
+        """(name, average ms per frame, worst ms) of the costliest sections, costliest first."""
+        frames = self.recent_frames()
+        totals = {}
+        worst = {}
+        for _, _, events in frames:
+            per_frame = {}
+            for name, _, _, duration in events:
+                per_frame[name] = per_frame.get(name, 0.0) + duration
+            for name, duration in per_frame.items():
+                totals[name] = totals.get(name, 0.0) + duration
+                worst[name] = max(worst.get(name, 0.0), duration)
+        count = max(1, len(frames))
+        ranked = sorted(totals, key=totals.get, reverse=True)[:limit]
+        return [(name, totals[name] * 1000 / count, worst[name] * 1000) for name in ranked]
+        
+    def draw_overlay(self, screen):
+        """Frame-time graph and the costliest sections, in the top-left corner."""
+        if not self.show_overlay:
+            return
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+            
+        frames = self.recent_frames()
+        sections = self.top_sections()
+        line_height = self.font.get_linesize()
+        counters = [counter() for counter in self.counters]
+        height = GRAPH_HEIGHT + 30 + line_height * (len(sections) + len(counters) + 1)
+        panel = pygame.Surface((OVERLAY_WIDTH, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 190))
+        
+        # One bar per frame: green within the 60 FPS budget, red over it
+        bar_width = OVERLAY_WIDTH / len(self.frames)
+        for offset, (_, duration, _) in enumerate(frames):
+            ms = duration * 1000
+            bar_height = min(GRAPH_HEIGHT, int(ms / GRAPH_SCALE_MS * GRAPH_HEIGHT))
+            color = (90, 220, 90) if ms <= FRAME_BUDGET_MS else (230, 80, 60)
+            pygame.draw.rect(panel, color, (int(offset * bar_width), 10 + GRAPH_HEIGHT - bar_height,
+                                            max(1, int(bar_width)), bar_height))
+        budget_y = 10 + GRAPH_HEIGHT - int(FRAME_BUDGET_MS / GRAPH_SCALE_MS * GRAPH_HEIGHT)
+        pygame.draw.line(panel, (255, 255, 255), (0, budget_y), (OVERLAY_WIDTH, budget_y))
+        
+        if frames:
+            durations = [duration * 1000 for _, duration, _ in frames]
+            summary = f"frame avg {sum(durations) / len(durations):.1f} ms  max {max(durations):.1f} ms"
+        else:
+            summary = "collecting frames..."
+        y = GRAPH_HEIGHT + 20
+        panel.blit(self.font.render(summary + "   F4: save trace", True, (255, 255, 255)), (8, y))
+        for line in counters:
+            y += line_height
+            panel.blit(self.font.render(line, True, (180, 200, 255)), (8, y))
+        for name, average, worst in sections:
+            y += line_height
+            panel.blit(self.font.render(f"{name:<24} {average:6.2f} ms  (max {worst:.1f})", True, (220, 220, 220)), (8, y))
+        screen.blit(panel, (10, 10))
+        
+    def export_trace(self, path=TRACE_FILE):
+        """Write the buffered frames in Chrome's trace event format."""
+        frames = self.recent_frames()
+        if not frames:
+            print("No profiled frames to export")
+            return None
+        origin = frames[0][0]
+        trace = []
+        for number, (start, duration, events) in enumerate(frames):
+            trace.append({"name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                          "ts": (start - origin) * 1e6, "dur": duration * 1e6, "args": {"frame": number}})
+            for name, depth, event_start, event_duration in events:
+                trace.append({"name": name, "ph": "X", "pid": 1, "tid": 1,
+                              "ts": (event_start - origin) * 1e6, "dur": event_duration * 1e6,
+                              "args": {"depth": depth}})
+        try:
+            with open(path, "w") as f:
+                json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+            print(f"Saved {len(frames)} profiled frames to {path}")
+            return path
+        except Exception as e:
+            print(f"Error saving trace: {e}")
+            return None
+
+
+# The one profiler the game's call sites report to
+profiler = FrameProfiler()
@@ -0,0 +1,65 @@
+"""
+Random Number Streams
+One seedable random.Random per subsystem, derived from a single master seed
+
+Gameplay streams (AI decisions) and cosmetic streams (particles, shake,
+weather) are kept apart, so a replayed game makes the same AI choices and
+draws the same effects regardless of how many frames the other one ran.
+"""
+
+import hashlib
+import os
+import random
+
+GAMEPLAY = "gameplay"
+COSMETIC = "cosmetic"
+
+
+class RandomService:
+    def __init__(self, seed=None):
+        self.streams = {}  # {(category, name): random.Random}
+        self.seed(seed)
+        
+    def seed(self, seed=None):
+        """Set the master seed (a fresh one if None) and reseed every stream in place."""
+        if seed is None:
+            seed = int.from_bytes(os.urandom(4), "big")
+        self.master_seed = seed
+        for (category, name), stream in self.streams.items():
+            stream.seed(self._derive(category, name))
+    
+    def _derive(self, category, name):
+        """Stable per-stream seed, independent of the order streams are created in."""
+        digest = hashlib.sha256(f"{self.master_seed}:{category}:{name}".encode()).digest()
+        return int.from_bytes(digest[:8], "big")
+        
+    def stream(self, category, name):
+        """The random.Random for one subsystem; the same object for the life of the process."""
+        key = (category, name)
+        if key not in self.streams:
+            self.streams[key] = random.Random(self._derive(category, name))
+        return self.streams[key]
+
+
+_service = RandomService()
+
+
+def set_seed(seed=None):
+    """Reseed all streams from a master seed; returns the seed in use."""
+    _service.seed(seed)
+    return _service.master_seed
+
+
+def get_seed():
+    """The current master seed, for logging so a run can be replayed."""
+    return _service.master_seed
+
+
+def gameplay_rng(name):
+    """Stream for choices that change the game (AI decisions)."""
+    return _service.stream(GAMEPLAY, name)
+
+
+def cosmetic_rng(name):
+    """Stream for visual-only randomness (particles, shake, weather)."""
+    return _service.stream(COSMETIC, name)
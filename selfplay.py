@@ -0,0 +1,159 @@
+"""
+Self-Play Data Generator
+Plays headless AI-vs-AI games in a process pool and streams labelled positions to .npy shards
+
+Each sample is one int8 row: 64 piece codes (row-major, a8 first) followed by
+the game result in half points from white's view (0 loss, 1 draw, 2 win).
+texel.py fits the evaluation tables to these samples.
+
+Usage: python selfplay.py --games 500 --out selfplay_data
+"""
+
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import glob
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import rng
+from board import ChessBoard
+from ai import ChessAI, MAX_SEARCH_DEPTH
+
+# Piece codes used in the shards (0 is an empty square)
+PIECE_CODES = {
+    'wP': 1, 'wN': 2, 'wB': 3, 'wR': 4, 'wQ': 5, 'wK': 6,
+    'bP': 7, 'bN': 8, 'bB': 9, 'bR': 10, 'bQ': 11, 'bK': 12
+}
+RESULT_COLUMN = 64
+
+DEFAULT_DATA_DIR = "selfplay_data"
+SHARD_SIZE = 100000  # Samples per shard file
+
+# Per-move search budget; small so games are quick, noisy so they differ
+SELFPLAY_NODES = 1500
+SELFPLAY_EVAL_NOISE = 20
+
+# Opening plies are mostly the same between games, so they are not sampled
+OPENING_SKIP = 8
+MAX_PLIES = 200  # Longer games are scored as draws
+
+
+def encode_board(board):
+    """64 piece codes for the board, row-major."""
+    return [PIECE_CODES.get(piece, 0) for row in board.board for piece in row]
+
+
+def play_game(seed, nodes=SELFPLAY_NODES, eval_noise=SELFPLAY_EVAL_NOISE, max_plies=MAX_PLIES):
+    """Worker process: play one game and return its quiet positions as an int8 array.
+    
+    Positions where the side to move is in check or is about to capture are
+    skipped, since a static evaluation can't judge them.
+    """
+    rng.set_seed(seed)
+    board = ChessBoard()
+    ai = ChessAI("very_hard")
+    
+    positions = []
+    for ply in range(max_plies):
+        ai._begin_search(nodes, 0)
+        move, _, _ = ai.search_position(board, MAX_SEARCH_DEPTH, eval_noise)
+        if move is None:
+            break
+            
+        (from_row, from_col), (to_row, to_col) = move
+        if ply >= OPENING_SKIP and not board.is_check and not board.get_piece(to_row, to_col):
+            positions.append(encode_board(board))
+            
+        board.apply_move(from_row, from_col, to_row, to_col)
+        if board.game_over:
+            break
+    
+    if board.winner == "white":
+        result = 2
+    elif board.winner == "black":
+        result = 0
+    else:
+        result = 1  # Draws, stalemates and unfinished games
+        
+    samples = np.zeros((len(positions), RESULT_COLUMN + 1), dtype=np.int8)
+    if positions:
+        samples[:, :RESULT_COLUMN] = positions
+        samples[:, RESULT_COLUMN] = result
+    return samples
+
+
+def shard_paths(data_dir):
+    """All shard files in a data directory, in order."""
+    return sorted(glob.glob(os.path.join(data_dir, "shard_*.npy")))
+
+
+class ShardWriter:
+    """Buffers samples and writes them out SHARD_SIZE rows at a time."""
+    def __init__(self, data_dir, shard_size=SHARD_SIZE):
+        self.data_dir = data_dir
+        self.shard_size = shard_size
+        os.makedirs(data_dir, exist_ok=True)
+        # Continue numbering after earlier runs so their shards are kept
+        self.next_index = len(shard_paths(data_dir))
+        self.buffer = []
+        self.buffered = 0
+        self.written = 0
+        
+    def add(self, samples):
+        if len(samples):
+            self.buffer.append(samples)
+            self.buffered += len(samples)
+        if self.buffered >= self.shard_size:
+            self.flush()
+    
+    def flush(self):
+        """Write everything buffered to a new shard."""
+        if not self.buffered:
+            return
+        path = os.path.join(self.data_dir, f"shard_{self.next_index:05d}.npy")
+        np.save(path, np.concatenate(self.buffer))
+        print(f"Wrote {self.buffered} samples to {path}")
+        self.written += self.buffered
+        self.next_index += 1
+        self.buffer = []
+        self.buffered = 0
+
+
+def generate(games, data_dir=DEFAULT_DATA_DIR, workers=None, seed=0, nodes=SELFPLAY_NODES,
+             shard_size=SHARD_SIZE):
+    """Play games in a process pool, streaming samples to shards as games finish."""
+    writer = ShardWriter(data_dir, shard_size)
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    results = [0, 0, 0]
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_game, seed + game, nodes) for game in range(games)]
+        for done, future in enumerate(as_completed(futures), 1):
+            samples = future.result()
+            if len(samples):
+                results[samples[0, RESULT_COLUMN]] += 1
+            writer.add(samples)
+            if done % 10 == 0 or done == games:
+                print(f"{done}/{games} games, {writer.written + writer.buffered} samples "
+                      f"(white {results[2]}, draw {results[1]}, black {results[0]})")
+    
+    writer.flush()
+    return writer.written
+
+
+def main():
+    """Self-play entry point."""
+    parser = argparse.ArgumentParser(description='Generate self-play training data')
+    parser.add_argument('--games', type=int, default=100, help='Number of games to play')
+    parser.add_argument('--out', default=DEFAULT_DATA_DIR, help='Directory for the .npy shards')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count - 1)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the first game; game n uses seed + n')
+    parser.add_argument('--nodes', type=int, default=SELFPLAY_NODES, help='Search nodes per move')
+    args = parser.parse_args()
+    
+    generate(args.games, args.out, args.workers, args.seed, args.nodes)
+
+
+if __name__ == "__main__":
+    main()
@@ -544,12 +544,9 @@ class StoryMode:
             # This would need to be checked each turn in the game loop
             pass
             
-        # AI aggression multiplier
-        if "ai_aggression" in rules and ai:
-            # Modify AI behavior to be more aggressive
-            if hasattr(ai, 'aggression_multiplier'):
-                ai.aggression_multiplier = rules["ai_aggression"]
-                
+        # AI aggression multiplier: compiled into the AI's move constraints
+        # at the start of each of its turns (ChessGame._ai_move_constraints)
+        
         # Boss battle rules
         if rules.get("boss_battle"):
             # Could add special boss abilities here
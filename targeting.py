@@ -0,0 +1,133 @@
+"""
+Precomputed Board Geometry for Powerup Targeting
+Ray and 3x3 neighbourhood tables shared by the AI and the powerup system,
+plus NumPy grid scoring for area powerups
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Gun line-of-sight directions (cardinal first, then diagonal)
+DIRECTIONS = [
+    (-1, 0), (1, 0), (0, -1), (0, 1),
+    (-1, -1), (-1, 1), (1, -1), (1, 1)
+]
+
+
+def _build_rays():
+    """For every square, the squares along each direction out to the edge."""
+    rays = {}
+    for row in range(8):
+        for col in range(8):
+            square_rays = []
+            for dr, dc in DIRECTIONS:
+                ray = []
+                r, c = row + dr, col + dc
+                while 0 <= r < 8 and 0 <= c < 8:
+                    ray.append((r, c))
+                    r += dr
+                    c += dc
+                if ray:
+                    square_rays.append(tuple(ray))
+            rays[(row, col)] = tuple(square_rays)
+    return rays
+
+
+def _build_neighbourhoods():
+    """For every square, the on-board squares of the 3x3 block centred on it."""
+    neighbourhoods = {}
+    for row in range(8):
+        for col in range(8):
+            neighbourhoods[(row, col)] = tuple(
+                (r, c)
+                for r in range(row - 1, row + 2)
+                for c in range(col - 1, col + 2)
+                if 0 <= r < 8 and 0 <= c < 8
+            )
+    return neighbourhoods
+
+
+RAYS = _build_rays()
+NEIGHBOURHOOD = _build_neighbourhoods()
+
+
+def gun_targets(board, row, col, enemy_color):
+    """Get the enemy pieces a gun at (row, col) can hit.
+
+    The first piece along each ray blocks the shot; it is a target only if
+    it belongs to enemy_color ('w' or 'b') and is not a king.
+    """
+    targets = []
+    for ray in RAYS[(row, col)]:
+        for r, c in ray:
+            target = board.get_piece(r, c)
+            if target:
+                if target[0] == enemy_color and target[1] != 'K':
+                    targets.append((r, c))
+                break
+    return targets
+
+
+def board_grids(board, piece_values, powerup_system=None):
+    """Materialize the board once as NumPy grids for vectorized scoring.
+    
+    Returns (values, owners, destroyable): piece values, ownership
+    (+1 white, -1 black, 0 empty) and a mask of pieces that area attacks
+    can remove (not kings, not shielded).
+    """
+    values = np.zeros((8, 8), dtype=np.float64)
+    owners = np.zeros((8, 8), dtype=np.int8)
+    destroyable = np.zeros((8, 8), dtype=bool)
+    
+    for row in range(8):
+        for col in range(8):
+            piece = board.get_piece(row, col)
+            if not piece:
+                continue
+            values[row, col] = piece_values.get(piece[1], 0)
+            owners[row, col] = 1 if piece[0] == 'w' else -1
+            destroyable[row, col] = piece[1] != 'K'
+            
+    if powerup_system:
+        for row, col in powerup_system.shielded_pieces:
+            destroyable[row, col] = False
+            
+    return values, owners, destroyable
+
+
+def box_sum_3x3(grid):
+    """Sum every 3x3 neighbourhood of an 8x8 grid (zero outside the board)."""
+    padded = np.pad(grid, 1)
+    return sliding_window_view(padded, (3, 3)).sum(axis=(2, 3))
+
+
+def airstrike_value_map(grids, attacker='b', friendly_fire=0.5):
+    """Net material an airstrike centred on each square would destroy.
+    
+    Enemy pieces count at full value and the attacker's own pieces count
+    against it, weighted by friendly_fire.
+    """
+    values, owners, destroyable = grids
+    enemy = -1 if attacker == 'w' else 1
+    hit = np.where(destroyable, values, 0.0)
+    weights = np.where(owners == enemy, 1.0, -friendly_fire)
+    return box_sum_3x3(hit * weights)
+
+
+def paratrooper_square_scores(grids, pawn_value):
+    """Score every square as a black paratrooper drop; occupied squares get -inf.
+    
+    Rewards advanced and central squares plus the value of white pieces
+    the dropped pawn would attack (black pawns capture towards row + 1).
+    """
+    values, owners, _ = grids
+    rows = np.arange(8).reshape(8, 1)
+    cols = np.arange(8).reshape(1, 8)
+    
+    scores = np.where(rows <= 3, 10.0, 0.0) + np.where((cols >= 2) & (cols <= 5), 5.0, 0.0)
+    
+    # Value of white pieces on each square's two forward diagonals
+    white_values = np.pad(np.where(owners == 1, values, 0.0), 1)
+    scores = scores + (white_values[2:, :-2] + white_values[2:, 2:]) / pawn_value
+    
+    return np.where(owners == 0, scores, -np.inf)
@@ -0,0 +1,41 @@
+"""
+AI Search Tests
+Mate scores count plies from the root and stay inside the search window
+"""
+
+from board import ChessBoard
+from ai import ChessAI, MATE, INFINITY
+
+
+def search(fen, depth):
+    board = ChessBoard()
+    board.set_fen(fen)
+    ai = ChessAI("very_hard")
+    ai._begin_search(0, 0)
+    return ai.search_position(board, depth)
+
+
+def test_mate_in_one_scores_by_ply():
+    move, score, _ = search("6k1/8/8/8/8/8/r5PP/7K b - - 0 1", 4)
+    assert move == ((6, 0), (7, 0))
+    assert score == MATE - 1 < INFINITY
+
+
+def test_mate_in_two_keeps_its_distance_at_every_depth():
+    board = ChessBoard()
+    board.set_fen("7k/8/8/8/8/8/8/R5RK w - - 0 1")
+    ai = ChessAI("very_hard")
+    ai._begin_search(0, 0)
+    scores = []
+    ai.search_position(board, 5, on_iteration=lambda depth, score, move: scores.append(score))
+    assert scores[-1] == MATE - 3
+
+
+def test_stalemating_move_scores_as_a_draw():
+    # Ra1-a7 leaves black's king without a move but not in check
+    board = ChessBoard()
+    board.set_fen("7k/8/8/8/8/8/8/R5RK w - - 0 1")
+    ai = ChessAI("very_hard")
+    ai._begin_search(0, 0)
+    scores = {move: score for score, move in ai.analyse_position(board, 1, 'w')}
+    assert scores[((7, 0), (1, 0))] == 0
@@ -0,0 +1,42 @@
+"""
+Board Tests
+Legality checks must leave the position exactly as they found it
+"""
+
+from board import ChessBoard, MAILBOX, EMPTY
+
+
+def square(name):
+    """Mailbox square for a name like "e5"."""
+    return MAILBOX[(8 - int(name[1])) * 8 + "abcdefgh".index(name[0])]
+
+
+def snapshot(board):
+    return bytes(board.squares), board.piece_hash, board.pawn_hash
+
+
+def test_legality_checks_keep_position_with_stale_en_passant_target():
+    board = ChessBoard()
+    board.set_fen("r1bq1b1r/ppp1kppp/2n5/3pp3/P2P3P/8/1PP1P1PN/1RBnKBR1 b - d3 0 9")
+    
+    # Play e5xd4 the way the search does, leaving en_passant_target on d3
+    board.set_square(square("d4"), board.squares[square("e5")])
+    board.set_square(square("e5"), EMPTY)
+    before = snapshot(board)
+    
+    # d4-d3 pushes onto the stale target; it must not be treated as en passant
+    assert board.is_legal_move(square("d4"), square("d3"))
+    assert snapshot(board) == before
+    for row in range(8):
+        for col in range(8):
+            board.get_legal_moves(row, col)
+    assert snapshot(board) == before
+
+
+def test_en_passant_capture_still_checked_for_legality():
+    board = ChessBoard()
+    # Black's d-pawn just moved two squares; exd6 would expose the white king on the fifth rank
+    board.set_fen("8/8/8/K2pP2r/8/8/8/7k w - d6 0 1")
+    before = snapshot(board)
+    assert (2, 3) not in board.get_legal_moves(3, 4)
+    assert snapshot(board) == before
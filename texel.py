@@ -0,0 +1,245 @@
+"""
+Evaluation Tuner
+Fits ChessAI's piece values and piece-square tables to self-play results (Texel's method)
+
+The evaluation is linear in its weights, so every position becomes a feature
+vector (piece counts and piece-square occupancy, white minus black) and the
+weights are fitted by gradient descent on the squared error between the game
+result and a sigmoid of the evaluation. The pawn structure term isn't tuned
+here, so it is added to each evaluation as a fixed offset. Shards are
+memory-mapped and streamed in chunks, so the data set never has to fit in
+memory; only the pawn offsets (two bytes a sample) are kept.
+
+Usage: python texel.py --data selfplay_data --out eval_tables.json
+"""
+
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import numpy as np
+from ai import ChessAI, EVAL_TABLES_FILE, EVAL_TABLE_NAMES
+from pawn_structure import score_pawn_files
+from selfplay import PIECE_CODES, RESULT_COLUMN, DEFAULT_DATA_DIR, shard_paths
+
+MATERIAL_PIECES = ['P', 'N', 'B', 'R', 'Q']  # The king's value is a constant and can't be fitted
+
+# Square index seen from black's side, for the tables ChessAI mirrors for black
+MIRROR = np.array([(7 - row) * 8 + col for row in range(8) for col in range(8)])
+
+# Table used for each piece type, and whether black reads it mirrored (as in _evaluate_board)
+PIECE_TABLES = [
+    ('P', "pawn_table", True),
+    ('N', "knight_table", False),
+    ('B', "bishop_table", False),
+    ('R', "rook_table", False),
+    ('Q', "queen_table", False)
+]
+
+# Non-pawn, non-king pieces at which the king switches to its endgame table
+ENDGAME_PIECES = 6
+
+CHUNK_SIZE = 16384
+DEFAULT_EPOCHS = 200
+LEARNING_RATE = 1.0
+
+
+def feature_count():
+    """Material weights plus one weight per square of every table."""
+    return len(MATERIAL_PIECES) + len(EVAL_TABLE_NAMES) * 64
+
+
+def table_offset(name):
+    """Index of a table's first square in the feature and weight vectors."""
+    return len(MATERIAL_PIECES) + EVAL_TABLE_NAMES.index(name) * 64
+
+
+def initial_weights(ai):
+    """Weight vector holding the AI's current evaluation."""
+    weights = np.zeros(feature_count())
+    for index, piece_type in enumerate(MATERIAL_PIECES):
+        weights[index] = ai.piece_values[piece_type]
+    for name in EVAL_TABLE_NAMES:
+        offset = table_offset(name)
+        weights[offset:offset + 64] = getattr(ai, name).ravel()
+    return weights
+
+
+def extract_features(boards):
+    """Feature matrix for an (n, 64) array of piece codes; white positive, black negative."""
+    boards = np.asarray(boards)
+    features = np.zeros((len(boards), feature_count()), dtype=np.float32)
+    mirrored = boards[:, MIRROR]
+    
+    for index, piece_type in enumerate(MATERIAL_PIECES):
+        white = boards == PIECE_CODES['w' + piece_type]
+        black = boards == PIECE_CODES['b' + piece_type]
+        features[:, index] = white.sum(axis=1) - black.sum(axis=1)
+        
+    for piece_type, name, mirror_black in PIECE_TABLES:
+        offset = table_offset(name)
+        black_squares = mirrored if mirror_black else boards
+        features[:, offset:offset + 64] = ((boards == PIECE_CODES['w' + piece_type]).astype(np.float32) -
+                                           (black_squares == PIECE_CODES['b' + piece_type]))
+    
+    # Kings use the middlegame or endgame table depending on the pieces
+    # _evaluate_board has counted when it reaches them (it scans row by row)
+    minor_major = ((boards >= PIECE_CODES['wN']) & (boards <= PIECE_CODES['wQ'])) | \
+                  ((boards >= PIECE_CODES['bN']) & (boards <= PIECE_CODES['bQ']))
+    counted = np.cumsum(minor_major, axis=1)
+    white_king = boards == PIECE_CODES['wK']
+    black_king = boards == PIECE_CODES['bK']
+    white_endgame = (counted * white_king).sum(axis=1, keepdims=True) <= ENDGAME_PIECES
+    black_endgame = (counted * black_king).sum(axis=1, keepdims=True) <= ENDGAME_PIECES
+    black_king_mirrored = mirrored == PIECE_CODES['bK']
+    
+    offset = table_offset("king_table")
+    features[:, offset:offset + 64] = ((white_king & ~white_endgame).astype(np.float32) -
+                                       (black_king_mirrored & ~black_endgame))
+    offset = table_offset("king_endgame_table")
+    features[:, offset:offset + 64] = ((white_king & white_endgame).astype(np.float32) -
+                                       (black_king_mirrored & black_endgame))
+    return features
+
+
+def pawn_structure_scores(boards):
+    """Pawn structure term of _evaluate_board for an (n, 64) array of piece codes, white positive."""
+    boards = np.asarray(boards)
+    white = boards == PIECE_CODES['wP']
+    black = boards == PIECE_CODES['bP']
+    scores = np.zeros(len(boards), dtype=np.int16)
+    known = {}  # Pawn structures repeat a lot between positions
+    for index in range(len(boards)):
+        key = np.packbits(white[index]).tobytes() + np.packbits(black[index]).tobytes()
+        score = known.get(key)
+        if score is None:
+            files = {'w': [[] for _ in range(8)], 'b': [[] for _ in range(8)]}
+            for color, pawns in (('w', white[index]), ('b', black[index])):
+                for square in np.flatnonzero(pawns):
+                    files[color][square & 7].append(square >> 3)
+            score = known[key] = -score_pawn_files(files)
+        scores[index] = score
+    return scores
+
+
+def _sigmoid(scores, k):
+    """Expected score for white from a centipawn evaluation."""
+    return 1.0 / (1.0 + np.power(10.0, -k * scores / 400.0))
+
+
+class TexelTuner:
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, chunk_size=CHUNK_SIZE):
+        # Memory-mapped, so only the chunk being processed is read from disk
+        self.shards = [np.load(path, mmap_mode='r') for path in shard_paths(data_dir)]
+        self.samples = sum(len(shard) for shard in self.shards)
+        self.chunk_size = chunk_size
+        self.ai = ChessAI("very_hard")
+        self.weights = initial_weights(self.ai)
+        self.k = 1.0
+        # Per-shard pawn structure offsets, filled in on the first pass
+        self.pawn_scores = [None] * len(self.shards)
+        
+    def _shard_pawn_scores(self, index):
+        """Pawn structure offsets for one shard, zero if the AI's ELO leaves the term out."""
+        if self.pawn_scores[index] is None:
+            shard = self.shards[index]
+            scores = np.zeros(len(shard), dtype=np.int16)
+            if self.ai.elo >= 1200:
+                for start in range(0, len(shard), self.chunk_size):
+                    scores[start:start + self.chunk_size] = pawn_structure_scores(
+                        shard[start:start + self.chunk_size, :RESULT_COLUMN])
+            self.pawn_scores[index] = scores
+        return self.pawn_scores[index]
+        
+    def _chunks(self):
+        """(features, pawn structure offsets, results) for every chunk of every shard."""
+        for index, shard in enumerate(self.shards):
+            pawn_scores = self._shard_pawn_scores(index)
+            for start in range(0, len(shard), self.chunk_size):
+                chunk = np.asarray(shard[start:start + self.chunk_size])
+                yield (extract_features(chunk[:, :RESULT_COLUMN]), pawn_scores[start:start + len(chunk)],
+                       chunk[:, RESULT_COLUMN] / 2.0)
+    
+    def error(self, weights=None, k=None):
+        """Mean squared error between results and predicted scores."""
+        weights = self.weights if weights is None else weights
+        k = self.k if k is None else k
+        total = 0.0
+        for features, pawn_scores, results in self._chunks():
+            total += np.sum((results - _sigmoid(features @ weights + pawn_scores, k)) ** 2)
+        return total / max(1, self.samples)
+        
+    def fit_k(self):
+        """Choose the sigmoid scale that best fits the current evaluation."""
+        candidates = np.linspace(0.2, 3.0, 29)
+        errors = [self.error(k=k) for k in candidates]
+        self.k = float(candidates[int(np.argmin(errors))])
+        return self.k
+        
+    def gradient(self):
+        """Gradient of the mean squared error over all samples."""
+        gradient = np.zeros_like(self.weights)
+        scale = np.log(10.0) * self.k / 400.0
+        for features, pawn_scores, results in self._chunks():
+            predicted = _sigmoid(features @ self.weights + pawn_scores, self.k)
+            residual = -2.0 * (results - predicted) * predicted * (1.0 - predicted) * scale
+            gradient += features.T @ residual
+        return gradient / max(1, self.samples)
+        
+    def tune(self, epochs=DEFAULT_EPOCHS, learning_rate=LEARNING_RATE):
+        """Adam gradient descent on all weights; returns the final error."""
+        mean = np.zeros_like(self.weights)
+        variance = np.zeros_like(self.weights)
+        beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+        
+        for epoch in range(1, epochs + 1):
+            gradient = self.gradient()
+            mean = beta1 * mean + (1 - beta1) * gradient
+            variance = beta2 * variance + (1 - beta2) * gradient ** 2
+            step = (mean / (1 - beta1 ** epoch)) / (np.sqrt(variance / (1 - beta2 ** epoch)) + epsilon)
+            self.weights -= learning_rate * step
+            if epoch % 10 == 0 or epoch == epochs:
+                print(f"Epoch {epoch}/{epochs}: error {self.error():.6f}")
+        return self.error()
+        
+    def tables(self):
+        """The fitted weights in the format ChessAI loads."""
+        weights = np.rint(self.weights).astype(int)
+        piece_values = dict(self.ai.piece_values)
+        for index, piece_type in enumerate(MATERIAL_PIECES):
+            piece_values[piece_type] = int(weights[index])
+        tables = {"piece_values": piece_values}
+        for name in EVAL_TABLE_NAMES:
+            offset = table_offset(name)
+            tables[name] = weights[offset:offset + 64].reshape(8, 8).tolist()
+        return tables
+        
+    def save(self, path=EVAL_TABLES_FILE):
+        with open(path, "w") as f:
+            json.dump(self.tables(), f, indent=2)
+        print(f"Saved tuned tables to {path}")
+
+
+def main():
+    """Tuner entry point."""
+    parser = argparse.ArgumentParser(description='Tune evaluation tables on self-play data')
+    parser.add_argument('--data', default=DEFAULT_DATA_DIR, help='Directory of .npy shards from selfplay.py')
+    parser.add_argument('--out', default=EVAL_TABLES_FILE, help='Tables file written for ChessAI')
+    parser.add_argument('--epochs', type=int, default=DEFAULT_EPOCHS, help='Gradient descent steps')
+    parser.add_argument('--learning-rate', type=float, default=LEARNING_RATE, help='Adam step size in centipawns')
+    args = parser.parse_args()
+    
+    tuner = TexelTuner(args.data)
+    if not tuner.samples:
+        print(f"No samples found in {args.data}; run selfplay.py first")
+        return
+        
+    print(f"{tuner.samples} samples in {len(tuner.shards)} shards")
+    print(f"K = {tuner.fit_k():.2f}, starting error {tuner.error():.6f}")
+    tuner.tune(args.epochs, args.learning_rate)
+    tuner.save(args.out)
+
+
+if __name__ == "__main__":
+    main()
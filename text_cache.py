@@ -0,0 +1,77 @@
+"""
+Text Cache
+One shared cache of rendered strings for every renderer
+
+Strings are rendered once per (font, text, color) and kept in
+least-recently-used order, up to TEXT_CACHE_SIZE of them, so labels,
+counters and scrolling data cost a blit a frame instead of a
+font.render. Typewriter text draws a growing prefix of the rendered
+full line (a blit of part of one surface), so revealing a character
+renders nothing new.
+
+Returned surfaces are shared: draw them, but don't draw on them or change
+their alpha (pass alpha to draw() instead).
+"""
+
+from collections import OrderedDict
+import pygame
+from profiler import profiler
+
+TEXT_CACHE_SIZE = 512  # Rendered strings kept
+
+
+class TextCache:
+    def __init__(self, size=TEXT_CACHE_SIZE):
+        self.size = size
+        # (font id, text, color) -> (surface, font); holding the font keeps its id from being reused
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+    def render(self, font, text, color):
+        """font.render(text, True, color), rendered once and shared."""
+        key = (id(font), text, tuple(color))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        
+        surface = font.render(text, True, color)
+        self.entries[key] = (surface, font)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return surface
+        
+    def draw(self, target, font, text, color, pos, anchor="topleft", alpha=None, chars=None):
+        """Blit text with its anchor point (any pygame.Rect position name) at pos; returns its rect.
+        
+        chars shows only the first chars characters, for typewriter effects.
+        """
+        surface = self.render(font, text, color)
+        rect = surface.get_rect()
+        if chars is not None and chars < len(text):
+            rect.width = min(rect.width, font.size(text[:chars])[0])
+        setattr(rect, anchor, pos)
+        if alpha is not None:
+            surface.set_alpha(alpha)
+        target.blit(surface, rect, (0, 0, rect.width, rect.height))
+        if alpha is not None:
+            # The surface is shared, so put its alpha back (None would turn off per-pixel alpha)
+            surface.set_alpha(255)
+        return rect
+        
+    def clear(self):
+        self.entries.clear()
+        
+    def summary(self):
+        """One line of counters, for the profiler overlay."""
+        lookups = self.hits + self.misses
+        hit_rate = self.hits * 100 / lookups if lookups else 0.0
+        return f"text {len(self.entries)}/{self.size} strings  hit {hit_rate:.0f}%"
+
+
+# The cache every renderer shares
+text_cache = TextCache()
+profiler.add_counter(text_cache.summary)
@@ -0,0 +1,196 @@
+"""
+Transform Cache
+One shared, size-bounded cache of scaled, flipped and rotated sprites for every renderer
+
+Screens that scale or rotate a source image each frame ask the cache
+instead of calling pygame.transform directly. Results are keyed by
+(source image, size, angle bucket, flips, smoothing, alpha) and kept in
+least-recently-used order; once their pixels add up to more than
+config.TRANSFORM_CACHE_MB, the oldest are dropped. Angles are rounded to
+ANGLE_STEP degrees so slowly turning sprites reuse their frames.
+
+Returned surfaces are shared: draw them, but don't draw on them or change
+their alpha (pass alpha instead, or copy() for per-frame fades).
+
+Sprites that spin or bank every frame use a SpriteStack instead: the
+sprite at one size pre-rendered at ROTATION_STEPS angles, each built on
+first use, so a frame costs an index lookup and a blit. Stacks share the
+byte budget and LRU order with the other entries, growing as their frames
+are rendered.
+"""
+
+from collections import OrderedDict
+import pygame
+import config
+from profiler import profiler
+
+ANGLE_STEP = 1  # Degrees per rotation bucket
+ROTATION_STEPS = 64  # Angles per sprite stack (5.6 degrees apart)
+FINE_ROTATION_STEPS = 256  # For sprites that only bank a few degrees (1.4 degrees apart)
+
+
+class SpriteStack:
+    """One sprite at a fixed size, rotated to ROTATION_STEPS angles on first use."""
+    
+    def __init__(self, base, steps=ROTATION_STEPS, cache=None):
+        self.base = base
+        self.steps = steps
+        self.frames = [None] * steps
+        self.bytes = base.get_pitch() * base.get_height()
+        self.cache = cache  # TransformCache told about each new frame, until it evicts the stack
+        
+    def frame(self, angle):
+        """The sprite rotated to the step nearest angle (degrees, counter-clockwise)."""
+        index = int(round(angle * self.steps / 360.0)) % self.steps
+        frame = self.frames[index]
+        if frame is None:
+            if index:
+                frame = pygame.transform.rotate(self.base, index * 360.0 / self.steps)
+                size = frame.get_pitch() * frame.get_height()
+                self.bytes += size
+                if self.cache is not None:
+                    self.cache._grow(size)
+            else:
+                frame = self.base
+            self.frames[index] = frame
+        return frame
+        
+    def prerender(self):
+        """Render every angle now instead of on first use."""
+        for index in range(self.steps):
+            self.frame(index * 360.0 / self.steps)
+        return self
+        
+    def blit(self, target, center, angle=0, alpha=None):
+        """Draw the sprite rotated by angle and centred on center; returns the drawn rect."""
+        frame = self.frame(angle)
+        # Frames are shared, so alpha is set for this blit every time (None would turn off per-pixel alpha)
+        frame.set_alpha(255 if alpha is None else alpha)
+        return target.blit(frame, frame.get_rect(center=center))
+
+
+class TransformCache:
+    def __init__(self, max_bytes=config.TRANSFORM_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        # key -> (surface or SpriteStack, source, bytes); holding the source keeps its id from being reused.
+        # A stack's bytes grow with its frames, so they are read from the stack itself
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+    def get(self, image, size=None, angle=0, flip_x=False, flip_y=False, smooth=False, alpha=None):
+        """image scaled to size, then flipped, then rotated by angle degrees, with alpha set."""
+        if size is not None:
+            size = (max(1, int(size[0])), max(1, int(size[1])))
+            if size == image.get_size():
+                size = None
+        bucket = round(angle / ANGLE_STEP) * ANGLE_STEP % 360
+        if size is None and not bucket and not (flip_x or flip_y) and alpha is None:
+            return image
+        key = (id(image), size, bucket, flip_x, flip_y, smooth and size is not None, alpha)
+        
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        
+        surface = image
+        if size is not None:
+            if smooth and surface.get_bitsize() >= 24:
+                surface = pygame.transform.smoothscale(surface, size)
+            else:
+                surface = pygame.transform.scale(surface, size)
+        if flip_x or flip_y:
+            surface = pygame.transform.flip(surface, flip_x, flip_y)
+        if bucket:
+            surface = pygame.transform.rotate(surface, bucket)
+        if alpha is not None:
+            if surface is image:
+                surface = image.copy()
+            surface.set_alpha(alpha)
+            
+        self._store(key, image, surface)
+        return surface
+        
+    def scale(self, image, size, smooth=False):
+        return self.get(image, size, smooth=smooth)
+        
+    def rotate(self, image, angle):
+        return self.get(image, angle=angle)
+        
+    def stack(self, image, size=None, flip_x=False, smooth=False, steps=ROTATION_STEPS):
+        """The SpriteStack of image scaled to size (and flipped), shared by everyone drawing it."""
+        if size is not None:
+            size = (max(1, int(size[0])), max(1, int(size[1])))
+        key = ("stack", id(image), size, flip_x, smooth, steps)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        
+        base = image
+        if size is not None and size != image.get_size():
+            if smooth and image.get_bitsize() >= 24:
+                base = pygame.transform.smoothscale(image, size)
+            else:
+                base = pygame.transform.scale(image, size)
+        if flip_x:
+            base = pygame.transform.flip(base, True, False)
+        elif base is image:
+            base = image.copy()  # Stack frames get their alpha set, so never share the source
+        stack = SpriteStack(base, steps)
+        if self._store(key, image, stack):
+            stack.cache = self
+        return stack
+        
+    def _store(self, key, image, item):
+        """Add a surface or stack as the newest entry; returns False if it is too big to keep."""
+        size = item.bytes if isinstance(item, SpriteStack) else item.get_pitch() * item.get_height()
+        if size > self.max_bytes:
+            return False  # Would evict everything else for one entry; hand it out uncached
+        self.entries[key] = (item, image, size)
+        self.bytes += size
+        self._evict()
+        return True
+        
+    def _grow(self, size):
+        """A cached stack rendered another frame."""
+        self.bytes += size
+        self._evict()
+        
+    def _evict(self):
+        """Drop the least recently used entries until the cache fits its budget."""
+        while self.bytes > self.max_bytes and self.entries:
+            _, (item, _, size) = self.entries.popitem(last=False)
+            if isinstance(item, SpriteStack):
+                size = item.bytes
+                item.cache = None  # Whoever still holds it can draw it, but it no longer counts
+            self.bytes -= size
+            self.evictions += 1
+    
+    def clear(self):
+        for item, _, _ in self.entries.values():
+            if isinstance(item, SpriteStack):
+                item.cache = None
+        self.entries.clear()
+        self.bytes = 0
+        
+    def summary(self):
+        """One line of counters, for the profiler overlay."""
+        lookups = self.hits + self.misses
+        hit_rate = self.hits * 100 / lookups if lookups else 0.0
+        stacks = [item for item, _, _ in self.entries.values() if isinstance(item, SpriteStack)]
+        return (f"transforms {len(self.entries)}  {self.bytes / (1024 * 1024):.1f}/"
+                f"{self.max_bytes / (1024 * 1024):.0f} MB  hit {hit_rate:.0f}%  evicted {self.evictions}  "
+                f"stacks {len(stacks)} {sum(stack.bytes for stack in stacks) / (1024 * 1024):.1f} MB")
+
+
+# The cache every renderer shares
+transform_cache = TransformCache()
+profiler.add_counter(transform_cache.summary)
@@ -0,0 +1,360 @@
+"""
+UCI Protocol Support
+Runs ChessAI as a standard UCI engine, and lets the game play against any UCI engine
+
+Engine:   python uci.py
+Opponent: python main.py --uci-opponent "stockfish"
+"""
+
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # stdout belongs to the protocol
+
+import queue
+import shlex
+import subprocess
+import sys
+import threading
+import time
+import pygame
+from board import ChessBoard
+from ai import ChessAI, MATE, MATE_THRESHOLD, MAX_SEARCH_DEPTH
+
+ENGINE_NAME = "Checkmate Protocol"
+ENGINE_AUTHOR = "Thomas Kantecki"
+
+DIFFICULTIES = ["easy", "medium", "hard", "very_hard"]
+
+# go parameters that take a number
+GO_PARAMETERS = ("movetime", "wtime", "btime", "winc", "binc", "depth", "nodes", "movestogo", "mate")
+
+# Approximate memory per transposition table entry, to turn Hash (MB) into entries
+TT_ENTRY_BYTES = 200
+DEFAULT_HASH_MB = 32
+
+
+def move_to_uci(move, promotion=None):
+    """((row, col), (row, col)) -> "e2e4", or "e7e8q" with a promotion piece type."""
+    (from_row, from_col), (to_row, to_col) = move
+    suffix = promotion.lower() if promotion else ""
+    return f"{'abcdefgh'[from_col]}{8 - from_row}{'abcdefgh'[to_col]}{8 - to_row}{suffix}"
+
+
+def promotion_for(board, move):
+    """The piece type a move promotes to ("Q", the only promotion the search plays), or None."""
+    (from_row, from_col), (to_row, _) = move
+    piece = board.get_piece(from_row, from_col)
+    if piece and piece[1] == "P" and to_row in (0, 7):
+        return "Q"
+    return None
+
+
+def uci_to_move(text):
+    """"e2e4" or "e7e8q" -> (((row, col), (row, col)), promotion piece type or None)."""
+    from_col, from_row = "abcdefgh".index(text[0]), 8 - int(text[1])
+    to_col, to_row = "abcdefgh".index(text[2]), 8 - int(text[3])
+    promotion = text[4].upper() if len(text) > 4 else None
+    return ((from_row, from_col), (to_row, to_col)), promotion
+
+
+class UCIEngine:
+    def __init__(self, output=sys.stdout):
+        self.output = output
+        self.board = ChessBoard()
+        self.difficulty = "very_hard"
+        self.hash_mb = DEFAULT_HASH_MB
+        self.ai = self._create_ai()
+        self._search_thread = None
+        
+    def _create_ai(self):
+        ai = ChessAI(self.difficulty)
+        ai.tt_max_entries = self.hash_mb * 1024 * 1024 // TT_ENTRY_BYTES
+        return ai
+        
+    def send(self, line):
+        self.output.write(line + "\n")
+        self.output.flush()
+        
+    def run(self, input_stream=sys.stdin):
+        """Read commands until "quit" or end of input."""
+        for line in input_stream:
+            if not self.handle_command(line.strip()):
+                break
+        self._stop_search()
+        
+    def handle_command(self, line):
+        """Handle one command line; returns False when the engine should exit."""
+        if not line:
+            return True
+        tokens = line.split()
+        command = tokens[0]
+        
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send("option name Difficulty type combo default very_hard " +
+                      " ".join(f"var {difficulty}" for difficulty in DIFFICULTIES))
+            self.send(f"option name Hash type spin default {DEFAULT_HASH_MB} min 1 max 1024")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            self._set_option(tokens)
+        elif command == "ucinewgame":
+            self._stop_search()
+            self.ai = self._create_ai()
+        elif command == "position":
+            self._stop_search()
+            self._set_position(tokens)
+        elif command == "go":
+            self._stop_search()
+            self._go(tokens)
+        elif command == "stop":
+            self._stop_search()
+        elif command == "quit":
+            return False
+        return True
+        
+    def _set_option(self, tokens):
+        """setoption name <name> value <value>"""
+        if "name" not in tokens or "value" not in tokens:
+            return
+        value_index = tokens.index("value")
+        name = " ".join(tokens[tokens.index("name") + 1:value_index]).lower()
+        value = " ".join(tokens[value_index + 1:])
+        
+        if name == "difficulty" and value in DIFFICULTIES:
+            self.difficulty = value
+            self.ai = self._create_ai()
+        elif name == "hash" and value.isdigit():
+            self.hash_mb = max(1, int(value))
+            self.ai.tt_max_entries = self.hash_mb * 1024 * 1024 // TT_ENTRY_BYTES
+    
+    def _set_position(self, tokens):
+        """position [startpos | fen <fen>] [moves <move> ...]"""
+        moves_index = tokens.index("moves") if "moves" in tokens else len(tokens)
+        if len(tokens) > 1 and tokens[1] == "fen":
+            self.board.set_fen(" ".join(tokens[2:moves_index]))
+        else:
+            self.board.reset()
+            
+        for text in tokens[moves_index + 1:]:
+            (from_square, to_square), promotion = uci_to_move(text)
+            if not self.board.apply_move(*from_square, *to_square, promotion or "Q"):
+                self.send(f"info string illegal move {text}")
+                break
+    
+    def _go(self, tokens):
+        """go [movetime N] [wtime N btime N winc N binc N] [depth N] [nodes N] [infinite] [searchmoves <move> ...]"""
+        params = {}
+        search_moves = None
+        for index, token in enumerate(tokens[:-1]):
+            if token in GO_PARAMETERS:
+                params[token] = int(tokens[index + 1])
+        if "searchmoves" in tokens:
+            # The move list runs up to the next go keyword
+            search_moves = set()
+            for text in tokens[tokens.index("searchmoves") + 1:]:
+                if text in GO_PARAMETERS or text in ("infinite", "ponder"):
+                    break
+                search_moves.add(uci_to_move(text)[0])
+        infinite = "infinite" in tokens
+        
+        budget = self.ai.search_budgets[self.difficulty]
+        node_limit = params.get("nodes", 0)
+        max_depth = params.get("depth", MAX_SEARCH_DEPTH)
+        eval_noise = budget["eval_noise"]
+        
+        if infinite:
+            max_time_ms = 0
+        elif "movetime" in params:
+            max_time_ms = params["movetime"]
+        elif "wtime" in params or "btime" in params:
+            side = "w" if self.board.current_turn == "white" else "b"
+            remaining = params.get(side + "time", 0)
+            increment = params.get(side + "inc", 0)
+            max_time_ms = max(10, min(remaining // 2, remaining // 30 + increment // 2))
+        elif "depth" in params or "nodes" in params:
+            max_time_ms = 0
+        else:
+            # No limits given: play like the chosen difficulty
+            node_limit = budget["nodes"]
+            max_time_ms = budget["max_time_ms"]
+            
+        # Set the budget before the thread starts so an early "stop" is never lost
+        self.ai._begin_search(node_limit, max_time_ms)
+        board = self.board.clone()
+        self._search_thread = threading.Thread(
+            target=self._search, args=(board, max_depth, eval_noise, search_moves), daemon=True
+        )
+        self._search_thread.start()
+        
+    def _search(self, board, max_depth, eval_noise, search_moves=None):
+        """Search thread: report each depth, then the best move."""
+        start = time.perf_counter()
+        reported = []
+        
+        def report(depth, score, move):
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            if abs(score) >= MATE_THRESHOLD:
+                # Mates score MATE minus the ply of the mating move; UCI counts the mover's moves
+                moves_to_mate = (MATE - abs(score) + 1) // 2
+                score_text = f"mate {moves_to_mate if score > 0 else -moves_to_mate}"
+            else:
+                score_text = f"cp {int(score)}"
+            self.send(f"info depth {depth} score {score_text} nodes {self.ai.nodes} "
+                      f"time {elapsed_ms} pv {move_to_uci(move, promotion_for(board, move))}")
+            reported[:] = [move]
+        
+        move, score, depth = self.ai.search_position(board, max_depth, eval_noise, report, search_moves)
+        if move and depth and reported != [move]:
+            report(depth, score, move)  # Eval noise picked another move; GUIs expect the PV to start with it
+        self.send(f"bestmove {move_to_uci(move, promotion_for(board, move)) if move else '0000'}")
+        
+    def _stop_search(self):
+        """Abort a running search and wait for its bestmove."""
+        if self._search_thread and self._search_thread.is_alive():
+            self.ai.search_aborted = True
+            self._search_thread.join()
+        self._search_thread = None
+
+
+class UCIOpponent:
+    """Game opponent backed by an external UCI engine process.
+    
+    Offers the same turn interface as ChessAI (start_turn / is_thinking /
+    should_use_powerup / get_move). The engine runs in its own process and
+    a reader thread collects its output, so the frame loop never waits on it.
+    """
+    def __init__(self, command, board, difficulty="medium"):
+        self.board = board
+        self.difficulty = difficulty
+        self.start_thinking = None
+        self.transposition_table = {}  # Shared with the hint service like ChessAI's
+        
+        # Same per-move time the built-in AI uses at this difficulty
+        self.move_time = ChessAI(difficulty).thinking_time[difficulty]
+        
+        self._lines = queue.Queue()
+        self._best_move = None
+        self._waiting = False
+        self._fallback = None  # Built-in AI that takes over if the engine exits
+        
+        self.process = subprocess.Popen(
+            shlex.split(command),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        reader = threading.Thread(target=self._read_output, daemon=True)
+        reader.start()
+        
+        self._send("uci")
+        self._send(f"setoption name Difficulty value {difficulty}")
+        self._send("isready")
+        self._send("ucinewgame")
+        
+    def _send(self, line):
+        try:
+            self.process.stdin.write(line + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            print(f"UCI opponent unavailable: {e}")
+    
+    def _read_output(self):
+        """Reader thread: forward engine output lines to the queue."""
+        for line in self.process.stdout:
+            self._lines.put(line.strip())
+    
+    def start_turn(self, constraints=None):
+        """Send the current position and start the engine thinking.
+        
+        Shields and tutorial/story restrictions are passed on as UCI
+        searchmoves, since the engine knows neither. If the engine has
+        exited, the built-in AI plays the turn instead.
+        """
+        self.start_thinking = pygame.time.get_ticks()
+        self._best_move = None
+        if self.process.poll() is not None:
+            self._waiting = False
+            if self._fallback is None:
+                print("UCI opponent exited; the built-in AI takes over")
+                self._fallback = ChessAI(self.difficulty)
+                self._fallback.transposition_table = self.transposition_table
+            self._fallback.start_turn(constraints)
+            return
+            
+        self._waiting = True
+        self._send(f"position fen {self.board.to_fen()}")
+        
+        search_moves = ""
+        restricted = constraints is not None and constraints.restricts_moves()
+        if restricted or self.board.shields.mask:
+            # Legal moves already leave out captures of shielded pieces
+            moves = self._legal_moves()
+            if restricted:
+                moves = constraints.filter_moves(self.board, moves)
+            if moves:
+                search_moves = " searchmoves " + " ".join(
+                    move_to_uci(move, promotion_for(self.board, move)) for move in moves)
+        self._send(f"go movetime {self.move_time}{search_moves}")
+        
+    def _legal_moves(self):
+        """All legal moves for the side to move."""
+        color = 'w' if self.board.current_turn == "white" else 'b'
+        moves = []
+        for row in range(8):
+            for col in range(8):
+                piece = self.board.get_piece(row, col)
+                if piece and piece[0] == color:
+                    for to_row, to_col in self.board.get_legal_moves(row, col):
+                        moves.append(((row, col), (to_row, to_col)))
+        return moves
+        
+    def is_thinking(self):
+        """Check for the engine's bestmove without blocking."""
+        if self._fallback is not None:
+            return self._fallback.is_thinking()
+        while not self._lines.empty():
+            line = self._lines.get_nowait()
+            if line.startswith("bestmove"):
+                tokens = line.split()
+                if len(tokens) > 1 and tokens[1] != "0000":
+                    self._best_move = uci_to_move(tokens[1])[0]
+                self._waiting = False
+        if self._waiting and self.process.poll() is not None:
+            self._waiting = False  # Engine exited; give up on this turn
+        return self.start_thinking is not None and self._waiting
+        
+    def should_use_powerup(self, board, powerup_system):
+        """External engines don't know about powerups."""
+        return None
+        
+    def execute_powerup(self, board, powerup_system, powerup_key):
+        return None
+        
+    def get_move(self, board):
+        """The engine's move for this turn, or None if it had none."""
+        if self._fallback is not None:
+            return self._fallback.get_move(board)
+        move = self._best_move
+        self._best_move = None
+        return move
+        
+    def close(self):
+        """Stop the engine process."""
+        self._send("quit")
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def main():
+    """UCI engine entry point."""
+    UCIEngine().run()
+
+
+if __name__ == "__main__":
+    main()